@@ -1,23 +1,47 @@
+import array
 import datetime
 import pytest
 import sys
 import subprocess
 import re
+import threading
+import types
+import json
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from tsdb_collector import (
+    _accepts_gzip,
     _downsample_file,
+    CollectorUiHttpServer,
     TimeSeriesDbAppender,
     compress_timeseries_db_file,
     create_timeseries_db_writer,
+    flatten_json,
     generateDemoData,
     load_collector_config,
     read_timeseries_db,
     save_collector_config,
 )
-from tsdb import get_cached_tsdb_file, write_downsampled_timeseries_db, stat_timeseries_db, write_series_array_timeseries_db
-from tsdb_server import _get_or_build_downsampled_day_points, get_virtual_series_points, save_virtual_series_config, VirtualSeriesDef
+from tsdb import get_cached_tsdb_file, read_tsdb_events_for_series, set_tsdb_cache_max_files, tsdb_cache_stats, write_downsampled_timeseries_db, stat_timeseries_db, write_series_array_timeseries_db
+import tsdb_server
+from tsdb_server import (
+    _etag_matches,
+    _get_or_build_downsampled_day_points,
+    _iter_events_json,
+    _json_dumps_bytes,
+    _negotiate_content_encoding,
+    get_virtual_series_points,
+    MAX_PUT_BODY_BYTES,
+    PayloadTooLarge,
+    save_virtual_series_config,
+    TsdbHttpServer,
+    TsdbRequestHandler,
+    VirtualSeriesDef,
+)
 
 
 def test_roundtrip_double_and_string_values(tmp_path):
@@ -51,6 +75,17 @@ def test_reader_returns_absolute_timestamps(tmp_path):
     assert db.get_series_values("a") == [(2000, 1.0), (2000, 2.0), (2100, 3.0), (1000, 4.0)]
 
 
+def test_relative_timestamp_widths_roundtrip(tmp_path):
+    path = tmp_path / "widths.tsdb"
+    timestamps = [1000, 1000 + 0xFF, 1000 + 0xFF + 0xFFFF, 1000 + 0xFF + 0xFFFF + 0xFFFFFF, 1000 + 0xFF + 0xFFFF + 0xFFFFFF + 0xFFFFFFFF]
+
+    appender = TimeSeriesDbAppender(str(path))
+    appender.append_events([(ts, "a", float(idx)) for idx, ts in enumerate(timestamps)])
+
+    db = read_timeseries_db(str(path))
+    assert db.get_series_values("a") == [(ts, float(idx)) for idx, ts in enumerate(timestamps)]
+
+
 def test_series_format_is_locked_by_first_value_type(tmp_path):
     path = tmp_path / "format_lock.tsdb"
 
@@ -80,6 +115,22 @@ def test_querying_missing_series_returns_empty_list(tmp_path):
     assert db.get_series_values("missing") == []
 
 
+def test_series_values_keep_python_types_across_storage_fallbacks():
+    from tsdb import TimeSeriesDbData
+
+    db = TimeSeriesDbData()
+    db._append("mixed", 1, 5)
+    db._append("mixed", 2, 2.5)
+    db._append("big", 1, 1)
+    db._append("big", 2, 1 << 63)
+    db._append("floats", 3, 1.25)
+
+    assert db.get_series_values("mixed") == [(1, 5), (2, 2.5)]
+    assert type(db.get_series_values("mixed")[0][1]) is int
+    assert db.get_series_values("big") == [(1, 1), (2, 1 << 63)]
+    assert db.get_series_values("floats") == [(3, 1.25)]
+
+
 def test_downsampled_file_roundtrip_and_cache_metadata(tmp_path):
     path = tmp_path / "data5s_2026-02-20.tsdb"
     write_downsampled_timeseries_db(
@@ -297,6 +348,22 @@ def test_compress_chooses_uint16_scaled_by_10(tmp_path):
     assert out_path.stat().st_size < in_path.stat().st_size
 
 
+def test_scaled_integer_formats_roundtrip():
+    from tsdb import _value_encoder_for_format, encode_value_for_format, read_format_value
+
+    for hi in (0x1, 0x2, 0x3, 0x4, 0x5, 0x9, 0xA, 0xB, 0xC, 0xD):
+        for lo in range(4):
+            format_id = (hi << 4) | lo
+            value = (0.1 if lo else 1.0) * (1 if hi >= 0x9 else -1)
+            payload = encode_value_for_format(value, format_id)
+            assert payload is not None
+            assert _value_encoder_for_format(format_id)(value) == payload
+            assert _value_encoder_for_format(format_id)(1e30) is None
+            decoded, offset = read_format_value(payload, 0, format_id)
+            assert decoded == value
+            assert offset == len(payload)
+
+
 def test_compress_chooses_small_string_format(tmp_path):
     in_path = tmp_path / "input_strings.tsdb"
     out_path = tmp_path / "output_strings.tsdb"
@@ -333,6 +400,18 @@ def test_dump_includes_format_and_abs_rel_timestamps(tmp_path, capsys):
     assert "ts_abs=900 (1970-01-01 00:00:00.900) ts_rel=ABS" in out
 
 
+def test_group_events_by_utc_day_splits_at_midnight():
+    from tsdb_collector import _group_events_by_utc_day
+
+    midnight = int(datetime.datetime(2024, 3, 2, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+    groups = _group_events_by_utc_day([(midnight - 1, "a", 1.0), (midnight, "a", 2.0), (midnight + 5, "b", 3.0)])
+
+    assert groups == {
+        datetime.date(2024, 3, 1): [(midnight - 1, "a", 1.0)],
+        datetime.date(2024, 3, 2): [(midnight, "a", 2.0), (midnight + 5, "b", 3.0)],
+    }
+
+
 def test_generate_demo_data_creates_daily_files_and_yields(tmp_path):
     files = generateDemoData(2, output_dir=str(tmp_path))
     assert len(files) == 2
@@ -513,6 +592,41 @@ def test_tsdb_appender_appends_multiple_batches(tmp_path):
     assert db.get_series_values("a") == [(1000, 1.5), (1010, 2.5)]
     assert db.get_series_values("b") == [(1000, "x"), (1020, "y")]
 
+
+def test_tsdb_appender_reopen_restores_state_and_name_dedupe(tmp_path):
+    path = tmp_path / "append_reopen.tsdb"
+    TimeSeriesDbAppender(str(path)).append_events(
+        [
+            (1000, "inv/power", 1.5),
+            (1000, "inv/name", "HM-600"),
+            (1000, "status", "ok"),
+        ]
+    )
+
+    appender = TimeSeriesDbAppender(str(path))
+    assert appender.current_timestamp_ms == 1000
+    assert appender.next_channel_id == 3
+    assert appender.latest_name_values == {"inv/name": "HM-600"}
+    appender.append_events([(2000, "inv/name", "HM-600"), (2000, "inv/power", 2.5)])
+
+    db = read_timeseries_db(str(path))
+    assert db.get_series_values("inv/name") == [(1000, "HM-600")]
+    assert db.get_series_values("inv/power") == [(1000, 1.5), (2000, 2.5)]
+
+
+def test_tsdb_appender_append_columns(tmp_path):
+    path = tmp_path / "append_columns.tsdb"
+    appender = TimeSeriesDbAppender(str(path))
+    appender.append_columns(array.array("q", [1000, 2000, 3000]), "a", array.array("d", [1.5, 2.5, 3.5]))
+    appender.append_columns([4000, 4000], ["a", "b"], [4.5, "x"])
+    with pytest.raises(ValueError):
+        appender.append_columns([5000], ["a", "b"], [1.0])
+
+    db = read_timeseries_db(str(path))
+    assert db.get_series_values("a") == [(1000, 1.5), (2000, 2.5), (3000, 3.5), (4000, 4.5)]
+    assert db.get_series_values("b") == [(4000, "x")]
+
+
 def test_cached_incremental_parse_handles_tail_truncation(tmp_path):
     path = tmp_path / "append_cached.tsdb"
     appender = TimeSeriesDbAppender(str(path))
@@ -527,6 +641,43 @@ def test_cached_incremental_parse_handles_tail_truncation(tmp_path):
     assert values == [50.0, 51.0]
 
 
+def test_read_tsdb_events_for_series_range(tmp_path):
+    path = tmp_path / "range.tsdb"
+    appender = TimeSeriesDbAppender(str(path))
+    appender.append_events([(ts, "a", float(ts)) for ts in (1000, 2000, 2000, 3000, 4000)])
+    assert [e.timestamp_ms for e in read_tsdb_events_for_series(str(path), "a", 2000, 3000)] == [2000, 2000, 3000]
+    assert [e.timestamp_ms for e in read_tsdb_events_for_series(str(path), "a", 0, 999)] == []
+    assert len(read_tsdb_events_for_series(str(path), "a", 0, 5000)) == 5
+
+    unsorted_path = tmp_path / "unsorted.tsdb"
+    writer = create_timeseries_db_writer(str(unsorted_path))
+    for ts in (1000, 3000, 2000, 4000):
+        writer.addValue("a", float(ts), timestamp_ms=ts)
+    writer.close()
+    assert [e.timestamp_ms for e in read_tsdb_events_for_series(str(unsorted_path), "a", 1500, 3500)] == [2000, 3000]
+
+
+def test_tsdb_file_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.tsdb"
+        TimeSeriesDbAppender(str(path)).append_events([(1000, name, 1.0), (2000, name, 2.0)])
+        paths.append(str(path))
+    set_tsdb_cache_max_files(2)
+    try:
+        get_cached_tsdb_file(paths[0])
+        get_cached_tsdb_file(paths[1])
+        get_cached_tsdb_file(paths[0])
+        get_cached_tsdb_file(paths[2])
+        stats = tsdb_cache_stats()
+        assert stats["maxFiles"] == 2
+        assert [e["file"] for e in stats["entries"]] == ["a.tsdb", "c.tsdb"]
+        assert stats["events"] == 4
+        assert stats["timestampBytes"] == 4 * 8
+    finally:
+        set_tsdb_cache_max_files(256)
+
+
 def test_cli_collect_requires_subscription(tmp_path):
     repo_root = Path(__file__).resolve().parents[1]
     cfg_path = tmp_path / "empty.toml"
@@ -901,3 +1052,148 @@ def test_collector_config_load_ignores_enabled_field_if_present(tmp_path):
     cfg = load_collector_config(str(config_path))
     values = cfg["http"]["urls"][0]["values"]
     assert values == [{"path": "a.p", "topic": "a/p"}, {"path": "a.v", "topic": "a/v"}]
+
+
+def test_flatten_json_keeps_integers_beyond_64_bits_exact():
+    flat, error = flatten_json(b'{"g": 75493115090026630061, "n": -9223372036854775809, "f": 1.5}')
+    assert error is None
+    assert flat == {"g": "75493115090026630061", "n": "-9223372036854775809", "f": "1.5"}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_streamed_events_json_matches_buffered_encoding(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(tsdb_server, "orjson", None)
+    single = {
+        "series": "pv/ümlaut",
+        "granularityMs": 0,
+        "points": [{"timestamp": i, "value": float("nan") if i == 7 else i * 0.25} for i in range(2500)],
+        "note": float("inf"),
+    }
+    empty = {"series": "empty", "points": []}
+    multi = {"start": 0, "end": 10, "events": [single, empty]}
+    for payload in (single, empty, multi, {"events": []}, {}):
+        streamed = b"".join(_iter_events_json(payload))
+        assert streamed == _json_dumps_bytes(payload)
+    assert b"NaN" not in b"".join(_iter_events_json(single))
+    assert b'"value":null' in b"".join(_iter_events_json(single))
+
+
+def test_content_encoding_negotiation_respects_q_zero():
+    assert _negotiate_content_encoding(None) is None
+    assert _negotiate_content_encoding("") is None
+    assert _negotiate_content_encoding("gzip, deflate") == "gzip"
+    assert _negotiate_content_encoding("GZIP;q=0.5") == "gzip"
+    assert _negotiate_content_encoding("gzip;q=0") is None
+    assert _negotiate_content_encoding("br, gzip; q=0.000") is None
+    assert _negotiate_content_encoding("identity") is None
+    if tsdb_server.zstd is not None:
+        assert _negotiate_content_encoding("gzip, zstd") == "zstd"
+    assert _negotiate_content_encoding("zstd;q=0, gzip") == "gzip"
+
+    assert _accepts_gzip("gzip, deflate")
+    assert _accepts_gzip("br;q=1, GZIP;q=0.5")
+    assert not _accepts_gzip(None)
+    assert not _accepts_gzip("br;q=1, gzip;q=0")
+    assert not _accepts_gzip("x-gzip, deflate")
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = '"abc-123"'
+    assert _etag_matches('"abc-123"', etag)
+    assert _etag_matches('W/"abc-123"', etag)
+    assert _etag_matches('"other", W/"abc-123"', etag)
+    assert _etag_matches("*", etag)
+    assert _etag_matches('"abc-123"', 'W/"abc-123"')
+    assert not _etag_matches(None, etag)
+    assert not _etag_matches("", etag)
+    assert not _etag_matches('"abc-1234"', etag)
+
+
+def test_parse_content_length_rejects_oversize_and_invalid_bodies():
+    def parse(value):
+        handler = types.SimpleNamespace(headers={} if value is None else {"Content-Length": value})
+        return TsdbRequestHandler._parse_content_length(handler)
+
+    assert parse("17") == 17
+    assert parse(str(MAX_PUT_BODY_BYTES)) == MAX_PUT_BODY_BYTES
+    with pytest.raises(PayloadTooLarge):
+        parse(str(MAX_PUT_BODY_BYTES + 1))
+    for bad in (None, "", "0", "-5", "12a", "١٢"):
+        with pytest.raises(ValueError):
+            parse(bad)
+
+
+def _serve_in_thread(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_collector_ui_fetch_batch_returns_results_and_caps_batch_size(tmp_path):
+    class JsonSource(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'{"a": {"b": 1}}' if self.path == "/obj" else b"[1, 2]"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    source = ThreadingHTTPServer(("127.0.0.1", 0), JsonSource)
+    ui = CollectorUiHttpServer(("127.0.0.1", 0), str(tmp_path / "collector.toml"), "")
+    try:
+        source_url = _serve_in_thread(source)
+        ui_url = _serve_in_thread(ui)
+
+        def post(urls):
+            req = urllib.request.Request(
+                ui_url + "/http/fetch_batch",
+                data=json.dumps({"urls": urls}).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    return resp.status, json.loads(resp.read())
+            except urllib.error.HTTPError as exc:
+                return exc.code, json.loads(exc.read())
+
+        status, body = post([source_url + "/obj", source_url + "/list"])
+        assert status == 200
+        assert body["results"] == [
+            {"url": source_url + "/obj", "values": [{"path": "a.b", "value": "1"}]},
+            {"url": source_url + "/list", "values": [], "note": "JSON root is not an object"},
+        ]
+        status, body = post([source_url + "/obj"] * 65)
+        assert status == 400
+        assert body["error"]["code"] == "bad_request"
+    finally:
+        ui.shutdown()
+        ui.server_close()
+        source.shutdown()
+        source.server_close()
+
+
+def test_tsdb_server_worker_pool_serves_concurrent_requests(tmp_path):
+    server = TsdbHttpServer(("127.0.0.1", 0), str(tmp_path), None, http_threads=2)
+    try:
+        base_url = _serve_in_thread(server)
+        results = []
+
+        def fetch():
+            with urllib.request.urlopen(base_url + "/health", timeout=10) as resp:
+                results.append((resp.status, json.loads(resp.read())))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=15)
+        assert len(results) == 8
+        assert all(status == 200 for status, _ in results)
+    finally:
+        server.shutdown()
+        server.server_close()
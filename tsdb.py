@@ -1,12 +1,18 @@
+import array
+import bisect
+import collections
 import dataclasses
 import datetime
+import functools
+import itertools
 import math
+import mmap
 import os
 import struct
 import sys
 import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
 
 
 TSDB_TAG_BYTES = b"TSDB\x00\x00\x00\x00"
@@ -39,8 +45,63 @@ FORMAT_STRING_U16 = 0x09
 FORMAT_STRING_U32 = 0x0A
 FORMAT_STRING_U64 = 0x0B
 
-
-@dataclasses.dataclass(frozen=True)
+# Preencoded single-byte entry tokens and packers for the write paths.
+_TOK = tuple(bytes((b,)) for b in range(256))
+_PACK_BB = struct.Struct("<BB").pack
+_PACK_B_U16 = struct.Struct("<BH").pack
+_PACK_B_U24 = struct.Struct("<BHB").pack
+_PACK_U24 = struct.Struct("<HB").pack
+_PACK_B_U32 = struct.Struct("<BI").pack
+_PACK_B_U64 = struct.Struct("<BQ").pack
+_PACK_CHANNEL_DEF_8 = struct.Struct("<BBBB").pack
+_PACK_CHANNEL_DEF_16 = struct.Struct("<BHBB").pack
+
+# Relative timestamp encoders indexed by the delta's byte width (1..4).
+_REL_TIMESTAMP_PACKERS = (
+    None,
+    functools.partial(_PACK_BB, ENTRY_TYPE_TIME_REL_8),
+    functools.partial(_PACK_B_U16, ENTRY_TYPE_TIME_REL_16),
+    lambda delta: _PACK_B_U24(ENTRY_TYPE_TIME_REL_24, delta & 0xFFFF, delta >> 16),
+    functools.partial(_PACK_B_U32, ENTRY_TYPE_TIME_REL_32),
+)
+
+# Precompiled codecs for the fixed-width value payloads, keyed by (byte_count, signed).
+_FLOAT_STRUCT = struct.Struct("<f")
+_DOUBLE_STRUCT = struct.Struct("<d")
+_SCALAR_STRUCTS = {
+    (1, True): struct.Struct("<b"),
+    (2, True): struct.Struct("<h"),
+    (4, True): struct.Struct("<i"),
+    (8, True): struct.Struct("<q"),
+    (1, False): struct.Struct("<B"),
+    (2, False): struct.Struct("<H"),
+    (4, False): struct.Struct("<I"),
+    (8, False): struct.Struct("<Q"),
+}
+
+# Integer format ids: high nibble -> payload byte count; low nibble -> decimal divisor (None keeps the int).
+_INTEGER_FORMAT_BYTE_COUNTS = {0x1: 1, 0x2: 2, 0x3: 3, 0x4: 4, 0x5: 8, 0x9: 1, 0xA: 2, 0xB: 3, 0xC: 4, 0xD: 8}
+_DECIMAL_SCALES = (None, 10.0, 100.0, 1000.0)
+_STRING_LENGTH_SIZES = {FORMAT_STRING_U8: 1, FORMAT_STRING_U16: 2, FORMAT_STRING_U32: 4, FORMAT_STRING_U64: 8}
+# format id -> (unpack_from, byte size, decimal divisor or None, EOF description) for every
+# fixed-width format that has a struct code, i.e. all numeric formats except the 24-bit integers.
+_FIXED_FORMAT_READERS: Dict[int, Tuple[Callable[..., tuple], int, Optional[float], str]] = {
+    FORMAT_FLOAT: (_FLOAT_STRUCT.unpack_from, 4, None, "float"),
+    **{fmt: (_DOUBLE_STRUCT.unpack_from, 8, None, "double") for fmt in range(FORMAT_DOUBLE, FORMAT_DOUBLE_DEC6PLUS + 1)},
+    **{
+        (hi << 4) | lo: (_SCALAR_STRUCTS[(byte_count, hi <= 0x5)].unpack_from, byte_count, scale, f"{byte_count * 8}-bit integer")
+        for hi, byte_count in _INTEGER_FORMAT_BYTE_COUNTS.items()
+        if byte_count != 3
+        for lo, scale in enumerate(_DECIMAL_SCALES)
+    },
+}
+# Unpackers for the fixed-width header fields of the read paths.
+_UNPACK_U16 = _SCALAR_STRUCTS[(2, False)].unpack_from
+_UNPACK_U32 = _SCALAR_STRUCTS[(4, False)].unpack_from
+_UNPACK_U64 = _SCALAR_STRUCTS[(8, False)].unpack_from
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class Event:
     timestamp_ms: int
     value: Any
@@ -65,12 +126,31 @@ class CachedTsdbFile:
     channel_defs: Dict[int, Tuple[int, str]]
     series_format_ids: Dict[str, int]
     series_events: Dict[str, List[Event]]
+    # Timestamp column per series, parallel to series_events; contiguous unsigned 64-bit for range lookups.
+    series_timestamps: Dict[str, array.array]
     meta_info: Dict[str, Any]
     ds_bucket_ms: Optional[int]
+    # False once an absolute timestamp went backwards; until then every series is time-sorted.
+    timestamps_monotonic: bool = True
+    # Series with at least one value that is not a plain int/float (strings, min/avg/max dicts).
+    non_numeric_series: set[str] = dataclasses.field(default_factory=set)
 
 
 _TSDB_CACHE_LOCK = threading.Lock()
-_TSDB_FILE_CACHE: Dict[str, CachedTsdbFile] = {}
+# Parsed files in least-recently-used order; the oldest entries are evicted beyond _TSDB_CACHE_MAX_FILES.
+_TSDB_FILE_CACHE: "collections.OrderedDict[str, CachedTsdbFile]" = collections.OrderedDict()
+_TSDB_CACHE_MAX_FILES = 256
+
+
+def _series_appenders(cache: CachedTsdbFile, series_name: str) -> Tuple[Callable[[Event], None], Callable[[int], None]]:
+    # Return the append methods of a series' event list and timestamp column, creating both if needed.
+    events = cache.series_events.get(series_name)
+    if events is None:
+        events = cache.series_events[series_name] = []
+        timestamps = cache.series_timestamps[series_name] = array.array("Q")
+    else:
+        timestamps = cache.series_timestamps[series_name]
+    return events.append, timestamps.append
 
 
 def invalidate_tsdb_cache(path: Optional[str] = None) -> None:
@@ -81,6 +161,46 @@ def invalidate_tsdb_cache(path: Optional[str] = None) -> None:
             _TSDB_FILE_CACHE.pop(path, None)
 
 
+def set_tsdb_cache_max_files(max_files: int) -> None:
+    # Limit how many parsed files stay cached; least recently used files are dropped first.
+    global _TSDB_CACHE_MAX_FILES
+    if max_files < 1:
+        raise ValueError("TSDB cache size must be at least 1 file")
+    with _TSDB_CACHE_LOCK:
+        _TSDB_CACHE_MAX_FILES = max_files
+        while len(_TSDB_FILE_CACHE) > _TSDB_CACHE_MAX_FILES:
+            _TSDB_FILE_CACHE.popitem(last=False)
+
+
+def tsdb_cache_stats() -> Dict[str, Any]:
+    # Summarize the parsed-file cache: per-file event counts and timestamp column bytes, most recent last.
+    with _TSDB_CACHE_LOCK:
+        entries = [
+            {
+                "file": os.path.basename(path),
+                "events": sum(len(events) for events in cache.series_events.values()),
+                "timestampBytes": sum(len(col) * col.itemsize for col in cache.series_timestamps.values()),
+            }
+            for path, cache in _TSDB_FILE_CACHE.items()
+        ]
+        max_files = _TSDB_CACHE_MAX_FILES
+    return {
+        "files": len(entries),
+        "maxFiles": max_files,
+        "events": sum(e["events"] for e in entries),
+        "timestampBytes": sum(e["timestampBytes"] for e in entries),
+        "entries": entries,
+    }
+
+
+def _store_cached_tsdb_file(path: str, cache: CachedTsdbFile) -> None:
+    # Insert or refresh a cache entry as most recently used; caller holds _TSDB_CACHE_LOCK.
+    _TSDB_FILE_CACHE[path] = cache
+    _TSDB_FILE_CACHE.move_to_end(path)
+    while len(_TSDB_FILE_CACHE) > _TSDB_CACHE_MAX_FILES:
+        _TSDB_FILE_CACHE.popitem(last=False)
+
+
 def _ensure_available(data: bytes, offset: int, size: int, what: str) -> None:
     if offset + size > len(data):
         raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
@@ -102,10 +222,10 @@ def _read_i24(data: bytes, offset: int) -> Tuple[int, int]:
 
 
 def _read_scalar(data: bytes, offset: int, byte_count: int, signed: bool) -> Tuple[int, int]:
-    if byte_count in (1, 2, 4, 8):
+    codec = _SCALAR_STRUCTS.get((byte_count, signed))
+    if codec is not None:
         _ensure_available(data, offset, byte_count, f"{byte_count * 8}-bit integer")
-        raw = int.from_bytes(data[offset:offset + byte_count], "little", signed=signed)
-        return raw, offset + byte_count
+        return codec.unpack_from(data, offset)[0], offset + byte_count
     if byte_count == 3:
         return _read_i24(data, offset) if signed else _read_u24(data, offset)
     raise TsdbParseError(f"Unsupported scalar byte_count={byte_count}")
@@ -158,235 +278,298 @@ def _write_zigzag_leb128(value: int) -> bytes:
     return _write_uleb128(_zigzag_encode(int(value)))
 
 
-def read_format_value(data: bytes, offset: int, format_id: int) -> Tuple[Any, int]:
-    if format_id == FORMAT_FLOAT:
-        _ensure_available(data, offset, 4, "float")
-        return struct.unpack_from("<f", data, offset)[0], offset + 4
-    if format_id in (
-        FORMAT_DOUBLE,
-        FORMAT_DOUBLE_DEC1,
-        FORMAT_DOUBLE_DEC2,
-        FORMAT_DOUBLE_DEC3,
-        FORMAT_DOUBLE_DEC4,
-        FORMAT_DOUBLE_DEC5,
-        FORMAT_DOUBLE_DEC6PLUS,
-    ):
-        _ensure_available(data, offset, 8, "double")
-        return struct.unpack_from("<d", data, offset)[0], offset + 8
-    if format_id in (FORMAT_STRING_U8, FORMAT_STRING_U16, FORMAT_STRING_U32, FORMAT_STRING_U64):
-        len_size = {
-            FORMAT_STRING_U8: 1,
-            FORMAT_STRING_U16: 2,
-            FORMAT_STRING_U32: 4,
-            FORMAT_STRING_U64: 8,
-        }[format_id]
-        _ensure_available(data, offset, len_size, "string length")
-        text_len = int.from_bytes(data[offset:offset + len_size], "little")
-        offset += len_size
-        _ensure_available(data, offset, text_len, "string bytes")
-        return data[offset:offset + text_len].decode("utf-8"), offset + text_len
+def _format_decoder(format_id: int) -> Callable[[bytes, int], Tuple[Any, int]]:
+    # Build the `(data, offset) -> (value, new_offset)` decoder for one format id.
+    reader = _FIXED_FORMAT_READERS.get(format_id)
+    if reader is not None:
+        unpack_from, size, scale, what = reader
+        if scale is None:
+            def decode_fixed(data: bytes, offset: int) -> Tuple[Any, int]:
+                if offset + size > len(data):
+                    raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+                return unpack_from(data, offset)[0], offset + size
 
-    hi = (format_id >> 4) & 0xF
-    lo = format_id & 0xF
-    byte_count = {
-        0x1: 1,
-        0x2: 2,
-        0x3: 3,
-        0x4: 4,
-        0x5: 8,
-        0x9: 1,
-        0xA: 2,
-        0xB: 3,
-        0xC: 4,
-        0xD: 8,
-    }.get(hi)
-    if byte_count is None or lo > 3:
-        raise TsdbParseError(f"Unsupported formatId 0x{format_id:02x}")
+            return decode_fixed
 
-    signed = hi <= 0x5
-    raw_value, offset = _read_scalar(data, offset, byte_count, signed)
-    scale = {0: 1.0, 1: 10.0, 2: 100.0, 3: 1000.0}[lo]
-    if scale == 1.0:
-        return raw_value, offset
-    return raw_value / scale, offset
+        def decode_scaled(data: bytes, offset: int) -> Tuple[Any, int]:
+            if offset + size > len(data):
+                raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+            return unpack_from(data, offset)[0] / scale, offset + size
 
+        return decode_scaled
 
-def _is_incomplete_parse_error(exc: TsdbParseError) -> bool:
-    return str(exc).startswith("Unexpected EOF while reading")
+    len_size = _STRING_LENGTH_SIZES.get(format_id)
+    if len_size is not None:
+        def decode_string(data: bytes, offset: int) -> Tuple[Any, int]:
+            _ensure_available(data, offset, len_size, "string length")
+            text_len = int.from_bytes(data[offset:offset + len_size], "little")
+            offset += len_size
+            _ensure_available(data, offset, text_len, "string bytes")
+            return str(data[offset:offset + text_len], "utf-8"), offset + text_len
 
+        return decode_string
 
-def _parse_tsdb_chunk_into_cache(raw: bytes, base_offset: int, cache: CachedTsdbFile, path: str) -> int:
-    offset = 0
-    while offset < len(raw):
-        entry_start = offset
-        entry_type = raw[offset]
-        offset += 1
+    # Only the 24-bit integer formats and invalid format ids get here.
+    hi = (format_id >> 4) & 0xF
+    lo = format_id & 0xF
+    if _INTEGER_FORMAT_BYTE_COUNTS.get(hi) != 3 or lo > 3:
+        def decode_unsupported(data: bytes, offset: int) -> Tuple[Any, int]:
+            raise TsdbParseError(f"Unsupported formatId 0x{format_id:02x}")
 
-        try:
-            if entry_type <= 0xEF:
-                channel_id = entry_type
-                if cache.current_ts is None:
-                    raise TsdbParseError("Value entry encountered before timestamp")
-                if channel_id not in cache.channel_defs:
-                    raise TsdbParseError(f"Undefined channel id {channel_id}")
-                format_id, series_name = cache.channel_defs[channel_id]
-                if cache.ds_bucket_ms is not None and is_numeric_format_id(format_id):
-                    v_min, offset = read_format_value(raw, offset, format_id)
-                    v_avg, offset = read_format_value(raw, offset, format_id)
-                    v_max, offset = read_format_value(raw, offset, format_id)
-                    value = {"min": v_min, "avg": v_avg, "max": v_max}
-                else:
-                    value, offset = read_format_value(raw, offset, format_id)
-                cache.series_events.setdefault(series_name, []).append(Event(cache.current_ts, value))
-                continue
+        return decode_unsupported
 
-            if entry_type == ENTRY_TYPE_VALUE_16:
-                _ensure_available(raw, offset, 2, "16-bit channel id")
-                channel_id = int.from_bytes(raw[offset:offset + 2], "little")
-                offset += 2
-                if cache.current_ts is None:
-                    raise TsdbParseError("16-bit value entry encountered before timestamp")
-                if channel_id not in cache.channel_defs:
-                    raise TsdbParseError(f"Undefined 16-bit channel id {channel_id}")
-                format_id, series_name = cache.channel_defs[channel_id]
-                if cache.ds_bucket_ms is not None and is_numeric_format_id(format_id):
-                    v_min, offset = read_format_value(raw, offset, format_id)
-                    v_avg, offset = read_format_value(raw, offset, format_id)
-                    v_max, offset = read_format_value(raw, offset, format_id)
-                    value = {"min": v_min, "avg": v_avg, "max": v_max}
-                else:
-                    value, offset = read_format_value(raw, offset, format_id)
-                cache.series_events.setdefault(series_name, []).append(Event(cache.current_ts, value))
-                continue
+    read_int24 = _read_i24 if hi <= 0x5 else _read_u24
+    int24_scale = _DECIMAL_SCALES[lo]
 
-            if entry_type == ENTRY_TYPE_TIME_ABSOLUTE:
-                _ensure_available(raw, offset, 8, "absolute timestamp")
-                cache.current_ts = int.from_bytes(raw[offset:offset + 8], "little")
-                offset += 8
-                continue
-            if entry_type == ENTRY_TYPE_TIME_REL_8:
-                _ensure_available(raw, offset, 1, "relative timestamp (8-bit)")
-                if cache.current_ts is None:
-                    raise TsdbParseError("Relative timestamp before absolute timestamp")
-                cache.current_ts += raw[offset]
-                offset += 1
-                continue
-            if entry_type == ENTRY_TYPE_TIME_REL_16:
-                _ensure_available(raw, offset, 2, "relative timestamp (16-bit)")
-                if cache.current_ts is None:
-                    raise TsdbParseError("Relative timestamp before absolute timestamp")
-                cache.current_ts += int.from_bytes(raw[offset:offset + 2], "little")
-                offset += 2
-                continue
-            if entry_type == ENTRY_TYPE_TIME_REL_24:
-                rel, offset = _read_u24(raw, offset)
-                if cache.current_ts is None:
-                    raise TsdbParseError("Relative timestamp before absolute timestamp")
-                cache.current_ts += rel
-                continue
-            if entry_type == ENTRY_TYPE_TIME_REL_32:
-                _ensure_available(raw, offset, 4, "relative timestamp (32-bit)")
-                if cache.current_ts is None:
-                    raise TsdbParseError("Relative timestamp before absolute timestamp")
-                cache.current_ts += int.from_bytes(raw[offset:offset + 4], "little")
-                offset += 4
-                continue
+    def decode_int24(data: bytes, offset: int) -> Tuple[Any, int]:
+        raw_value, offset = read_int24(data, offset)
+        return (raw_value if int24_scale is None else raw_value / int24_scale), offset
 
-            if entry_type == ENTRY_TYPE_CHANNEL_DEF_8:
-                _ensure_available(raw, offset, 3, "8-bit channel definition")
-                channel_id = raw[offset]
-                format_id = raw[offset + 1]
-                name_len = raw[offset + 2]
-                offset += 3
-                _ensure_available(raw, offset, name_len, "channel name")
-                series_name = raw[offset:offset + name_len].decode("utf-8")
-                offset += name_len
-                cache.channel_defs[channel_id] = (format_id, series_name)
-                cache.series_format_ids.setdefault(series_name, format_id)
-                continue
+    return decode_int24
 
-            if entry_type == ENTRY_TYPE_CHANNEL_DEF_16:
-                _ensure_available(raw, offset, 4, "16-bit channel definition")
-                channel_id = int.from_bytes(raw[offset:offset + 2], "little")
-                format_id = raw[offset + 2]
-                name_len = raw[offset + 3]
-                offset += 4
-                _ensure_available(raw, offset, name_len, "channel name")
-                series_name = raw[offset:offset + name_len].decode("utf-8")
-                offset += name_len
-                cache.channel_defs[channel_id] = (format_id, series_name)
-                cache.series_format_ids.setdefault(series_name, format_id)
-                continue
 
-            if entry_type == ENTRY_TYPE_META_INFO:
-                _ensure_available(raw, offset, 1, "meta-info key length")
-                key_len = raw[offset]
-                offset += 1
-                _ensure_available(raw, offset, key_len, "meta-info key")
-                key = raw[offset:offset + key_len].decode("utf-8")
-                offset += key_len
-                _ensure_available(raw, offset, 1, "meta-info format id")
-                format_id = raw[offset]
-                offset += 1
-                value, offset = read_format_value(raw, offset, format_id)
-                cache.meta_info[key] = value
-                if key == "dsBucketMs":
-                    try:
-                        cache.ds_bucket_ms = int(value)
-                    except Exception:
-                        cache.ds_bucket_ms = None
-                continue
+# Decoder per format id 0x00..0xFF, so a value decode is one indexed call instead of a cascade.
+_FORMAT_DECODERS: Tuple[Callable[[bytes, int], Tuple[Any, int]], ...] = tuple(_format_decoder(fmt) for fmt in range(256))
 
-            if entry_type == ENTRY_TYPE_SERIES_ARRAY:
-                if cache.channel_defs or cache.current_ts is not None:
-                    raise TsdbParseError("Series Array entries must not be mixed with regular TSDB entries")
-                offset = _parse_series_array_entry(raw, entry_start, offset, cache, path)
-                continue
 
-            if entry_type == ENTRY_TYPE_STRING_ENTRY:
-                if cache.channel_defs or cache.current_ts is not None:
-                    raise TsdbParseError("String entries must not be mixed with regular TSDB entries")
-                offset, series_name, value, ts_ms = _parse_string_entry(raw, entry_start, offset, path)
-                # Decoder recovery behavior for malformed files: ignore duplicate entries.
-                if not cache.series_events.get(series_name):
-                    cache.series_events.setdefault(series_name, []).append(Event(ts_ms, value))
-                cache.series_format_ids.setdefault(series_name, FORMAT_STRING_U64)
-                continue
+def read_format_value(data: bytes, offset: int, format_id: int) -> Tuple[Any, int]:
+    try:
+        decode = _FORMAT_DECODERS[format_id]
+    except IndexError:
+        raise TsdbParseError(f"Unsupported formatId 0x{format_id:02x}") from None
+    return decode(data, offset)
+
+
+def _cache_time_absolute(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+    if offset + 8 > len(raw):
+        raise TsdbParseError(f"Unexpected EOF while reading absolute timestamp at offset {offset}")
+    new_ts = _UNPACK_U64(raw, offset)[0]
+    if current_ts is not None and new_ts < current_ts:
+        cache.timestamps_monotonic = False
+    return offset + 8, new_ts
+
+
+def _cache_time_relative(width: int) -> Callable[[bytes, int, int, Optional[int], CachedTsdbFile, str], Tuple[int, Optional[int]]]:
+    what = f"relative timestamp ({width * 8}-bit)"
+    codec = _SCALAR_STRUCTS.get((width, False))  # None for the 24-bit delta, which has no struct code
+    unpack_from = codec.unpack_from if codec is not None else None
+
+    def handler(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+        if offset + width > len(raw):
+            raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+        if current_ts is None:
+            raise TsdbParseError("Relative timestamp before absolute timestamp")
+        if unpack_from is None:
+            return offset + 3, current_ts + (raw[offset] | (raw[offset + 1] << 8) | (raw[offset + 2] << 16))
+        return offset + width, current_ts + unpack_from(raw, offset)[0]
+
+    return handler
+
+
+def _cache_channel_definition(id_width: int) -> Callable[[bytes, int, int, Optional[int], CachedTsdbFile, str], Tuple[int, Optional[int]]]:
+    what = f"{id_width * 8}-bit channel definition"
+
+    def handler(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+        if offset + id_width + 2 > len(raw):
+            raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+        channel_id = raw[offset] if id_width == 1 else _UNPACK_U16(raw, offset)[0]
+        offset += id_width
+        format_id = raw[offset]
+        name_len = raw[offset + 1]
+        offset += 2
+        if offset + name_len > len(raw):
+            raise TsdbParseError(f"Unexpected EOF while reading channel name at offset {offset}")
+        series_name = str(raw[offset:offset + name_len], "utf-8")
+        cache.channel_defs[channel_id] = (format_id, series_name)
+        cache.series_format_ids.setdefault(series_name, format_id)
+        return offset + name_len, current_ts
+
+    return handler
+
+
+def _cache_meta_info(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+    _ensure_available(raw, offset, 1, "meta-info key length")
+    key_len = raw[offset]
+    offset += 1
+    _ensure_available(raw, offset, key_len, "meta-info key")
+    key = str(raw[offset:offset + key_len], "utf-8")
+    offset += key_len
+    _ensure_available(raw, offset, 1, "meta-info format id")
+    format_id = raw[offset]
+    offset += 1
+    value, offset = read_format_value(raw, offset, format_id)
+    cache.meta_info[key] = value
+    if key == "dsBucketMs":
+        try:
+            cache.ds_bucket_ms = int(value)
+        except Exception:
+            cache.ds_bucket_ms = None
+    return offset, current_ts
+
+
+def _cache_series_array(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+    if cache.channel_defs or current_ts is not None:
+        raise TsdbParseError("Series Array entries must not be mixed with regular TSDB entries")
+    return _parse_series_array_entry(raw, entry_start, offset, cache, path), current_ts
+
+
+def _cache_string_entry(raw: bytes, entry_start: int, offset: int, current_ts: Optional[int], cache: CachedTsdbFile, path: str) -> Tuple[int, Optional[int]]:
+    if cache.channel_defs or current_ts is not None:
+        raise TsdbParseError("String entries must not be mixed with regular TSDB entries")
+    offset, series_name, value, ts_ms = _parse_string_entry(raw, entry_start, offset, path)
+    # Decoder recovery behavior for malformed files: ignore duplicate entries.
+    if not cache.series_events.get(series_name):
+        append_event, append_ts = _series_appenders(cache, series_name)
+        append_ts(ts_ms)
+        append_event(Event(ts_ms, value))
+        cache.non_numeric_series.add(series_name)
+    cache.series_format_ids.setdefault(series_name, FORMAT_STRING_U64)
+    return offset, current_ts
+
+
+# Handlers for the non-value entry types when filling the read cache, indexed by entry type byte.
+# Value entries (0x00..0xEF and 0xFF) are decoded inline in the parse loop.
+_CACHE_ENTRY_HANDLERS: List[Optional[Callable[[bytes, int, int, Optional[int], CachedTsdbFile, str], Tuple[int, Optional[int]]]]] = [None] * 256
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_TIME_ABSOLUTE] = _cache_time_absolute
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_TIME_REL_8] = _cache_time_relative(1)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_TIME_REL_16] = _cache_time_relative(2)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_TIME_REL_24] = _cache_time_relative(3)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_TIME_REL_32] = _cache_time_relative(4)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_CHANNEL_DEF_8] = _cache_channel_definition(1)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_CHANNEL_DEF_16] = _cache_channel_definition(2)
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_META_INFO] = _cache_meta_info
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_SERIES_ARRAY] = _cache_series_array
+_CACHE_ENTRY_HANDLERS[ENTRY_TYPE_STRING_ENTRY] = _cache_string_entry
+
+
+def _read_cached_value(raw: bytes, offset: int, format_id: int, triple: bool) -> Tuple[Any, int]:
+    if not triple:
+        return read_format_value(raw, offset, format_id)
+    v_min, offset = read_format_value(raw, offset, format_id)
+    v_avg, offset = read_format_value(raw, offset, format_id)
+    v_max, offset = read_format_value(raw, offset, format_id)
+    return {"min": v_min, "avg": v_avg, "max": v_max}, offset
+
+
+def _channel_value_plan(cache: CachedTsdbFile, channel: Tuple[int, str], ds_bucket_ms: Optional[int]) -> tuple:
+    # Precompute how a channel's value entries are decoded and where they are stored.
+    format_id, series_name = channel
+    append_event, append_ts = _series_appenders(cache, series_name)
+    triple = ds_bucket_ms is not None and is_numeric_format_id(format_id)
+    if triple or not is_numeric_format_id(format_id):
+        cache.non_numeric_series.add(series_name)
+    # Single fixed-width values are unpacked inline; triples, strings and 24-bit integers go
+    # through read_format_value.
+    reader = None if triple else _FIXED_FORMAT_READERS.get(format_id)
+    return reader, format_id, triple, append_ts, append_event
+
 
-            raise TsdbParseError(f"Unknown entry type 0x{entry_type:02x} at offset {base_offset + offset - 1}")
-        except TsdbParseError as exc:
-            if _is_incomplete_parse_error(exc):
+def _parse_tsdb_chunk_into_cache(raw: bytes, base_offset: int, cache: CachedTsdbFile, path: str) -> int:
+    # Hot loop: value entries are decoded inline through per-channel plans with the cache
+    # state held in locals; every other entry type is dispatched through _CACHE_ENTRY_HANDLERS.
+    handlers = _CACHE_ENTRY_HANDLERS
+    channel_defs_get = cache.channel_defs.get
+    # channel id -> _channel_value_plan(); dropped whenever a channel definition or meta info
+    # entry could have changed how values decode.
+    plans: Dict[int, tuple] = {}
+    plans_get = plans.get
+    decode_value = _read_cached_value
+    current_ts = cache.current_ts
+    ds_bucket_ms = cache.ds_bucket_ms
+    end = len(raw)
+    offset = 0
+    try:
+        while offset < end:
+            entry_start = offset
+            entry_type = raw[offset]
+            offset += 1
+
+            try:
+                if entry_type <= 0xEF or entry_type == ENTRY_TYPE_VALUE_16:
+                    if entry_type <= 0xEF:
+                        channel_id = entry_type
+                        if current_ts is None:
+                            raise TsdbParseError("Value entry encountered before timestamp")
+                    else:
+                        if offset + 2 > end:
+                            raise TsdbParseError(f"Unexpected EOF while reading 16-bit channel id at offset {offset}")
+                        channel_id = _UNPACK_U16(raw, offset)[0]
+                        offset += 2
+                        if current_ts is None:
+                            raise TsdbParseError("16-bit value entry encountered before timestamp")
+                    plan = plans_get(channel_id)
+                    if plan is None:
+                        channel = channel_defs_get(channel_id)
+                        if channel is None:
+                            raise TsdbParseError(f"Undefined channel id {channel_id}")
+                        # Decode the first value before building the plan, so a truncated entry
+                        # does not leave an empty series behind.
+                        triple = ds_bucket_ms is not None and is_numeric_format_id(channel[0])
+                        value, offset = decode_value(raw, offset, channel[0], triple)
+                        plan = plans[channel_id] = _channel_value_plan(cache, channel, ds_bucket_ms)
+                        append_ts, append_event = plan[3], plan[4]
+                    else:
+                        reader, format_id, triple, append_ts, append_event = plan
+                        if reader is not None:
+                            unpack_from, size, scale, what = reader
+                            if offset + size > end:
+                                raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+                            value = unpack_from(raw, offset)[0]
+                            if scale is not None:
+                                value = value / scale
+                            offset += size
+                        else:
+                            value, offset = decode_value(raw, offset, format_id, triple)
+                    # Timestamp first: an out-of-range value raises before the event list grows.
+                    append_ts(current_ts)
+                    append_event(Event(current_ts, value))
+                    continue
+
+                handler = handlers[entry_type]
+                if handler is None:
+                    raise TsdbParseError(f"Unknown entry type 0x{entry_type:02x} at offset {base_offset + offset - 1}")
+                offset, current_ts = handler(raw, entry_start, offset, current_ts, cache, path)
+                if entry_type >= ENTRY_TYPE_CHANNEL_DEF_8:
+                    ds_bucket_ms = cache.ds_bucket_ms
+                    plans.clear()
+            except (TsdbParseError, OverflowError):
+                # Incomplete trailing entries and malformed ones (including timestamps past
+                # 2^64, e.g. after relative deltas) stop the parse at the entry start, so an appended completion is picked
+                # up by the next refresh.
                 offset = entry_start
                 break
-            offset = entry_start
-            break
+    finally:
+        cache.current_ts = current_ts
 
     return offset
 
 
 def _build_cache_from_scratch(path: str, st: os.stat_result) -> CachedTsdbFile:
     with open(path, "rb") as f:
-        raw = f.read()
-    if len(raw) < 12:
-        raise TsdbParseError(f"File too small: {path}")
-    if raw[:8] != TSDB_TAG_BYTES:
-        raise TsdbParseError(f"Invalid TSDB tag in {path}")
-    version = int.from_bytes(raw[8:12], "little")
-    if version != TSDB_VERSION:
-        raise TsdbParseError(f"Unsupported TSDB version {version} in {path}")
-
-    cache = CachedTsdbFile(
-        mtime_ns=st.st_mtime_ns,
-        size=st.st_size,
-        parsed_offset=12,
-        current_ts=None,
-        channel_defs={},
-        series_format_ids={},
-        series_events={},
-        meta_info={},
-        ds_bucket_ms=None,
-    )
-    consumed = _parse_tsdb_chunk_into_cache(raw[12:], 12, cache, path)
+        if os.fstat(f.fileno()).st_size < 12:
+            raise TsdbParseError(f"File too small: {path}")
+        # Parse straight from a read-only mapping instead of copying the file into a bytes object.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+            if raw[:8] != TSDB_TAG_BYTES:
+                raise TsdbParseError(f"Invalid TSDB tag in {path}")
+            version = int.from_bytes(raw[8:12], "little")
+            if version != TSDB_VERSION:
+                raise TsdbParseError(f"Unsupported TSDB version {version} in {path}")
+
+            cache = CachedTsdbFile(
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                parsed_offset=12,
+                current_ts=None,
+                channel_defs={},
+                series_format_ids={},
+                series_events={},
+                series_timestamps={},
+                meta_info={},
+                ds_bucket_ms=None,
+            )
+            with memoryview(raw) as mv, mv[12:] as body:
+                consumed = _parse_tsdb_chunk_into_cache(body, 12, cache, path)
     cache.parsed_offset = 12 + consumed
     return cache
 
@@ -452,7 +635,7 @@ def _parse_series_array_entry(raw: bytes, entry_start: int, offset: int, cache:
         raise TsdbParseError(f"Unsupported Series Array version {series_array_version} at offset {entry_start}")
     name_len, offset = _read_uleb128(raw, offset)
     _ensure_available(raw, offset, name_len, "series array name")
-    series_name = raw[offset:offset + name_len].decode("utf-8")
+    series_name = str(raw[offset:offset + name_len], "utf-8")
     offset += name_len
     num_elements, offset = _read_uleb128(raw, offset)
     ms_per_slot, offset = _read_uleb128(raw, offset)
@@ -478,6 +661,7 @@ def _parse_series_array_entry(raw: bytes, entry_start: int, offset: int, cache:
 
     element_index = 0
     last_value = 0
+    series_appenders = None
     while offset < entry_end:
         type_and_len, offset = _read_zigzag_leb128(raw, offset)
         if type_and_len in (-1, 0):
@@ -526,7 +710,12 @@ def _parse_series_array_entry(raw: bytes, entry_start: int, offset: int, cache:
                     "avg": decoded_values[1] / scale,
                     "max": decoded_values[2] / scale,
                 }
-            cache.series_events.setdefault(series_name, []).append(Event(ts_ms, value))
+            if series_appenders is None:
+                series_appenders = _series_appenders(cache, series_name)
+                if elem_size != 1:
+                    cache.non_numeric_series.add(series_name)
+            series_appenders[1](ts_ms)
+            series_appenders[0](Event(ts_ms, value))
             element_index += 1
     if element_index != num_elements:
         raise TsdbParseError(f"Series array elements {element_index} != numElements {num_elements}")
@@ -543,11 +732,11 @@ def _parse_string_entry(raw: bytes, entry_start: int, offset: int, path: str) ->
         raise TsdbParseError(f"Unsupported StringEntry version {string_entry_version} at offset {entry_start}")
     name_len, offset = _read_uleb128(raw, offset)
     _ensure_available(raw, offset, name_len, "string entry name")
-    series_name = raw[offset:offset + name_len].decode("utf-8")
+    series_name = str(raw[offset:offset + name_len], "utf-8")
     offset += name_len
     string_len, offset = _read_uleb128(raw, offset)
     _ensure_available(raw, offset, string_len, "string entry payload")
-    value = raw[offset:offset + string_len].decode("utf-8")
+    value = str(raw[offset:offset + string_len], "utf-8")
     offset += string_len
     if offset != entry_end:
         raise TsdbParseError(f"String entry parsing did not end on entry boundary at {entry_start}")
@@ -563,11 +752,13 @@ def _refresh_cache_incremental(path: str, st: os.stat_result, cache: CachedTsdbF
         cache.size = st.st_size
         return cache
 
+    consumed = 0
     with open(path, "rb") as f:
-        f.seek(parse_from)
-        raw = f.read(st.st_size - parse_from)
-
-    consumed = _parse_tsdb_chunk_into_cache(raw, parse_from, cache, path)
+        # The file may have shrunk since the stat; mapping an empty file is an error.
+        if os.fstat(f.fileno()).st_size > parse_from:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+                with memoryview(raw) as mv, mv[parse_from:st.st_size] as tail:
+                    consumed = _parse_tsdb_chunk_into_cache(tail, parse_from, cache, path)
     cache.parsed_offset = parse_from + consumed
     cache.mtime_ns = st.st_mtime_ns
     cache.size = st.st_size
@@ -581,20 +772,21 @@ def get_cached_tsdb_file(path: str) -> CachedTsdbFile:
         cache = _TSDB_FILE_CACHE.get(path)
         if cache is None:
             cache = _build_cache_from_scratch(path, st)
-            _TSDB_FILE_CACHE[path] = cache
+            _store_cached_tsdb_file(path, cache)
             return cache
         if st.st_mtime_ns == cache.mtime_ns and st.st_size == cache.size:
+            _TSDB_FILE_CACHE.move_to_end(path)
             return cache
         if series_array_file:
             cache = _build_cache_from_scratch(path, st)
-            _TSDB_FILE_CACHE[path] = cache
+            _store_cached_tsdb_file(path, cache)
             return cache
         if st.st_size < cache.parsed_offset:
             cache = _build_cache_from_scratch(path, st)
-            _TSDB_FILE_CACHE[path] = cache
+            _store_cached_tsdb_file(path, cache)
             return cache
         cache = _refresh_cache_incremental(path, st, cache)
-        _TSDB_FILE_CACHE[path] = cache
+        _store_cached_tsdb_file(path, cache)
         return cache
 
 
@@ -603,6 +795,12 @@ def get_series_format_id_in_file(path: str, series_name: str) -> Optional[int]:
     return cache.series_format_ids.get(series_name)
 
 
+def series_values_all_numeric_in_file(path: str, series_name: str) -> bool:
+    # True when every cached value of the series is a plain int/float (no strings or dicts).
+    cache = get_cached_tsdb_file(path)
+    return series_name not in cache.non_numeric_series
+
+
 def decimal_places_from_format_id(format_id: Optional[int]) -> int:
     if format_id is None:
         return 3
@@ -657,9 +855,11 @@ def read_tsdb_events_for_series(path: str, target_series: str, start_ms: int, en
     events = cache.series_events.get(target_series, [])
     if not events:
         return []
-    if start_ms <= events[0].timestamp_ms and events[-1].timestamp_ms <= end_ms:
-        return list(events)
-    return [e for e in events if start_ms <= e.timestamp_ms <= end_ms]
+    if not cache.timestamps_monotonic:
+        # Callers rely on time order; the sort is stable, so equal timestamps keep file order.
+        return sorted((e for e in events if start_ms <= e.timestamp_ms <= end_ms), key=lambda e: e.timestamp_ms)
+    timestamps = cache.series_timestamps[target_series]
+    return events[bisect.bisect_left(timestamps, start_ms):bisect.bisect_right(timestamps, end_ms)]
 
 
 def list_series_in_file(path: str) -> List[str]:
@@ -670,26 +870,67 @@ def list_series_in_file(path: str) -> List[str]:
     return sorted(cache.series_events.keys())
 
 
+# Numeric series are stored as packed arrays; anything else (strings, min/avg/max dicts) stays a list.
+_ARRAY_VALUE_TYPECODES = {float: "d", int: "q"}
+
+
 class TimeSeriesDbData:
     def __init__(self) -> None:
-        self._series_values: dict[str, list[TimeSeriesPoint]] = {}
-        self._events: list[tuple[int, str, Any]] = []
+        self._series_timestamps: dict[str, array.array] = {}
+        self._series_values: dict[str, Any] = {}
+        # File order of all events as indexes into _series_names; the values live only in the columns.
+        self._series_names: list[str] = []
+        self._series_index: dict[str, int] = {}
+        self._event_series = array.array("I")
         self._series_format_ids: dict[str, int] = {}
         self._meta_info: dict[str, Any] = {}
 
     def _append(self, series_name: str, timestamp_ms: int, value: Any) -> None:
-        point = TimeSeriesPoint(timestamp_ms, value)
-        self._series_values.setdefault(series_name, []).append(point)
-        self._events.append((timestamp_ms, series_name, value))
+        timestamps = self._series_timestamps.get(series_name)
+        if timestamps is None:
+            timestamps = self._series_timestamps[series_name] = array.array("Q")
+            typecode = _ARRAY_VALUE_TYPECODES.get(type(value))
+            self._series_values[series_name] = array.array(typecode) if typecode else []
+            self._series_index[series_name] = len(self._series_names)
+            self._series_names.append(series_name)
+        values = self._series_values[series_name]
+        if isinstance(values, array.array) and _ARRAY_VALUE_TYPECODES.get(type(value)) == values.typecode:
+            try:
+                values.append(value)
+            except OverflowError:
+                values = self._series_values[series_name] = values.tolist()
+                values.append(value)
+        else:
+            if isinstance(values, array.array):
+                values = self._series_values[series_name] = values.tolist()
+            values.append(value)
+        timestamps.append(timestamp_ms)
+        self._event_series.append(self._series_index[series_name])
+
+    def event_count(self) -> int:
+        return len(self._event_series)
 
     def list_series(self) -> list[str]:
-        return sorted(self._series_values.keys())
+        return sorted(self._series_timestamps.keys())
 
     def get_series_values(self, series_name: str) -> list[tuple[int, Any]]:
-        return [(point.timestamp_ms, point.value) for point in self._series_values.get(series_name, [])]
+        timestamps = self._series_timestamps.get(series_name)
+        if timestamps is None:
+            return []
+        return list(zip(timestamps, self._series_values[series_name]))
 
     def iter_events(self) -> list[tuple[int, str, Any]]:
-        return list(self._events)
+        names = self._series_names
+        columns = [(self._series_timestamps[name], self._series_values[name]) for name in names]
+        positions = [0] * len(names)
+        events: list[tuple[int, str, Any]] = []
+        append = events.append
+        for series_idx in self._event_series:
+            pos = positions[series_idx]
+            positions[series_idx] = pos + 1
+            timestamps, values = columns[series_idx]
+            append((timestamps[pos], names[series_idx], values[pos]))
+        return events
 
     def _set_series_format_id(self, series_name: str, format_id: int) -> None:
         self._series_format_ids[series_name] = format_id
@@ -705,7 +946,7 @@ class TimeSeriesDbData:
 
     def dump(self, out: Optional[TextIO] = None) -> None:
         stream = out if out is not None else sys.stdout
-        stream.write(f"TimeSeriesDB dump: series={len(self._series_values)} events={len(self._events)}\n")
+        stream.write(f"TimeSeriesDB dump: series={len(self._series_values)} events={self.event_count()}\n")
         stream.write("Series:\n")
         for series_name in self.list_series():
             format_id = self._series_format_ids.get(series_name)
@@ -713,7 +954,7 @@ class TimeSeriesDbData:
             stream.write(f"  - {series_name}: format={format_text}\n")
         stream.write("Events:\n")
         prev_ts: Optional[int] = None
-        for idx, (timestamp_ms, series_name, value) in enumerate(self._events):
+        for idx, (timestamp_ms, series_name, value) in enumerate(self.iter_events()):
             rel_text = "ABS" if prev_ts is None or timestamp_ms < prev_ts else f"+{timestamp_ms - prev_ts}"
             prev_ts = timestamp_ms
             format_id = self._series_format_ids.get(series_name)
@@ -750,6 +991,15 @@ class TsdbFileStats:
     per_format: List[TsdbFormatStatsRow]
 
 
+def _fixed_format_value_size(format_id: int) -> Optional[int]:
+    if format_id == FORMAT_FLOAT:
+        return 4
+    if FORMAT_DOUBLE <= format_id <= FORMAT_DOUBLE_DEC6PLUS:
+        return 8
+    shape = _numeric_format_shape(format_id)
+    return shape[0] if shape is not None else None
+
+
 def _scan_format_value_size(data: bytes, offset: int, format_id: int) -> Tuple[int, int]:
     start = offset
     _value, offset = read_format_value(data, offset, format_id)
@@ -1484,6 +1734,111 @@ class NumericWithDecimals:
     decimals: int
 
 
+def _read_value_entries_fast(raw: bytes, result: TimeSeriesDbData) -> None:
+    # Same decoding as the loop in read_timeseries_db, without any dump/verbose bookkeeping.
+    channel_defs: dict[int, tuple[int, str]] = {}
+    current_ts: Optional[int] = None
+    ds_bucket_ms: Optional[int] = None
+    append = result._append
+    offset = 12
+    end = len(raw)
+    while offset < end:
+        entry_type = raw[offset]
+        offset += 1
+
+        if entry_type <= 0xEF or entry_type == ENTRY_TYPE_CHANNEL_VALUE_16:
+            if entry_type <= 0xEF:
+                channel_id = entry_type
+                if current_ts is None:
+                    raise TsdbParseError("Value entry encountered before any timestamp was set")
+            else:
+                if offset + 2 > end:
+                    raise TsdbParseError(f"Unexpected EOF while reading 16-bit channel id at offset {offset}")
+                channel_id = raw[offset] | (raw[offset + 1] << 8)
+                offset += 2
+                if current_ts is None:
+                    raise TsdbParseError("16-bit value entry encountered before any timestamp was set")
+            channel = channel_defs.get(channel_id)
+            if channel is None:
+                break
+            format_id, series_name = channel
+            if ds_bucket_ms is not None and is_numeric_format_id(format_id):
+                v_min, offset = read_format_value(raw, offset, format_id)
+                v_avg, offset = read_format_value(raw, offset, format_id)
+                v_max, offset = read_format_value(raw, offset, format_id)
+                value = {"min": v_min, "avg": v_avg, "max": v_max}
+            else:
+                value, offset = read_format_value(raw, offset, format_id)
+            append(series_name, current_ts, value)
+            continue
+
+        if entry_type == ENTRY_TYPE_TIME_ABSOLUTE:
+            if offset + 8 > end:
+                raise TsdbParseError(f"Unexpected EOF while reading absolute timestamp at offset {offset}")
+            current_ts = _UNPACK_U64(raw, offset)[0]
+            offset += 8
+            continue
+        if ENTRY_TYPE_TIME_REL_8 <= entry_type <= ENTRY_TYPE_TIME_REL_32:
+            # Entry types 0xF1..0xF4 carry 1..4 byte deltas; decoded without slicing.
+            size = entry_type - ENTRY_TYPE_TIME_REL_8 + 1
+            if offset + size > end:
+                what = "uint24" if size == 3 else f"relative timestamp ({size * 8}-bit)"
+                raise TsdbParseError(f"Unexpected EOF while reading {what} at offset {offset}")
+            if size == 1:
+                rel = raw[offset]
+            elif size == 2:
+                rel = raw[offset] | (raw[offset + 1] << 8)
+            elif size == 3:
+                rel = raw[offset] | (raw[offset + 1] << 8) | (raw[offset + 2] << 16)
+            else:
+                rel = _UNPACK_U32(raw, offset)[0]
+            offset += size
+            if current_ts is None:
+                raise TsdbParseError("Relative timestamp entry encountered before any absolute timestamp")
+            current_ts += rel
+            continue
+
+        if entry_type == ENTRY_TYPE_CHANNEL_DEF_8 or entry_type == ENTRY_TYPE_CHANNEL_DEF_16:
+            if entry_type == ENTRY_TYPE_CHANNEL_DEF_8:
+                _ensure_available(raw, offset, 3, "8-bit channel definition")
+                channel_id = raw[offset]
+                offset += 1
+            else:
+                _ensure_available(raw, offset, 4, "16-bit channel definition")
+                channel_id = raw[offset] | (raw[offset + 1] << 8)
+                offset += 2
+            format_id = raw[offset]
+            name_len = raw[offset + 1]
+            offset += 2
+            _ensure_available(raw, offset, name_len, "channel name")
+            series_name = raw[offset:offset + name_len].decode("utf-8")
+            offset += name_len
+            channel_defs[channel_id] = (format_id, series_name)
+            result._set_series_format_id(series_name, format_id)
+            continue
+
+        if entry_type == ENTRY_TYPE_META_INFO:
+            _ensure_available(raw, offset, 1, "meta-info key length")
+            key_len = raw[offset]
+            offset += 1
+            _ensure_available(raw, offset, key_len, "meta-info key")
+            key = raw[offset:offset + key_len].decode("utf-8")
+            offset += key_len
+            _ensure_available(raw, offset, 1, "meta-info format id")
+            format_id = raw[offset]
+            offset += 1
+            value, offset = read_format_value(raw, offset, format_id)
+            result.set_meta_info(key, value)
+            if key == "dsBucketMs":
+                try:
+                    ds_bucket_ms = int(value)
+                except Exception:
+                    ds_bucket_ms = None
+            continue
+
+        break
+
+
 def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: int = 0) -> TimeSeriesDbData:
     with open(path, "rb") as f:
         raw = f.read()
@@ -1514,12 +1869,15 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
         return result
 
     result = TimeSeriesDbData()
+    if dump_out is None:
+        _read_value_entries_fast(raw, result)
+        return result
+
     channel_defs: dict[int, tuple[int, str]] = {}
     current_ts: Optional[int] = None
     ds_bucket_ms: Optional[int] = None
-    stream = dump_out if dump_out is not None else None
-    if stream is not None:
-        stream.write("Events:\n")
+    stream = dump_out
+    stream.write("Events:\n")
     prev_event_ts: Optional[int] = None
 
     offset = 12
@@ -1542,23 +1900,22 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
                 value = {"min": v_min, "avg": v_avg, "max": v_max}
             else:
                 value, offset = read_format_value(raw, offset, format_id)
-            entry_bytes = raw[entry_start:offset]
-            if stream is not None and verbose:
+            if verbose:
+                entry_bytes = raw[entry_start:offset]
                 stream.write(
                     f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} "
                     f"(value ch={channel_id} format=0x{format_id:02x})\n"
                 )
             result._append(series_name, current_ts, value)
-            if stream is not None:
-                rel_text = "ABS" if prev_event_ts is None or current_ts < prev_event_ts else f"+{current_ts - prev_event_ts}"
-                prev_event_ts = current_ts
-                ts_hr = datetime.datetime.fromtimestamp(current_ts / 1000.0, tz=datetime.timezone.utc).strftime(
-                    "%Y-%m-%d %H:%M:%S.%f"
-                )[:-3]
-                stream.write(
-                    f"  [{len(result._events) - 1}] ts_abs={current_ts} ({ts_hr}) ts_rel={rel_text} "
-                    f"series={series_name} format=0x{format_id:02x} value={value!r}\n"
-                )
+            rel_text = "ABS" if prev_event_ts is None or current_ts < prev_event_ts else f"+{current_ts - prev_event_ts}"
+            prev_event_ts = current_ts
+            ts_hr = datetime.datetime.fromtimestamp(current_ts / 1000.0, tz=datetime.timezone.utc).strftime(
+                "%Y-%m-%d %H:%M:%S.%f"
+            )[:-3]
+            stream.write(
+                f"  [{result.event_count() - 1}] ts_abs={current_ts} ({ts_hr}) ts_rel={rel_text} "
+                f"series={series_name} format=0x{format_id:02x} value={value!r}\n"
+            )
             continue
 
         if entry_type == ENTRY_TYPE_CHANNEL_VALUE_16:
@@ -1577,30 +1934,29 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
                 value = {"min": v_min, "avg": v_avg, "max": v_max}
             else:
                 value, offset = read_format_value(raw, offset, format_id)
-            entry_bytes = raw[entry_start:offset]
-            if stream is not None and verbose:
+            if verbose:
+                entry_bytes = raw[entry_start:offset]
                 stream.write(
                     f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} "
                     f"(value ch16={channel_id} format=0x{format_id:02x})\n"
                 )
             result._append(series_name, current_ts, value)
-            if stream is not None:
-                rel_text = "ABS" if prev_event_ts is None or current_ts < prev_event_ts else f"+{current_ts - prev_event_ts}"
-                prev_event_ts = current_ts
-                ts_hr = datetime.datetime.fromtimestamp(current_ts / 1000.0, tz=datetime.timezone.utc).strftime(
-                    "%Y-%m-%d %H:%M:%S.%f"
-                )[:-3]
-                stream.write(
-                    f"  [{len(result._events) - 1}] ts_abs={current_ts} ({ts_hr}) ts_rel={rel_text} "
-                    f"series={series_name} format=0x{format_id:02x} value={value!r}\n"
-                )
+            rel_text = "ABS" if prev_event_ts is None or current_ts < prev_event_ts else f"+{current_ts - prev_event_ts}"
+            prev_event_ts = current_ts
+            ts_hr = datetime.datetime.fromtimestamp(current_ts / 1000.0, tz=datetime.timezone.utc).strftime(
+                "%Y-%m-%d %H:%M:%S.%f"
+            )[:-3]
+            stream.write(
+                f"  [{result.event_count() - 1}] ts_abs={current_ts} ({ts_hr}) ts_rel={rel_text} "
+                f"series={series_name} format=0x{format_id:02x} value={value!r}\n"
+            )
             continue
 
         if entry_type == ENTRY_TYPE_TIME_ABSOLUTE:
             _ensure_available(raw, offset, 8, "absolute timestamp")
             current_ts = int.from_bytes(raw[offset:offset + 8], "little")
             offset += 8
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} (ts_abs={current_ts})\n")
             continue
@@ -1611,7 +1967,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             if current_ts is None:
                 raise TsdbParseError("Relative timestamp entry encountered before any absolute timestamp")
             current_ts += rel
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} (ts_rel8=+{rel} -> {current_ts})\n")
             continue
@@ -1622,7 +1978,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             if current_ts is None:
                 raise TsdbParseError("Relative timestamp entry encountered before any absolute timestamp")
             current_ts += rel
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} (ts_rel16=+{rel} -> {current_ts})\n")
             continue
@@ -1631,7 +1987,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             if current_ts is None:
                 raise TsdbParseError("Relative timestamp entry encountered before any absolute timestamp")
             current_ts += rel
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} (ts_rel24=+{rel} -> {current_ts})\n")
             continue
@@ -1642,7 +1998,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             if current_ts is None:
                 raise TsdbParseError("Relative timestamp entry encountered before any absolute timestamp")
             current_ts += rel
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} (ts_rel32=+{rel} -> {current_ts})\n")
             continue
@@ -1658,7 +2014,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             offset += name_len
             channel_defs[channel_id] = (format_id, series_name)
             result._set_series_format_id(series_name, format_id)
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(
                     f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} "
@@ -1677,7 +2033,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
             offset += name_len
             channel_defs[channel_id] = (format_id, series_name)
             result._set_series_format_id(series_name, format_id)
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(
                     f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} "
@@ -1702,7 +2058,7 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
                     ds_bucket_ms = int(value)
                 except Exception:
                     ds_bucket_ms = None
-            if stream is not None and verbose:
+            if verbose:
                 entry_bytes = raw[entry_start:offset]
                 stream.write(
                     f"        @{entry_start:08x}: {' '.join(f'{b:02x}' for b in entry_bytes)} "
@@ -1712,13 +2068,12 @@ def read_timeseries_db(path: str, dump_out: Optional[TextIO] = None, verbose: in
 
         break
 
-    if stream is not None:
-        stream.write(f"TimeSeriesDB dump: series={len(result._series_values)} events={len(result._events)}\n")
-        stream.write("Series:\n")
-        for series_name in result.list_series():
-            format_id = result._series_format_ids.get(series_name)
-            format_text = f"0x{format_id:02x} ({format_id_description(format_id)})" if format_id is not None else "unknown"
-            stream.write(f"  - {series_name}: format={format_text}\n")
+    stream.write(f"TimeSeriesDB dump: series={len(result._series_values)} events={result.event_count()}\n")
+    stream.write("Series:\n")
+    for series_name in result.list_series():
+        format_id = result._series_format_ids.get(series_name)
+        format_text = f"0x{format_id:02x} ({format_id_description(format_id)})" if format_id is not None else "unknown"
+        stream.write(f"  - {series_name}: format={format_text}\n")
 
     return result
 
@@ -1740,11 +2095,9 @@ class TimeSeriesDbWriter:
         if len(name_bytes) > 255:
             raise ValueError(f"Series name too long ({len(name_bytes)} bytes > 255): {series_name!r}")
         if channel_id <= 0xEF:
-            self._f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)]))
+            self._f.write(_PACK_CHANNEL_DEF_8(ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)))
         else:
-            self._f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_16]))
-            self._f.write(channel_id.to_bytes(2, "little"))
-            self._f.write(bytes([format_id, len(name_bytes)]))
+            self._f.write(_PACK_CHANNEL_DEF_16(ENTRY_TYPE_CHANNEL_DEF_16, channel_id, format_id, len(name_bytes)))
         self._f.write(name_bytes)
 
     def _ensure_channel(self, series_name: str, format_id: int) -> int:
@@ -1765,36 +2118,16 @@ class TimeSeriesDbWriter:
         return channel_id
 
     def _write_timestamp(self, timestamp_ms: int) -> None:
-        if self._current_timestamp_ms is None or timestamp_ms < self._current_timestamp_ms:
-            self._f.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-            self._f.write(timestamp_ms.to_bytes(8, "little"))
-            self._current_timestamp_ms = timestamp_ms
-            return
-        delta = timestamp_ms - self._current_timestamp_ms
-        if delta == 0:
-            return
-        if delta <= 0xFF:
-            self._f.write(bytes([ENTRY_TYPE_TIME_REL_8, delta]))
-        elif delta <= 0xFFFF:
-            self._f.write(bytes([ENTRY_TYPE_TIME_REL_16]))
-            self._f.write(delta.to_bytes(2, "little"))
-        elif delta <= 0xFFFFFF:
-            self._f.write(bytes([ENTRY_TYPE_TIME_REL_24]))
-            self._f.write(delta.to_bytes(3, "little"))
-        elif delta <= 0xFFFFFFFF:
-            self._f.write(bytes([ENTRY_TYPE_TIME_REL_32]))
-            self._f.write(delta.to_bytes(4, "little"))
-        else:
-            self._f.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-            self._f.write(timestamp_ms.to_bytes(8, "little"))
-        self._current_timestamp_ms = timestamp_ms
+        entry = bytearray()
+        self._current_timestamp_ms = _append_timestamp_entry(entry, self._current_timestamp_ms, timestamp_ms)
+        if entry:
+            self._f.write(entry)
 
     def _append_value_entry(self, channel_id: int, payload: bytes) -> None:
         if channel_id <= 0xEF:
-            self._f.write(bytes([channel_id]))
+            self._f.write(_TOK[channel_id])
         else:
-            self._f.write(bytes([ENTRY_TYPE_CHANNEL_VALUE_16]))
-            self._f.write(channel_id.to_bytes(2, "little"))
+            self._f.write(_PACK_B_U16(ENTRY_TYPE_CHANNEL_VALUE_16, channel_id))
         self._f.write(payload)
 
     def add_value(self, series_name: str, value_as_double: float, timestamp_ms: Optional[int] = None) -> None:
@@ -1820,7 +2153,7 @@ class TimeSeriesDbWriter:
             raise ValueError(f"timestamp_ms must be >= 0, got {timestamp_ms}")
 
         value_bytes = value_as_string.encode("utf-8")
-        payload = len(value_bytes).to_bytes(8, "little") + value_bytes
+        payload = _SCALAR_STRUCTS[(8, False)].pack(len(value_bytes)) + value_bytes
         self._write_timestamp(timestamp_ms)
         channel_id = self._ensure_channel(series_name, FORMAT_STRING_U64)
         self._append_value_entry(channel_id, payload)
@@ -1852,7 +2185,7 @@ def create_timeseries_db_writer(path: str) -> TimeSeriesDbWriter:
 
 
 def _write_u24(value: int) -> bytes:
-    return bytes((value & 0xFF, (value >> 8) & 0xFF, (value >> 16) & 0xFF))
+    return _PACK_U24(value & 0xFFFF, (value >> 16) & 0xFF)
 
 
 def _signed_range(byte_count: int) -> tuple[int, int]:
@@ -1946,13 +2279,13 @@ def encode_value_for_format(value: Any, format_id: int) -> Optional[bytes]:
         numeric = float(value)
         if not math.isfinite(numeric):
             return None
-        return struct.pack("<d", numeric)
+        return _DOUBLE_STRUCT.pack(numeric)
     if format_id == FORMAT_FLOAT:
         numeric = float(value)
         if not math.isfinite(numeric):
             return None
-        encoded = struct.pack("<f", numeric)
-        decoded = struct.unpack("<f", encoded)[0]
+        encoded = _FLOAT_STRUCT.pack(numeric)
+        decoded = _FLOAT_STRUCT.unpack(encoded)[0]
         return encoded if _is_equal_6_digits(numeric, decoded) else None
     if format_id in (FORMAT_STRING_U8, FORMAT_STRING_U16, FORMAT_STRING_U32, FORMAT_STRING_U64):
         if not isinstance(value, str):
@@ -1962,7 +2295,7 @@ def encode_value_for_format(value: Any, format_id: int) -> Optional[bytes]:
         max_len = (1 << (len_size * 8)) - 1
         if len(raw) > max_len:
             return None
-        return len(raw).to_bytes(len_size, "little") + raw
+        return _SCALAR_STRUCTS[(len_size, False)].pack(len(raw)) + raw
 
     shape = _numeric_format_shape(format_id)
     if shape is None:
@@ -1979,19 +2312,44 @@ def encode_value_for_format(value: Any, format_id: int) -> Optional[bytes]:
     if not _is_equal_6_digits(numeric, reconstructed):
         return None
 
-    if byte_count == 1:
-        return int(scaled).to_bytes(1, "little", signed=signed)
-    if byte_count == 2:
-        return int(scaled).to_bytes(2, "little", signed=signed)
     if byte_count == 3:
         if signed and scaled < 0:
             scaled = (1 << 24) + scaled
         return _write_u24(int(scaled))
-    if byte_count == 4:
-        return int(scaled).to_bytes(4, "little", signed=signed)
-    if byte_count == 8:
-        return int(scaled).to_bytes(8, "little", signed=signed)
-    return None
+    codec = _SCALAR_STRUCTS.get((byte_count, signed))
+    return codec.pack(scaled) if codec is not None else None
+
+
+@functools.lru_cache(maxsize=None)
+def _value_encoder_for_format(format_id: int) -> Callable[[Any], Optional[bytes]]:
+    # Same results as encode_value_for_format, with the format dispatch resolved once per format id.
+    if FORMAT_DOUBLE <= format_id <= FORMAT_DOUBLE_DEC6PLUS:
+        pack_double = _DOUBLE_STRUCT.pack
+
+        def encode_double(value: Any) -> Optional[bytes]:
+            numeric = float(value)
+            return pack_double(numeric) if math.isfinite(numeric) else None
+
+        return encode_double
+
+    shape = _numeric_format_shape(format_id)
+    if shape is not None and shape[0] != 3:
+        byte_count, signed, scale = shape
+        low, high = (_signed_range(byte_count) if signed else _unsigned_range(byte_count))
+        pack_scalar = _SCALAR_STRUCTS[(byte_count, signed)].pack
+
+        def encode_scaled(value: Any) -> Optional[bytes]:
+            numeric = float(value)
+            if not math.isfinite(numeric):
+                return None
+            scaled = int(round(numeric * scale))
+            if scaled < low or scaled > high or not _is_equal_6_digits(numeric, scaled / scale):
+                return None
+            return pack_scalar(scaled)
+
+        return encode_scaled
+
+    return functools.partial(encode_value_for_format, format_id=format_id)
 
 
 def _best_integer_meta_format(value: int) -> int:
@@ -2041,9 +2399,9 @@ def _write_meta_info_entry(f: Any, key: str, value: Any) -> None:
     payload = encode_value_for_format(value, format_id)
     if payload is None:
         raise ValueError(f"Cannot encode meta-info value for key={key!r}")
-    f.write(bytes([ENTRY_TYPE_META_INFO, len(key_bytes)]))
+    f.write(_PACK_BB(ENTRY_TYPE_META_INFO, len(key_bytes)))
     f.write(key_bytes)
-    f.write(bytes([format_id]))
+    f.write(_TOK[format_id])
     f.write(payload)
 
 
@@ -2110,6 +2468,9 @@ def compress_timeseries_db_file(input_path: str, output_path: str) -> dict[str,
         out.write(TSDB_TAG_BYTES)
         out.write(struct.pack("<I", TSDB_VERSION))
 
+        buf = bytearray()
+        # Per series: (value entry prefix, format id, encoder), resolved once instead of per event.
+        series_value_entries: dict[str, tuple[bytes, int, Callable[[Any], Optional[bytes]]]] = {}
         for series_name in first_seen_order:
             channel_id = series_to_channel[series_name]
             format_id = chosen_formats[series_name]
@@ -2117,49 +2478,24 @@ def compress_timeseries_db_file(input_path: str, output_path: str) -> dict[str,
             if len(name_bytes) > 255:
                 raise ValueError(f"Series name too long ({len(name_bytes)} bytes > 255): {series_name!r}")
             if channel_id <= 0xEF:
-                out.write(bytes([ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)]))
-            else:
-                out.write(bytes([ENTRY_TYPE_CHANNEL_DEF_16]))
-                out.write(channel_id.to_bytes(2, "little"))
-                out.write(bytes([format_id, len(name_bytes)]))
-            out.write(name_bytes)
-
-        for ts, series_name, value in events:
-            ts_int = int(ts)
-            if current_ts is None or ts_int < current_ts:
-                out.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-                out.write(ts_int.to_bytes(8, "little"))
+                buf += _PACK_CHANNEL_DEF_8(ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes))
+                prefix = _TOK[channel_id]
             else:
-                delta = ts_int - current_ts
-                if delta <= 0xFF:
-                    if delta != 0:
-                        out.write(bytes([ENTRY_TYPE_TIME_REL_8, delta]))
-                elif delta <= 0xFFFF:
-                    out.write(bytes([ENTRY_TYPE_TIME_REL_16]))
-                    out.write(delta.to_bytes(2, "little"))
-                elif delta <= 0xFFFFFF:
-                    out.write(bytes([ENTRY_TYPE_TIME_REL_24]))
-                    out.write(delta.to_bytes(3, "little"))
-                elif delta <= 0xFFFFFFFF:
-                    out.write(bytes([ENTRY_TYPE_TIME_REL_32]))
-                    out.write(delta.to_bytes(4, "little"))
-                else:
-                    out.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-                    out.write(ts_int.to_bytes(8, "little"))
-            current_ts = ts_int
-
-            channel_id = series_to_channel[series_name]
-            format_id = chosen_formats[series_name]
-            payload = encode_value_for_format(value, format_id)
-            if payload is None:
-                raise ValueError(f"Cannot encode value for series={series_name!r} with formatId=0x{format_id:02x}")
-
-            if channel_id <= 0xEF:
-                out.write(bytes([channel_id]))
-            else:
-                out.write(bytes([ENTRY_TYPE_CHANNEL_VALUE_16]))
-                out.write(channel_id.to_bytes(2, "little"))
-            out.write(payload)
+                buf += _PACK_CHANNEL_DEF_16(ENTRY_TYPE_CHANNEL_DEF_16, channel_id, format_id, len(name_bytes))
+                prefix = _PACK_B_U16(ENTRY_TYPE_CHANNEL_VALUE_16, channel_id)
+            buf += name_bytes
+            series_value_entries[series_name] = (prefix, format_id, _value_encoder_for_format(format_id))
+
+        for ts, run in itertools.groupby(events, key=lambda event: event[0]):
+            current_ts = _append_timestamp_entry(buf, current_ts, int(ts))
+            for _ts, series_name, value in run:
+                prefix, format_id, encode = series_value_entries[series_name]
+                payload = encode(value)
+                if payload is None:
+                    raise ValueError(f"Cannot encode value for series={series_name!r} with formatId=0x{format_id:02x}")
+                buf += prefix
+                buf += payload
+        out.write(buf)
 
     invalidate_tsdb_cache(output_path)
     return chosen_formats
@@ -2330,7 +2666,7 @@ def write_series_array_timeseries_db(
                 if len(next_bytes) == len(entry_size_bytes) and next_bytes == entry_size_bytes:
                     break
                 entry_size_bytes = next_bytes
-            f.write(bytes([ENTRY_TYPE_SERIES_ARRAY]))
+            f.write(_TOK[ENTRY_TYPE_SERIES_ARRAY])
             f.write(entry_size_bytes)
             f.write(payload)
 
@@ -2352,7 +2688,7 @@ def write_series_array_timeseries_db(
                     break
                 entry_size_bytes = next_bytes
 
-            f.write(bytes([ENTRY_TYPE_STRING_ENTRY]))
+            f.write(_TOK[ENTRY_TYPE_STRING_ENTRY])
             f.write(entry_size_bytes)
             f.write(payload)
     invalidate_tsdb_cache(path)
@@ -2429,129 +2765,131 @@ def _scan_tsdb_state_for_append(path: str) -> _TsdbAppendState:
     if not os.path.exists(path):
         return _TsdbAppendState({}, {}, 0, None, {})
     with open(path, "rb") as f:
-        raw = f.read()
-    if len(raw) < 12:
-        raise TsdbParseError(f"File too small: {path}")
+        if os.fstat(f.fileno()).st_size < 12:
+            raise TsdbParseError(f"File too small: {path}")
+        # Map the file read-only instead of copying it into one large bytes object.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+            with memoryview(raw) as mv:
+                return _scan_tsdb_buffer_for_append(raw, mv, path)
+
+
+def _scan_append_time_absolute(mv: memoryview, offset: int, current_ts: Optional[int], channel_defs: dict) -> Tuple[int, Optional[int]]:
+    _ensure_available(mv, offset, 8, "absolute timestamp")
+    return offset + 8, int.from_bytes(mv[offset:offset + 8], "little")
+
+
+def _scan_append_time_relative(width: int) -> Callable[[memoryview, int, Optional[int], dict], Tuple[int, Optional[int]]]:
+    what = f"relative timestamp ({width * 8}-bit)"
+
+    def handler(mv: memoryview, offset: int, current_ts: Optional[int], channel_defs: dict) -> Tuple[int, Optional[int]]:
+        _ensure_available(mv, offset, width, what)
+        if current_ts is None:
+            raise TsdbParseError("Relative timestamp before absolute timestamp")
+        return offset + width, current_ts + int.from_bytes(mv[offset:offset + width], "little")
+
+    return handler
+
+
+def _scan_append_channel_definition(id_width: int) -> Callable[[memoryview, int, Optional[int], dict], Tuple[int, Optional[int]]]:
+    what = f"{id_width * 8}-bit channel definition"
+
+    def handler(mv: memoryview, offset: int, current_ts: Optional[int], channel_defs: dict) -> Tuple[int, Optional[int]]:
+        _ensure_available(mv, offset, id_width + 2, what)
+        channel_id = int.from_bytes(mv[offset:offset + id_width], "little")
+        format_id = mv[offset + id_width]
+        name_len = mv[offset + id_width + 1]
+        offset += id_width + 2
+        _ensure_available(mv, offset, name_len, "channel name")
+        name = str(mv[offset:offset + name_len], "utf-8")
+        # Payload byte size when the value can be skipped without decoding; only
+        # "/name" series need their values, everything else just has to be stepped over.
+        skip_size = None if name.endswith("/name") else _fixed_format_value_size(format_id)
+        channel_defs[channel_id] = (format_id, name, skip_size)
+        return offset + name_len, current_ts
+
+    return handler
+
+
+# Handlers for the non-value entry types of time stream files, indexed by entry type byte.
+_SCAN_APPEND_HANDLERS: List[Optional[Callable[[memoryview, int, Optional[int], dict], Tuple[int, Optional[int]]]]] = [None] * 256
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_TIME_ABSOLUTE] = _scan_append_time_absolute
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_TIME_REL_8] = _scan_append_time_relative(1)
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_TIME_REL_16] = _scan_append_time_relative(2)
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_TIME_REL_24] = _scan_append_time_relative(3)
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_TIME_REL_32] = _scan_append_time_relative(4)
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_CHANNEL_DEF_8] = _scan_append_channel_definition(1)
+_SCAN_APPEND_HANDLERS[ENTRY_TYPE_CHANNEL_DEF_16] = _scan_append_channel_definition(2)
+
+
+def _scan_tsdb_buffer_for_append(raw: Any, mv: memoryview, path: str) -> _TsdbAppendState:
     if raw[:8] != TSDB_TAG_BYTES:
         raise TsdbParseError(f"Invalid TSDB tag in {path!r}")
-    version = int.from_bytes(raw[8:12], "little")
+    version = int.from_bytes(mv[8:12], "little")
     if version != TSDB_VERSION:
         raise TsdbParseError(f"Unsupported TSDB version {version} in {path!r}")
 
-    channel_defs: dict[int, tuple[int, str]] = {}
+    handlers = _SCAN_APPEND_HANDLERS
+    channel_defs: dict[int, tuple[int, str, Optional[int]]] = {}
+    channel_defs_get = channel_defs.get
+    decode_value = read_format_value
     current_ts: Optional[int] = None
     latest_name_values: dict[str, str] = {}
     offset = 12
-    while offset < len(raw):
+    end = len(raw)
+    while offset < end:
         entry_type = raw[offset]
         offset += 1
-        if entry_type <= 0xEF:
-            channel_id = entry_type
-            if channel_id not in channel_defs:
-                raise TsdbParseError(f"Undefined channel id {channel_id}")
-            fmt, name = channel_defs[channel_id]
-            value, offset = read_format_value(raw, offset, fmt)
-            if name.endswith("/name") and isinstance(value, str):
-                latest_name_values[name] = value
-            continue
-        if entry_type == ENTRY_TYPE_CHANNEL_VALUE_16:
-            _ensure_available(raw, offset, 2, "16-bit channel id")
-            channel_id = int.from_bytes(raw[offset:offset + 2], "little")
-            offset += 2
-            if channel_id not in channel_defs:
-                raise TsdbParseError(f"Undefined 16-bit channel id {channel_id}")
-            fmt, name = channel_defs[channel_id]
-            value, offset = read_format_value(raw, offset, fmt)
+        if entry_type <= 0xEF or entry_type == ENTRY_TYPE_CHANNEL_VALUE_16:
+            if entry_type <= 0xEF:
+                channel = channel_defs_get(entry_type)
+                if channel is None:
+                    raise TsdbParseError(f"Undefined channel id {entry_type}")
+            else:
+                if offset + 2 > end:
+                    _ensure_available(raw, offset, 2, "16-bit channel id")
+                channel_id = raw[offset] | (raw[offset + 1] << 8)
+                offset += 2
+                channel = channel_defs_get(channel_id)
+                if channel is None:
+                    raise TsdbParseError(f"Undefined 16-bit channel id {channel_id}")
+            fmt, name, skip_size = channel
+            if skip_size is not None:
+                offset += skip_size
+                if offset > end:
+                    _ensure_available(raw, offset - skip_size, skip_size, "value")
+                continue
+            value, offset = decode_value(raw, offset, fmt)
             if name.endswith("/name") and isinstance(value, str):
                 latest_name_values[name] = value
             continue
-        if entry_type == ENTRY_TYPE_TIME_ABSOLUTE:
-            _ensure_available(raw, offset, 8, "absolute timestamp")
-            current_ts = int.from_bytes(raw[offset:offset + 8], "little")
-            offset += 8
-            continue
-        if entry_type == ENTRY_TYPE_TIME_REL_8:
-            _ensure_available(raw, offset, 1, "relative timestamp (8-bit)")
-            if current_ts is None:
-                raise TsdbParseError("Relative timestamp before absolute timestamp")
-            current_ts += raw[offset]
-            offset += 1
-            continue
-        if entry_type == ENTRY_TYPE_TIME_REL_16:
-            _ensure_available(raw, offset, 2, "relative timestamp (16-bit)")
-            if current_ts is None:
-                raise TsdbParseError("Relative timestamp before absolute timestamp")
-            current_ts += int.from_bytes(raw[offset:offset + 2], "little")
-            offset += 2
-            continue
-        if entry_type == ENTRY_TYPE_TIME_REL_24:
-            rel, offset = _read_u24(raw, offset)
-            if current_ts is None:
-                raise TsdbParseError("Relative timestamp before absolute timestamp")
-            current_ts += rel
-            continue
-        if entry_type == ENTRY_TYPE_TIME_REL_32:
-            _ensure_available(raw, offset, 4, "relative timestamp (32-bit)")
-            if current_ts is None:
-                raise TsdbParseError("Relative timestamp before absolute timestamp")
-            current_ts += int.from_bytes(raw[offset:offset + 4], "little")
-            offset += 4
-            continue
-        if entry_type == ENTRY_TYPE_CHANNEL_DEF_8:
-            _ensure_available(raw, offset, 3, "8-bit channel definition")
-            channel_id = raw[offset]
-            format_id = raw[offset + 1]
-            name_len = raw[offset + 2]
-            offset += 3
-            _ensure_available(raw, offset, name_len, "channel name")
-            name = raw[offset:offset + name_len].decode("utf-8")
-            offset += name_len
-            channel_defs[channel_id] = (format_id, name)
-            continue
-        if entry_type == ENTRY_TYPE_CHANNEL_DEF_16:
-            _ensure_available(raw, offset, 4, "16-bit channel definition")
-            channel_id = int.from_bytes(raw[offset:offset + 2], "little")
-            format_id = raw[offset + 2]
-            name_len = raw[offset + 3]
-            offset += 4
-            _ensure_available(raw, offset, name_len, "channel name")
-            name = raw[offset:offset + name_len].decode("utf-8")
-            offset += name_len
-            channel_defs[channel_id] = (format_id, name)
-            continue
-        raise TsdbParseError(f"Unknown entry type 0x{entry_type:02x} at offset {offset - 1}")
+        handler = handlers[entry_type]
+        if handler is None:
+            raise TsdbParseError(f"Unknown entry type 0x{entry_type:02x} at offset {offset - 1}")
+        offset, current_ts = handler(mv, offset, current_ts, channel_defs)
 
     series_to_channel: dict[str, int] = {}
     series_to_format: dict[str, int] = {}
-    for channel_id, (format_id, name) in channel_defs.items():
+    for channel_id, (format_id, name, _skip_size) in channel_defs.items():
         series_to_channel[name] = channel_id
         series_to_format[name] = format_id
     next_channel_id = (max(channel_defs.keys()) + 1) if channel_defs else 0
     return _TsdbAppendState(series_to_channel, series_to_format, next_channel_id, current_ts, latest_name_values)
 
 
-def _append_timestamp_entry(f: Any, current_ts: Optional[int], new_ts: int) -> int:
+def _timestamp_entry_bytes(current_ts: Optional[int], new_ts: int) -> bytes:
     if current_ts is None or new_ts < current_ts:
-        f.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-        f.write(new_ts.to_bytes(8, "little"))
-        return new_ts
+        return _PACK_B_U64(ENTRY_TYPE_TIME_ABSOLUTE, new_ts)
     delta = new_ts - current_ts
     if delta == 0:
-        return new_ts
-    if delta <= 0xFF:
-        f.write(bytes([ENTRY_TYPE_TIME_REL_8, delta]))
-    elif delta <= 0xFFFF:
-        f.write(bytes([ENTRY_TYPE_TIME_REL_16]))
-        f.write(delta.to_bytes(2, "little"))
-    elif delta <= 0xFFFFFF:
-        f.write(bytes([ENTRY_TYPE_TIME_REL_24]))
-        f.write(delta.to_bytes(3, "little"))
-    elif delta <= 0xFFFFFFFF:
-        f.write(bytes([ENTRY_TYPE_TIME_REL_32]))
-        f.write(delta.to_bytes(4, "little"))
-    else:
-        f.write(bytes([ENTRY_TYPE_TIME_ABSOLUTE]))
-        f.write(new_ts.to_bytes(8, "little"))
+        return b""
+    width = (delta.bit_length() + 7) >> 3
+    if width <= 4:
+        return _REL_TIMESTAMP_PACKERS[width](delta)
+    return _PACK_B_U64(ENTRY_TYPE_TIME_ABSOLUTE, new_ts)
+
+
+def _append_timestamp_entry(out: bytearray, current_ts: Optional[int], new_ts: int) -> int:
+    out += _timestamp_entry_bytes(current_ts, new_ts)
     return new_ts
 
 
@@ -2609,6 +2947,7 @@ def write_downsampled_timeseries_db(
         f.write(struct.pack("<I", TSDB_VERSION))
         _write_meta_info_entry(f, "dsBucketMs", int(bucket_ms))
 
+        buf = bytearray()
         for series_name in series_names:
             channel_id = series_to_channel[series_name]
             format_id = series_to_format[series_name]
@@ -2616,26 +2955,36 @@ def write_downsampled_timeseries_db(
             if len(name_bytes) > 255:
                 raise ValueError(f"Series name too long ({len(name_bytes)} bytes > 255): {series_name!r}")
             if channel_id <= 0xEF:
-                f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)]))
+                buf += _PACK_CHANNEL_DEF_8(ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes))
             else:
-                f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_16]))
-                f.write(channel_id.to_bytes(2, "little"))
-                f.write(bytes([format_id, len(name_bytes)]))
-            f.write(name_bytes)
+                buf += _PACK_CHANNEL_DEF_16(ENTRY_TYPE_CHANNEL_DEF_16, channel_id, format_id, len(name_bytes))
+            buf += name_bytes
 
         current_ts: Optional[int] = None
         for timestamp_ms in sorted(per_timestamp.keys()):
-            current_ts = _append_timestamp_entry(f, current_ts, int(timestamp_ms))
+            current_ts = _append_timestamp_entry(buf, current_ts, int(timestamp_ms))
             for channel_id, payload in sorted(per_timestamp[timestamp_ms], key=lambda item: item[0]):
                 if channel_id <= 0xEF:
-                    f.write(bytes([channel_id]))
+                    buf.append(channel_id)
                 else:
-                    f.write(bytes([ENTRY_TYPE_CHANNEL_VALUE_16]))
-                    f.write(channel_id.to_bytes(2, "little"))
-                f.write(payload)
+                    buf += _PACK_B_U16(ENTRY_TYPE_CHANNEL_VALUE_16, channel_id)
+                buf += payload
+        f.write(buf)
     invalidate_tsdb_cache(path)
 
 
+def _append_bytes_to_file(path: str, data: bytes) -> None:
+    # One O_APPEND write per batch; loop only for the rare short write.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
 class TimeSeriesDbAppender:
     def __init__(self, path: str) -> None:
         self.path = path
@@ -2645,6 +2994,8 @@ class TimeSeriesDbAppender:
         self.next_channel_id = state.next_channel_id
         self.current_timestamp_ms = state.current_timestamp_ms
         self.latest_name_values = dict(state.latest_name_values)
+        # series_name -> (channel_id, format_id, value entry prefix bytes, is_name_series)
+        self._series_cache: dict[str, tuple[int, int, bytes, bool]] = {}
 
     def _ensure_file_ready(self) -> None:
         if not os.path.exists(self.path):
@@ -2662,7 +3013,12 @@ class TimeSeriesDbAppender:
                 invalidate_tsdb_cache(self.path)
             return
 
-    def _ensure_series_definition(self, f: Any, series_name: str, format_id: int) -> int:
+    def _ensure_series_definition(
+        self, out: list[bytes], series_name: str, format_id: int
+    ) -> tuple[int, int, bytes, bool]:
+        cached = self._series_cache.get(series_name)
+        if cached is not None and cached[1] == format_id:
+            return cached
         if series_name in self.series_to_channel:
             existing_fmt = self.series_to_format[series_name]
             if existing_fmt != format_id:
@@ -2670,60 +3026,100 @@ class TimeSeriesDbAppender:
                     f"Series {series_name!r} already uses formatId=0x{existing_fmt:02x}; "
                     f"cannot append formatId=0x{format_id:02x}"
                 )
-            return self.series_to_channel[series_name]
-        channel_id = self.next_channel_id
-        if channel_id > 0xFFFF:
-            raise ValueError("Exceeded max channel id (65535)")
-        self.next_channel_id += 1
-        name_bytes = series_name.encode("utf-8")
-        if len(name_bytes) > 255:
-            raise ValueError(f"Series name too long ({len(name_bytes)} bytes > 255): {series_name!r}")
+            channel_id = self.series_to_channel[series_name]
+        else:
+            channel_id = self.next_channel_id
+            if channel_id > 0xFFFF:
+                raise ValueError("Exceeded max channel id (65535)")
+            name_bytes = series_name.encode("utf-8")
+            if len(name_bytes) > 255:
+                raise ValueError(f"Series name too long ({len(name_bytes)} bytes > 255): {series_name!r}")
+            self.next_channel_id += 1
+            if channel_id <= 0xEF:
+                out.append(_PACK_CHANNEL_DEF_8(ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)))
+            else:
+                out.append(_PACK_CHANNEL_DEF_16(ENTRY_TYPE_CHANNEL_DEF_16, channel_id, format_id, len(name_bytes)))
+            out.append(name_bytes)
+            self.series_to_channel[series_name] = channel_id
+            self.series_to_format[series_name] = format_id
         if channel_id <= 0xEF:
-            f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_8, channel_id, format_id, len(name_bytes)]))
+            prefix = _TOK[channel_id]
         else:
-            f.write(bytes([ENTRY_TYPE_CHANNEL_DEF_16]))
-            f.write(channel_id.to_bytes(2, "little"))
-            f.write(bytes([format_id, len(name_bytes)]))
-        f.write(name_bytes)
-        self.series_to_channel[series_name] = channel_id
-        self.series_to_format[series_name] = format_id
-        return channel_id
+            prefix = _PACK_B_U16(ENTRY_TYPE_CHANNEL_VALUE_16, channel_id)
+        cached = (channel_id, format_id, prefix, series_name.endswith("/name"))
+        self._series_cache[series_name] = cached
+        return cached
 
     def append_events(self, events: list[tuple[int, str, Any]]) -> None:
         if not events:
             return
+        self._append_rows(events)
+
+    def append_columns(self, timestamps: Any, names: Any, values: Any) -> None:
+        # Parallel column sequences (e.g. array('q')/array('d')); names may be one str for all values.
+        count = len(timestamps)
+        if len(values) != count or (not isinstance(names, str) and len(names) != count):
+            raise ValueError("timestamps, names and values must have the same length")
+        if count == 0:
+            return
+        if isinstance(names, str):
+            names = itertools.repeat(names, count)
+        self._append_rows(zip(timestamps, names, values))
+
+    def _append_rows(self, events: Iterable[tuple[int, str, Any]]) -> None:
         self._ensure_file_ready()
-        with open(self.path, "ab") as f:
+        # Entry chunks are joined once at the end; b"".join sizes the output up front.
+        parts: list[bytes] = []
+        add_parts = parts.extend
+        latest_name_values = self.latest_name_values
+        series_cache_get = self._series_cache.get
+        series_to_format_get = self.series_to_format.get
+        ensure_series_definition = self._ensure_series_definition
+        encoder_for_format = _value_encoder_for_format
+        encode_string = encoder_for_format(FORMAT_STRING_U64)
+        timestamp_entry_bytes = _timestamp_entry_bytes
+        current_ts = self.current_timestamp_ms
+        try:
             for timestamp_ms, series_name, value in events:
-                if series_name.endswith("/name") and isinstance(value, str) and self.latest_name_values.get(series_name) == value:
-                    continue
+                cached = series_cache_get(series_name)
                 if isinstance(value, str):
+                    is_name_string = cached[3] if cached is not None else series_name.endswith("/name")
+                    if is_name_string and latest_name_values.get(series_name) == value:
+                        continue
                     format_id = FORMAT_STRING_U64
-                    payload = encode_value_for_format(value, format_id)
+                    payload = encode_string(value)
                 else:
+                    is_name_string = False
                     decimals_hint = 0
                     numeric_value = value
                     if isinstance(value, NumericWithDecimals):
                         numeric_value = value.value
                         decimals_hint = value.decimals
-                    format_id = self.series_to_format.get(series_name)
-                    if format_id is None:
-                        format_id = double_format_id_for_decimals(decimals_hint)
-                    payload = encode_value_for_format(float(numeric_value), format_id)
+                    if cached is not None:
+                        format_id = cached[1]
+                    else:
+                        format_id = series_to_format_get(series_name)
+                        if format_id is None:
+                            format_id = double_format_id_for_decimals(decimals_hint)
+                    payload = encoder_for_format(format_id)(float(numeric_value))
                 if payload is None:
                     raise ValueError(f"Cannot encode value for series={series_name!r}")
 
-                channel_id = self._ensure_series_definition(f, series_name, format_id)
+                if cached is None or cached[1] != format_id:
+                    cached = ensure_series_definition(parts, series_name, format_id)
                 ts_int = int(timestamp_ms)
-                if self.current_timestamp_ms is not None and ts_int < self.current_timestamp_ms:
-                    ts_int = self.current_timestamp_ms
-                self.current_timestamp_ms = _append_timestamp_entry(f, self.current_timestamp_ms, ts_int)
-                if channel_id <= 0xEF:
-                    f.write(bytes([channel_id]))
+                if ts_int == current_ts:
+                    add_parts((cached[2], payload))
                 else:
-                    f.write(bytes([ENTRY_TYPE_CHANNEL_VALUE_16]))
-                    f.write(channel_id.to_bytes(2, "little"))
-                f.write(payload)
-                if series_name.endswith("/name") and isinstance(value, str):
-                    self.latest_name_values[series_name] = value
+                    if current_ts is not None and ts_int < current_ts:
+                        ts_int = current_ts
+                    add_parts((timestamp_entry_bytes(current_ts, ts_int), cached[2], payload))
+                    current_ts = ts_int
+                if is_name_string:
+                    latest_name_values[series_name] = value
+        finally:
+            self.current_timestamp_ms = current_ts
+            # Entries encoded before a failing event are still written, matching the per-entry write behavior.
+            if parts:
+                _append_bytes_to_file(self.path, b"".join(parts))
         invalidate_tsdb_cache(self.path)
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import copy
 import datetime
 from http import HTTPStatus
+import http.client
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import math
-import mimetypes
 import os
+import signal
+import stat
 import sys
 import tempfile
 import threading
@@ -13,11 +17,20 @@ import time
 from typing import Any, Optional
 import json
 import fnmatch
+import functools
+import gzip
+import hashlib
 import re
 import queue as queue_mod
 from urllib.parse import unquote, urlparse
+import urllib.error
 import urllib.request
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional, stdlib json is used otherwise
+    orjson = None
+
 from tsdb import (
     NumericWithDecimals,
     TimeSeriesDbAppender,
@@ -31,7 +44,33 @@ from tsdb import (
     write_series_array_timeseries_db,
 )
 
-COLLECTOR_UI_API_VERSION = 1
+COLLECTOR_UI_API_VERSION = 2  # Increment when UI API endpoints or payload schemas change.
+
+
+# orjson turns integers outside the 64-bit range into floats; 19+ digit runs go to stdlib json instead.
+_LONG_DIGITS_RE = re.compile(r"[0-9]{19}")
+_LONG_DIGITS_BYTES_RE = re.compile(rb"[0-9]{19}")
+
+
+def _json_loads(raw: str | bytes) -> Any:
+    long_digits_re = _LONG_DIGITS_RE if isinstance(raw, str) else _LONG_DIGITS_BYTES_RE
+    if orjson is not None and long_digits_re.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # stdlib also accepts NaN/Infinity and reports the error text
+    return json.loads(raw)
+
+
+def _json_dumps_bytes(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 def _tsdb_filename_for_utc_day(day: datetime.date) -> str:
     return f"data_{day.isoformat()}.tsdb"
 
@@ -40,28 +79,47 @@ def _mqttlog_tsdb_filename_for_utc_day(day: datetime.date) -> str:
     return f"mqttlog_{day.isoformat()}.tsdb"
 
 
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
 def _value_from_mqtt_payload(payload: bytes) -> Any:
+    raw = payload[3:] if payload.startswith(_UTF8_BOM) else payload
     try:
-        text = payload.decode("utf-8-sig").strip()
+        text = raw.decode("utf-8").strip()
     except Exception:
         return f"hex:{payload.hex()}"
-    numeric = _parse_strict_float(text)
-    if numeric is not None:
-        mantissa = text
-        exp = 0
-        if "e" in mantissa.lower():
-            parts = mantissa.lower().split("e", 1)
-            mantissa = parts[0]
-            try:
-                exp = int(parts[1])
-            except Exception:
-                exp = 0
-        decimals = 0
-        if "." in mantissa:
-            decimals = len(mantissa.split(".", 1)[1])
-        effective_decimals = max(0, decimals - exp)
-        return NumericWithDecimals(float(numeric), max(0, effective_decimals))
-    return text
+    # float() also accepts inf/nan and digit separators; the strict literal syntax does not.
+    if not text or (text[0] not in _NUM_PREFIX and not text[0].isdecimal()) or "_" in text or "n" in text or "N" in text:
+        return text
+    try:
+        numeric = float(text)
+    except ValueError:
+        return text
+    mantissa_end = text.find("e")
+    if mantissa_end < 0:
+        mantissa_end = text.find("E")
+    exp = 0
+    if mantissa_end < 0:
+        mantissa_end = len(text)
+    else:
+        try:
+            exp = int(text[mantissa_end + 1 :])
+        except ValueError:
+            exp = 0  # exponents beyond int()'s digit limit (the value is already inf or 0.0)
+    dot = text.find(".", 0, mantissa_end)
+    decimals = mantissa_end - dot - 1 if dot >= 0 else 0
+    return NumericWithDecimals(numeric, max(0, decimals - exp))
+
+
+_UNIX_EPOCH_DATE = datetime.date(1970, 1, 1)
+_MS_PER_DAY = 86_400_000
+
+
+def _group_events_by_utc_day(events: list[tuple[int, str, Any]]) -> dict[datetime.date, list[tuple[int, str, Any]]]:
+    by_day_index: dict[int, list[tuple[int, str, Any]]] = {}
+    for event in events:
+        by_day_index.setdefault(int(event[0]) // _MS_PER_DAY, []).append(event)
+    return {_UNIX_EPOCH_DATE + datetime.timedelta(days=day_index): day_events for day_index, day_events in by_day_index.items()}
 
 
 def _quantize_timestamp_ms(timestamp_ms: int, quantize_timestamps_ms: int) -> int:
@@ -78,6 +136,7 @@ def collect_to_tsdb(
     quantize_timestamps_ms: int = 0,
     data_dir: str = ".",
     http_config: Optional[dict[str, Any]] = None,
+    stop_event: Optional[threading.Event] = None,
 ) -> int:
     http_cfg = http_config if isinstance(http_config, dict) else {}
     http_urls_raw = http_cfg.get("urls", [])
@@ -203,15 +262,17 @@ def collect_to_tsdb(
 
         def on_message(client, userdata, msg):
             ts_ms = _quantize_timestamp_ms(int(time.time() * 1000), quantize_timestamps_ms)
+            # msg.topic decodes on every access; interning lets queued events share one str per topic.
+            topic = sys.intern(msg.topic)
             value = _value_from_mqtt_payload(msg.payload)
             value_for_log = value.value if isinstance(value, NumericWithDecimals) else value
             if verbose >= 2:
-                print(f"received: {msg.topic}={value_for_log}")
+                print(f"received: {topic}={value_for_log}")
             with lock:
-                if matches_any(subscriptions, msg.topic):
-                    pending_events.append((ts_ms, msg.topic, value))
-                if matches_any(mqttlog_subscriptions, msg.topic):
-                    pending_mqttlog_events.append((ts_ms, msg.topic, value))
+                if matches_any(subscriptions, topic):
+                    pending_events.append((ts_ms, topic, value))
+                if matches_any(mqttlog_subscriptions, topic):
+                    pending_mqttlog_events.append((ts_ms, topic, value))
 
         client.on_connect = on_connect
         client.on_message = on_message
@@ -227,11 +288,7 @@ def collect_to_tsdb(
             batch.sort(key=lambda item: int(item[0]))
         if mqttlog_batch:
             mqttlog_batch.sort(key=lambda item: int(item[0]))
-        by_day: dict[datetime.date, list[tuple[int, str, Any]]] = {}
-        for ts_ms, topic, value in batch:
-            day = datetime.datetime.fromtimestamp(ts_ms / 1000.0, tz=datetime.timezone.utc).date()
-            by_day.setdefault(day, []).append((ts_ms, topic, value))
-        for day, day_events in by_day.items():
+        for day, day_events in _group_events_by_utc_day(batch).items():
             if day not in appenders:
                 path = os.path.join(data_dir, _tsdb_filename_for_utc_day(day))
                 if verbose:
@@ -249,11 +306,7 @@ def collect_to_tsdb(
         if verbose and batch:
             print(f"flushed {len(batch)} events")
 
-        by_day_mqttlog: dict[datetime.date, list[tuple[int, str, Any]]] = {}
-        for ts_ms, topic, value in mqttlog_batch:
-            day = datetime.datetime.fromtimestamp(ts_ms / 1000.0, tz=datetime.timezone.utc).date()
-            by_day_mqttlog.setdefault(day, []).append((ts_ms, topic, value))
-        for day, day_events in by_day_mqttlog.items():
+        for day, day_events in _group_events_by_utc_day(mqttlog_batch).items():
             if day not in mqttlog_appenders:
                 path = os.path.join(data_dir, _mqttlog_tsdb_filename_for_utc_day(day))
                 if verbose:
@@ -271,6 +324,24 @@ def collect_to_tsdb(
         if verbose and mqttlog_batch:
             print(f"flushed {len(mqttlog_batch)} mqttlog events")
 
+    def take_pending_batches() -> tuple[list[tuple[int, str, Any]], list[tuple[int, str, Any]]]:
+        # Hand the pending lists over and start fresh ones; the lock is held only for the swap.
+        nonlocal pending_events, pending_mqttlog_events
+        with lock:
+            batch, pending_events = pending_events, []
+            mqttlog_batch, pending_mqttlog_events = pending_mqttlog_events, []
+        return batch, mqttlog_batch
+
+    # The main loop blocks on this event until the next flush/poll deadline; setting it stops collection.
+    if stop_event is None:
+        stop_event = threading.Event()
+
+    # Poll several HTTP sources concurrently so a cycle takes as long as the slowest one, not their sum.
+    http_pool = (
+        concurrent.futures.ThreadPoolExecutor(max_workers=min(16, len(http_urls)), thread_name_prefix="tsdb-http")
+        if len(http_urls) > 1
+        else None
+    )
     if client is not None:
         client.loop_start()
     flush_interval_s = 10.0
@@ -278,18 +349,23 @@ def collect_to_tsdb(
     last_flush = time.monotonic()
     next_http_poll = time.monotonic()
     try:
-        while True:
+        while not stop_event.is_set():
             now = time.monotonic()
             if http_urls and now >= next_http_poll:
                 http_pending_values: list[tuple[str, Any]] = []
                 emitted = 0
-                for url_cfg in http_urls:
-                    url_raw = str(url_cfg.get("url", "")).strip()
-                    url = resolve_http_url(url_raw, http_base_url)
+                urls = [resolve_http_url(str(url_cfg.get("url", "")).strip(), http_base_url) for url_cfg in http_urls]
+                fetch_urls = [url for url in urls if url]
+                fetch = functools.partial(fetch_http_json_flattened, keepalive=True)
+                if http_pool is not None:
+                    fetched = http_pool.map(fetch, fetch_urls)
+                else:
+                    fetched = map(fetch, fetch_urls)
+                for url_cfg, url in zip(http_urls, urls):
                     base_topic = str(url_cfg.get("base_topic", "")).strip().strip("/")
                     if not url:
                         continue
-                    flat, error = fetch_http_json_flattened(url)
+                    flat, error = next(fetched)
                     if error:
                         if verbose:
                             print(f"http fetch failed: {url} ({error})")
@@ -330,12 +406,7 @@ def collect_to_tsdb(
 
             # Always check flushing right after a poll cycle and before sleeping.
             if now - last_flush >= flush_interval_s:
-                with lock:
-                    batch = list(pending_events)
-                    mqttlog_batch = list(pending_mqttlog_events)
-                    pending_events.clear()
-                    pending_mqttlog_events.clear()
-                flush_batch(batch, mqttlog_batch)
+                flush_batch(*take_pending_batches())
                 last_flush = now
 
             now = time.monotonic()
@@ -343,32 +414,36 @@ def collect_to_tsdb(
             sleep_until = min(next_http_poll, next_flush_deadline) if http_urls else next_flush_deadline
             sleep_s = max(0.0, sleep_until - now)
             if sleep_s > 0:
-                time.sleep(sleep_s)
+                stop_event.wait(sleep_s)
     except KeyboardInterrupt:
         pass
     finally:
-        with lock:
-            batch = list(pending_events)
-            mqttlog_batch = list(pending_mqttlog_events)
-            pending_events.clear()
-            pending_mqttlog_events.clear()
-        flush_batch(batch, mqttlog_batch)
+        flush_batch(*take_pending_batches())
         downsample_queue.join()
         downsample_queue.put(None)
         downsample_queue.join()
         worker.join(timeout=1.0)
+        if http_pool is not None:
+            http_pool.shutdown(wait=False, cancel_futures=True)
         if client is not None:
             client.loop_stop()
             client.disconnect()
     return 0
 
 
+_FLOAT_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NUM_PREFIX = frozenset("-+0123456789.")
+
+
 def _parse_strict_float(text: str) -> Optional[float]:
-    if re.fullmatch(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?", text.strip()) is None:
+    stripped = text.strip()
+    if not stripped or (stripped[0] not in _NUM_PREFIX and not stripped[0].isdecimal()):
+        return None
+    if _FLOAT_RE.fullmatch(stripped) is None:
         return None
     try:
-        return float(text)
-    except Exception:
+        return float(stripped)
+    except ValueError:
         return None
 
 
@@ -696,13 +771,6 @@ def _range_for_series(series_name: str, base: float) -> tuple[float, float]:
     return low, high
 
 
-def _bounded_sin(min_value: float, max_value: float, phase: float, periods_per_day: int, day_fraction: float) -> float:
-    mid = (min_value + max_value) * 0.5
-    amp = (max_value - min_value) * 0.5
-    value = mid + amp * math.sin((2.0 * math.pi * periods_per_day * day_fraction) + phase)
-    return min(max(value, min_value), max_value)
-
-
 def generateDemoData(days: int, output_dir: str = ".", data_txt_path: Optional[str] = None) -> list[str]:
     if days <= 0:
         raise ValueError(f"days must be > 0, got {days}")
@@ -731,9 +799,56 @@ def generateDemoData(days: int, output_dir: str = ".", data_txt_path: Optional[s
     series_decimals: dict[str, int] = {
         name: dp for name, _base, is_num, dp in series if is_num
     }
-    cumulative_yieldtotal: dict[str, float] = {
-        name: max(0.0, base_numeric.get(name, 0.0)) for name in yieldtotal_series
-    }
+
+    # Per-series demo parameters that do not change between steps.
+    # kind: 0 = string, 1 = on/off flag, 2 = uptime counter, 3 = bounded sine.
+    series_plan: list[tuple[int, str, Any, int, float, float, float, float, float, float]] = []
+    for idx, (name, base_value, is_num, decimal_places) in enumerate(series):
+        if not is_num:
+            series_plan.append((0, name, str(base_value), 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+            continue
+        suffix = _metric_suffix(name)
+        if suffix in {"yieldday", "yieldtotal"}:
+            continue
+        min_v, max_v = _range_for_series(name, float(base_value))
+        if suffix in {"producing", "reachable", "is_valid"}:
+            kind = 1
+        elif suffix == "uptime":
+            kind = 2
+        else:
+            kind = 3
+        series_plan.append(
+            (
+                kind,
+                name,
+                float(base_value),
+                decimal_places,
+                min_v,
+                max_v,
+                (min_v + max_v) * 0.5,
+                (max_v - min_v) * 0.5,
+                2.0 * math.pi * ((idx % 24) + 1),
+                idx * 0.73,
+            )
+        )
+    sin = math.sin
+    # Yield series integrate their sibling power series; info tuples index into yield_power_series.
+    yield_power_series = sorted(
+        {name.replace("/yieldday", "/power") for name in yieldday_series}
+        | {name.replace("/yieldtotal", "/power") for name in yieldtotal_series}
+    )
+    power_index = {power_series: pos for pos, power_series in enumerate(yield_power_series)}
+    yieldday_info = [
+        (name, power_index[name.replace("/yieldday", "/power")], series_decimals.get(name, 3))
+        for name in sorted(yieldday_series)
+    ]
+    yieldtotal_info = [
+        (name, power_index[name.replace("/yieldtotal", "/power")], series_decimals.get(name, 3))
+        for name in sorted(yieldtotal_series)
+    ]
+    step_kwh_per_w = step_hours / 1000.0
+    # Running yields live in lists parallel to the *_info lists above.
+    cumulative_yieldtotal = [max(0.0, base_numeric.get(name, 0.0)) for name, _power, _dp in yieldtotal_info]
 
     produced_files: list[str] = []
     for day_index in range(days):
@@ -742,49 +857,44 @@ def generateDemoData(days: int, output_dir: str = ".", data_txt_path: Optional[s
         start_ms = int(start_dt.timestamp() * 1000)
         path = os.path.join(output_dir, f"demo_{day.isoformat()}.tsdb")
         produced_files.append(path)
+        day_phase = day_index * 0.11
 
-        daily_yields: dict[str, float] = {name: 0.0 for name in yieldday_series}
+        daily_yields = [0.0] * len(yieldday_info)
         with create_timeseries_db_writer(path) as writer:
+            add_value = writer.addValue
+            add_string_value = writer.addStringValue
             for step_idx in range(steps_per_day):
                 ts = start_ms + step_idx * step_ms
                 day_fraction = step_idx / steps_per_day
 
                 numeric_cache: dict[str, float] = {}
-                for idx, (name, base_value, is_num, decimal_places) in enumerate(series):
-                    if not is_num:
-                        writer.addStringValue(name, str(base_value), timestamp_ms=ts)
-                        continue
-
-                    suffix = _metric_suffix(name)
-                    if suffix in {"yieldday", "yieldtotal"}:
+                for kind, name, base_value, decimal_places, min_v, max_v, mid, amp, omega, series_phase in series_plan:
+                    if kind == 0:
+                        add_string_value(name, base_value, timestamp_ms=ts)
                         continue
-
-                    periods = (idx % 24) + 1
-                    phase = (idx * 0.73) + (day_index * 0.11)
-                    min_v, max_v = _range_for_series(name, float(base_value))
-                    if suffix in {"producing", "reachable", "is_valid"}:
-                        raw = _bounded_sin(min_v, max_v, phase, periods, day_fraction)
-                        value = 1.0 if raw >= 0.5 else 0.0
-                    elif suffix == "uptime":
-                        value = float(base_value) + (step_idx * step_hours * 3600.0)
+                    if kind == 2:
+                        value = base_value + (step_idx * step_hours * 3600.0)
                     else:
-                        value = _bounded_sin(min_v, max_v, phase, periods, day_fraction)
+                        value = mid + amp * sin((omega * day_fraction) + (series_phase + day_phase))
+                        value = min(max(value, min_v), max_v)
+                        if kind == 1:
+                            value = 1.0 if value >= 0.5 else 0.0
                     value = _quantize_numeric(value, decimal_places)
                     numeric_cache[name] = value
-                    writer.addValue(name, float(value), timestamp_ms=ts)
+                    add_value(name, float(value), timestamp_ms=ts)
 
-                for name in sorted(yieldday_series):
-                    power_series = name.replace("/yieldday", "/power")
-                    power_w = max(0.0, float(numeric_cache.get(power_series, 0.0)))
-                    writer.addValue(name, _quantize_numeric(daily_yields[name], series_decimals.get(name, 3)), timestamp_ms=ts)
-                    daily_yields[name] += (power_w * step_hours) / 1000.0
+                # Energy per power series for this step, shared by its yieldday and yieldtotal series.
+                step_kwh = [
+                    max(0.0, float(numeric_cache.get(power_series, 0.0))) * step_kwh_per_w
+                    for power_series in yield_power_series
+                ]
+                for pos, (name, power_pos, decimals) in enumerate(yieldday_info):
+                    add_value(name, _quantize_numeric(daily_yields[pos], decimals), timestamp_ms=ts)
+                    daily_yields[pos] += step_kwh[power_pos]
 
-                for name in sorted(yieldtotal_series):
-                    power_series = name.replace("/yieldtotal", "/power")
-                    power_w = max(0.0, float(numeric_cache.get(power_series, 0.0)))
-                    current_total = cumulative_yieldtotal.get(name, 0.0)
-                    writer.addValue(name, _quantize_numeric(current_total, series_decimals.get(name, 3)), timestamp_ms=ts)
-                    cumulative_yieldtotal[name] = current_total + (power_w * step_hours) / 1000.0
+                for pos, (name, power_pos, decimals) in enumerate(yieldtotal_info):
+                    add_value(name, _quantize_numeric(cumulative_yieldtotal[pos], decimals), timestamp_ms=ts)
+                    cumulative_yieldtotal[pos] += step_kwh[power_pos]
 
             writer.close()
 
@@ -793,37 +903,39 @@ def generateDemoData(days: int, output_dir: str = ".", data_txt_path: Optional[s
 
 
 
-def read_default_server(rc_path: str) -> Optional[str]:
-    config = load_collector_config(rc_path)
-    mqtt = config.get("mqtt", {}) if isinstance(config.get("mqtt"), dict) else {}
+def _mqtt_section(rc_path: str, config: Optional[dict[str, Any]]) -> dict[str, Any]:
+    if config is None:
+        config = load_collector_config(rc_path)
+    mqtt = config.get("mqtt")
+    return mqtt if isinstance(mqtt, dict) else {}
+
+
+def read_default_server(rc_path: str, config: Optional[dict[str, Any]] = None) -> Optional[str]:
+    mqtt = _mqtt_section(rc_path, config)
     server = str(mqtt.get("mqtt_server", "")).strip()
     return server or None
 
 
-def read_default_topics(rc_path: str) -> list[str]:
-    config = load_collector_config(rc_path)
-    mqtt = config.get("mqtt", {}) if isinstance(config.get("mqtt"), dict) else {}
+def read_default_topics(rc_path: str, config: Optional[dict[str, Any]] = None) -> list[str]:
+    mqtt = _mqtt_section(rc_path, config)
     return _normalize_topics(mqtt.get("topics", []))
 
 
-def read_default_mqttlog_topics(rc_path: str) -> list[str]:
-    config = load_collector_config(rc_path)
-    mqtt = config.get("mqtt", {}) if isinstance(config.get("mqtt"), dict) else {}
+def read_default_mqttlog_topics(rc_path: str, config: Optional[dict[str, Any]] = None) -> list[str]:
+    mqtt = _mqtt_section(rc_path, config)
     return _normalize_topics(mqtt.get("mqttlog_topics", []))
 
 
-def read_default_quantize_timestamps(rc_path: str) -> int:
-    config = load_collector_config(rc_path)
-    mqtt = config.get("mqtt", {}) if isinstance(config.get("mqtt"), dict) else {}
+def read_default_quantize_timestamps(rc_path: str, config: Optional[dict[str, Any]] = None) -> int:
+    mqtt = _mqtt_section(rc_path, config)
     try:
         return max(0, int(mqtt.get("quantize_timestamps", 0)))
     except Exception:
         return 0
 
 
-def read_default_data_dir(rc_path: str) -> str:
-    config = load_collector_config(rc_path)
-    mqtt = config.get("mqtt", {}) if isinstance(config.get("mqtt"), dict) else {}
+def read_default_data_dir(rc_path: str, config: Optional[dict[str, Any]] = None) -> str:
+    mqtt = _mqtt_section(rc_path, config)
     text = str(mqtt.get("data_dir", "data")).strip()
     return text if text else "data"
 
@@ -839,40 +951,124 @@ def parse_host_port(server: str) -> tuple[str, int]:
     return server, 1883
 
 
-def flatten_json(raw: str) -> tuple[Optional[dict[str, str]], Optional[str]]:
+# Bare JSON scalars (numbers, true/false/null) can never flatten to anything.
+_JSON_SCALAR_PATTERN = r"[ \t\n\r]*(?:true|false|null|-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?)[ \t\n\r]*"
+_JSON_SCALAR_RE = re.compile(_JSON_SCALAR_PATTERN)
+_JSON_SCALAR_BYTES_RE = re.compile(_JSON_SCALAR_PATTERN.encode("ascii"))
+
+
+def flatten_json(raw: str | bytes) -> tuple[Optional[dict[str, str]], Optional[str]]:
+    # Valid scalar payloads skip the parser; anything else is parsed so decode errors are still reported.
+    scalar_re = _JSON_SCALAR_BYTES_RE if isinstance(raw, (bytes, bytearray)) else _JSON_SCALAR_RE
+    if scalar_re.fullmatch(raw):
+        return None, None
     try:
-        data = json.loads(raw)
+        data = _json_loads(raw)
     except Exception as exc:
         return None, f"{exc.__class__.__name__}: {exc}"
     if not isinstance(data, dict):
         return None, None
     flat: dict[str, str] = {}
-
-    def walk(prefix: str, value) -> None:
+    # Depth-first with an explicit stack; children are pushed reversed to keep document order.
+    stack: list[tuple[str, Any]] = [("", data)]
+    pop = stack.pop
+    push = stack.extend
+    intern = sys.intern
+    while stack:
+        prefix, value = pop()
         if isinstance(value, dict):
-            for k, v in value.items():
-                key = f"{prefix}.{k}" if prefix else str(k)
-                walk(key, v)
+            push(reversed([(f"{prefix}.{k}" if prefix else str(k), v) for k, v in value.items()]))
+            continue
+        # The same key paths come back with every publish of a topic; share one str each.
+        prefix = intern(prefix)
+        if isinstance(value, str):
+            flat[prefix] = value
+        elif value is True:
+            flat[prefix] = "true"
+        elif value is False:
+            flat[prefix] = "false"
+        elif value is None:
+            flat[prefix] = "null"
+        elif type(value) is int or (type(value) is float and math.isfinite(value)):
+            flat[prefix] = repr(value)
         else:
-            flat[prefix] = json.dumps(value) if not isinstance(value, str) else value
-
-    walk("", data)
+            flat[prefix] = json.dumps(value)
     return flat, None
 
 
-def fetch_http_json_flattened(url: str, timeout: float = 10.0) -> tuple[Optional[dict[str, str]], Optional[str]]:
-    try:
-        with urllib.request.urlopen(url, timeout=timeout) as resp:
-            raw = resp.read()
-    except Exception as exc:
-        return None, f"{exc.__class__.__name__}: {exc}"
+# Per-thread keep-alive connections for HTTP polling, keyed by (scheme, netloc).
+# Only long-lived poll/fetch-pool threads use these; nothing closes them when a thread exits.
+_http_connections = threading.local()
+
+
+@functools.lru_cache(maxsize=256)
+def _http_key_is_proxied(scheme: str, netloc: str) -> bool:
+    # Proxy settings come from the environment; resolve them once per connection key.
+    return scheme in urllib.request.getproxies()
+
+
+def _http_get_keepalive(url: str, timeout: float) -> Optional[bytes]:
+    """GET url over a reused connection; returns None when urlopen should handle the URL instead."""
+    parts = urlparse(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    key = (parts.scheme, parts.netloc)
+    if _http_key_is_proxied(*key):
+        return None
+    pool: Optional[dict[tuple[str, str], http.client.HTTPConnection]] = getattr(_http_connections, "pool", None)
+    if pool is None:
+        pool = _http_connections.pool = {}
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    while True:
+        conn = pool.get(key)
+        fresh = conn is None
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = pool[key] = conn_cls(parts.hostname, parts.port, timeout=timeout)
+        elif conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        try:
+            conn.request("GET", target)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            pool.pop(key, None)
+            if fresh:
+                raise
+            continue  # the server dropped an idle keep-alive connection; retry once on a new one
+        except Exception:
+            conn.close()
+            pool.pop(key, None)
+            raise
+        if resp.will_close:
+            conn.close()
+            pool.pop(key, None)
+        if 300 <= resp.status < 400:
+            return None  # let urlopen follow redirects
+        if not 200 <= resp.status < 300:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return body
+
+
+def fetch_http_json_flattened(
+    url: str, timeout: float = 10.0, keepalive: bool = False
+) -> tuple[Optional[dict[str, str]], Optional[str]]:
+    # keepalive reuses a per-thread connection; pass it only from threads that outlive the request.
     try:
-        text = raw.decode("utf-8-sig")
+        raw = _http_get_keepalive(url, timeout) if keepalive else None
+        if raw is None:
+            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                raw = resp.read()
     except Exception as exc:
         return None, f"{exc.__class__.__name__}: {exc}"
-    return flatten_json(text)
+    # Both parsers take UTF-8 bytes directly; only a BOM needs stripping.
+    if raw.startswith(_UTF8_BOM):
+        raw = raw[3:]
+    return flatten_json(raw)
 
 
+@functools.lru_cache(maxsize=256)
 def resolve_http_url(url: str, base_url: str) -> str:
     text = str(url or "").strip()
     if text.startswith("base_url/"):
@@ -919,14 +1115,23 @@ def list_topics(server: str, timeout: float, verbose: int, topic_filter: Optiona
             return
         client.subscribe("#")
 
+    # The paho network thread only enqueues; filtering, metadata and printing run on this thread.
+    received: "queue_mod.SimpleQueue[tuple[Any, float]]" = queue_mod.SimpleQueue()
+
     def on_message(client, userdata, msg):
-        if topic_filter and not fnmatch.fnmatch(msg.topic, topic_filter):
+        received.put((msg, time.time()))
+
+    def handle_message(msg, received_at: float) -> None:
+        topic = sys.intern(msg.topic)
+        if topic_filter and not fnmatch.fnmatch(topic, topic_filter):
             return
-        topics.add(msg.topic)
-        latest_message[msg.topic] = msg.payload
+        topics.add(topic)
+        latest_message[topic] = msg.payload
         if verbose:
             meta: dict[str, str] = {}
-            meta["received_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + f".{int((time.time() % 1) * 1000):03d}"
+            meta["received_at"] = (
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(received_at)) + f".{int((received_at % 1) * 1000):03d}"
+            )
             try:
                 meta["qos"] = str(msg.qos)
                 meta["retain"] = str(msg.retain)
@@ -943,9 +1148,9 @@ def list_topics(server: str, timeout: float, verbose: int, topic_filter: Optiona
                     meta["properties"] = str(msg.properties)
                 except Exception:
                     pass
-            latest_meta[msg.topic] = meta
+            latest_meta[topic] = meta
         if monitor:
-            emit_topic(msg.topic, msg.payload, verbose, flatten, latest_meta.get(msg.topic))
+            emit_topic(topic, msg.payload, verbose, flatten, latest_meta.get(topic))
 
     client.on_connect = on_connect
     client.on_message = on_message
@@ -956,32 +1161,61 @@ def list_topics(server: str, timeout: float, verbose: int, topic_filter: Optiona
         print(f"Unable to connect to MQTT server {host}:{port}: {exc}")
         return 2
 
+    def drain_received(wait_s: float) -> None:
+        try:
+            item = received.get(timeout=wait_s) if wait_s > 0 else received.get_nowait()
+        except queue_mod.Empty:
+            return
+        while True:
+            handle_message(*item)
+            try:
+                item = received.get_nowait()
+            except queue_mod.Empty:
+                return
+
     client.loop_start()
     if monitor:
         try:
             while True:
-                time.sleep(1)
+                drain_received(1.0)
         except KeyboardInterrupt:
             pass
     else:
         time.sleep(max(0.1, timeout))
     client.loop_stop()
     client.disconnect()
+    drain_received(0.0)
 
     if not monitor:
+        # Collect output lines and write them in chunks instead of one print per line.
+        pending_lines: list[str] = []
         for topic in sorted(topics):
             if topic_filter and not fnmatch.fnmatch(topic, topic_filter):
                 continue
             payload = latest_message.get(topic)
             if payload is None:
-                print(f"{topic}=")
-                continue
-            emit_topic(topic, payload, verbose, flatten, latest_meta.get(topic))
+                pending_lines.append(f"{topic}=")
+            else:
+                pending_lines.extend(_topic_output_lines(topic, payload, verbose, flatten, latest_meta.get(topic)))
+            if len(pending_lines) >= 1024:
+                sys.stdout.write("\n".join(pending_lines) + "\n")
+                pending_lines.clear()
+        if pending_lines:
+            sys.stdout.write("\n".join(pending_lines) + "\n")
 
     return 0
 
 
 def emit_topic(topic: str, payload: bytes, verbose: int, flatten: bool, meta: Optional[dict[str, str]]) -> None:
+    lines = _topic_output_lines(topic, payload, verbose, flatten, meta)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _topic_output_lines(
+    topic: str, payload: bytes, verbose: int, flatten: bool, meta: Optional[dict[str, str]]
+) -> list[str]:
+    out: list[str] = []
     try:
         decoded = payload.decode("utf-8-sig")
         stripped = decoded.lstrip()
@@ -989,27 +1223,37 @@ def emit_topic(topic: str, payload: bytes, verbose: int, flatten: bool, meta: Op
             try:
                 flattened, error = flatten_json(decoded)
             except Exception as exc:
-                print(f"{topic}={decoded}")
-                print(f"{topic}._json_error={exc.__class__.__name__}: {exc}")
+                out.append(f"{topic}={decoded}")
+                out.append(f"{topic}._json_error={exc.__class__.__name__}: {exc}")
             else:
                 if flattened is None:
-                    print(f"{topic}={decoded}")
+                    out.append(f"{topic}={decoded}")
                     if error:
-                        print(f"{topic}._json_error={error}")
+                        out.append(f"{topic}._json_error={error}")
                 else:
-                    for key in sorted(flattened):
-                        print(f"{topic}.{key}={flattened[key]}")
+                    out.extend(f"{topic}.{key}={flattened[key]}" for key in sorted(flattened))
         else:
-            print(f"{topic}={decoded}")
+            out.append(f"{topic}={decoded}")
     except Exception:
-        print(f"{topic}=hex:{payload.hex()}")
+        out.append(f"{topic}=hex:{payload.hex()}")
     if verbose and meta:
-        for key in sorted(meta):
-            print(f"{topic}._meta.{key}={meta[key]}")
+        out.extend(f"{topic}._meta.{key}={meta[key]}" for key in sorted(meta))
+    return out
+
+
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+_YIELD_METRICS = frozenset(("yieldday", "yieldtotal"))
 
 
 def parse_number(value: str) -> Optional[float]:
-    match = re.search(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", value)
+    stripped = value.strip()
+    # Plain numeric payloads skip the regex; float() alone would also accept inf/nan and "1_000".
+    if stripped and "_" not in stripped and "n" not in stripped and "N" not in stripped:
+        try:
+            return float(stripped)
+        except ValueError:
+            pass
+    match = _NUM_RE.search(value)
     if not match:
         return None
     try:
@@ -1019,6 +1263,11 @@ def parse_number(value: str) -> Optional[float]:
 
 
 def format_number(value: float) -> str:
+    if math.isfinite(value):
+        int_value = int(value)
+        # Whole numbers skip the format/strip round trip; zero keeps the slow path so -0.0 prints "-0".
+        if int_value == value and int_value:
+            return str(int_value)
     text = f"{value:.3f}"
     text = text.rstrip("0").rstrip(".")
     return text
@@ -1050,10 +1299,10 @@ def open_dtu_summary(server: str, timeout: float, topic_filter: Optional[str], v
             return
         client.subscribe("solar/#")
 
+    received: "queue_mod.SimpleQueue[tuple[str, bytes]]" = queue_mod.SimpleQueue()
+
     def on_message(client, userdata, msg):
-        if topic_filter and not fnmatch.fnmatch(msg.topic, topic_filter):
-            return
-        latest_message[msg.topic] = msg.payload
+        received.put((sys.intern(msg.topic), msg.payload))
 
     client.on_connect = on_connect
     client.on_message = on_message
@@ -1069,6 +1318,16 @@ def open_dtu_summary(server: str, timeout: float, topic_filter: Optional[str], v
     client.loop_stop()
     client.disconnect()
 
+    # Last write wins per topic; only the surviving payloads are parsed below.
+    while True:
+        try:
+            topic, payload = received.get_nowait()
+        except queue_mod.Empty:
+            break
+        if topic_filter and not fnmatch.fnmatch(topic, topic_filter):
+            continue
+        latest_message[topic] = payload
+
     inverter_names: dict[str, str] = {}
     inverter_yieldday: dict[str, float] = {}
     inverter_yieldtotal: dict[str, float] = {}
@@ -1085,14 +1344,15 @@ def open_dtu_summary(server: str, timeout: float, topic_filter: Optional[str], v
         except Exception:
             continue
 
-        name_match = re.match(r"^solar/([^/]+)/name$", topic)
-        if name_match:
-            inverter_names[name_match.group(1)] = decoded
+        # Fixed topic shapes: solar/<inv>/name, solar/ac/<yield>, solar/<inv>/<n>/<yield>.
+        parts = topic.split("/")
+        num_parts = len(parts)
+        if num_parts == 3 and parts[2] == "name" and parts[1]:
+            inverter_names[parts[1]] = decoded
             continue
 
-        ac_match = re.match(r"^solar/ac/(yieldday|yieldtotal)$", topic)
-        if ac_match:
-            metric = ac_match.group(1)
+        if num_parts == 3 and parts[1] == "ac" and parts[2] in _YIELD_METRICS:
+            metric = parts[2]
             number = parse_number(decoded)
             if number is not None:
                 if metric == "yieldday":
@@ -1105,10 +1365,9 @@ def open_dtu_summary(server: str, timeout: float, topic_filter: Optional[str], v
                     debug_yield_samples.append(f"{topic}={decoded} (ac parse_number failed)")
             continue
 
-        inv_match = re.match(r"^solar/([^/]+)/\\d+/(yieldday|yieldtotal)$", topic)
-        if inv_match:
-            inverter_id = inv_match.group(1)
-            metric = inv_match.group(2)
+        if num_parts == 4 and parts[3] in _YIELD_METRICS and parts[1] and parts[2].isdecimal():
+            inverter_id = parts[1]
+            metric = parts[3]
             number = parse_number(decoded)
             if number is None:
                 if len(debug_yield_samples) < 5:
@@ -1121,9 +1380,6 @@ def open_dtu_summary(server: str, timeout: float, topic_filter: Optional[str], v
                 inverter_yieldtotal[inverter_id] = inverter_yieldtotal.get(inverter_id, 0.0) + number
             continue
 
-        parts = topic.split("/")
-        if len(parts) < 2 or parts[0] != "solar":
-            continue
         is_ac = parts[1] == "ac"
         inverter_id = None if is_ac else parts[1]
 
@@ -1219,9 +1475,22 @@ def _resolve_config_path_for_read() -> str:
     return os.path.expanduser("~/.tsdb_collector.toml")
 
 
+# Parsed TOML files keyed by absolute path; reused while (mtime_ns, size, inode) is unchanged.
+_toml_cache: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+_toml_cache_lock = threading.Lock()
+
+
 def _load_toml_dict(path: str) -> dict[str, Any]:
-    if not os.path.exists(path):
+    try:
+        st = os.stat(path)
+    except OSError:
         return {}
+    key = os.path.abspath(path)
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _toml_cache_lock:
+        cached = _toml_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
     try:
         try:
             import tomllib  # Python 3.11+
@@ -1232,9 +1501,13 @@ def _load_toml_dict(path: str) -> dict[str, Any]:
     try:
         with open(path, "rb") as f:
             data = tomllib.load(f)
-        return data if isinstance(data, dict) else {}
     except Exception:
         return {}
+    if not isinstance(data, dict):
+        data = {}
+    with _toml_cache_lock:
+        _toml_cache[key] = (stamp, data)
+    return copy.deepcopy(data)
 
 
 def _normalize_topics(value: Any) -> list[str]:
@@ -1245,47 +1518,36 @@ def _normalize_topics(value: Any) -> list[str]:
     return []
 
 
+def _first_nonempty(*sources: dict[str, Any], keys: tuple[str, ...]) -> str:
+    for source in sources:
+        for key in keys:
+            value = source.get(key)
+            if value is None:
+                continue
+            text = (value if isinstance(value, str) else str(value)).strip()
+            if text:
+                return text
+    return ""
+
+
+def _first_topics(*sources: dict[str, Any], keys: tuple[str, ...]) -> list[str]:
+    for source in sources:
+        for key in keys:
+            if key in source:
+                topics = _normalize_topics(source[key])
+                if topics:
+                    return topics
+    return []
+
+
 def load_collector_config(rc_path: str) -> dict[str, Any]:
     data = _load_toml_dict(rc_path)
     mqtt_block = data.get("mqtt") if isinstance(data.get("mqtt"), dict) else {}
     http_block = data.get("http") if isinstance(data.get("http"), dict) else {}
 
-    mqtt_server = ""
-    for key in ("mqtt_server", "mqtt-server", "server"):
-        if key in data and str(data[key]).strip():
-            mqtt_server = str(data[key]).strip()
-            break
-    if not mqtt_server:
-        for key in ("mqtt_server", "mqtt-server", "server"):
-            if key in mqtt_block and str(mqtt_block[key]).strip():
-                mqtt_server = str(mqtt_block[key]).strip()
-                break
-
-    topics: list[str] = []
-    for key in ("topics", "mqtt_topics", "mqtt-topics"):
-        if key in data:
-            topics = _normalize_topics(data[key])
-            if topics:
-                break
-    if not topics:
-        for key in ("topics", "mqtt_topics", "mqtt-topics"):
-            if key in mqtt_block:
-                topics = _normalize_topics(mqtt_block[key])
-                if topics:
-                    break
-
-    mqttlog_topics: list[str] = []
-    for key in ("mqttlog_topics", "mqttlog-topics"):
-        if key in data:
-            mqttlog_topics = _normalize_topics(data[key])
-            if mqttlog_topics:
-                break
-    if not mqttlog_topics:
-        for key in ("mqttlog_topics", "mqttlog-topics"):
-            if key in mqtt_block:
-                mqttlog_topics = _normalize_topics(mqtt_block[key])
-                if mqttlog_topics:
-                    break
+    mqtt_server = _first_nonempty(data, mqtt_block, keys=("mqtt_server", "mqtt-server", "server"))
+    topics = _first_topics(data, mqtt_block, keys=("topics", "mqtt_topics", "mqtt-topics"))
+    mqttlog_topics = _first_topics(data, mqtt_block, keys=("mqttlog_topics", "mqttlog-topics"))
 
     quantize_timestamps = 0
     for key in ("quantize_timestamps", "quantize-timestamps"):
@@ -1400,8 +1662,11 @@ def load_collector_config(rc_path: str) -> dict[str, Any]:
     }
 
 
+_TOML_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
 def _quote_toml_string(value: str) -> str:
-    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return '"' + value.translate(_TOML_ESCAPE) + '"'
 
 
 def _format_toml_list(values: list[Any], indent: str = "    ") -> list[str]:
@@ -1434,6 +1699,16 @@ def _toml_top_level_item_id(stripped_line: str) -> Optional[str]:
     return None
 
 
+_TOML_CONTENT_LINE_RE = re.compile(r"(?m)^[^\S\n]*[^\s#].*$")
+
+
+def _split_toml_lines(chunk: str) -> list[str]:
+    lines = chunk.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
 def _extract_toml_comment_blocks_by_item(path: str) -> tuple[dict[str, list[list[str]]], list[str], list[str]]:
     """Preserve comment/blank blocks and associate each with the next top-level TOML item."""
     if not os.path.exists(path):
@@ -1445,26 +1720,23 @@ def _extract_toml_comment_blocks_by_item(path: str) -> tuple[dict[str, list[list
     seen_any_item = False
     try:
         with open(path, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.rstrip("\n")
-                stripped = line.strip()
-                if stripped == "" or stripped.startswith("#"):
-                    pending_block.append(line)
-                    continue
-
-                item_id = _toml_top_level_item_id(stripped)
-                if item_id is not None:
-                    seen_any_item = True
-                    if pending_block:
-                        blocks_by_item.setdefault(item_id, []).append(list(pending_block))
-                        pending_block.clear()
-                    continue
-
-                # Non-item content breaks association.
-                pending_block.clear()
+            text = f.read()
     except Exception:
         return {}, [], []
 
+    # The text between two content lines is a run of blank/comment lines. It belongs to the
+    # following line if that is a top-level item; other content drops it.
+    prev_end = 0
+    for match in _TOML_CONTENT_LINE_RE.finditer(text):
+        pending_block = _split_toml_lines(text[prev_end : match.start()])
+        prev_end = match.end() + 1
+        item_id = _toml_top_level_item_id(match.group(0).strip())
+        if item_id is not None:
+            seen_any_item = True
+            if pending_block:
+                blocks_by_item.setdefault(item_id, []).append(pending_block)
+    pending_block = _split_toml_lines(text[prev_end:])
+
     if pending_block:
         if seen_any_item:
             trailing_lines = pending_block
@@ -1583,6 +1855,28 @@ def _dumps_collector_config_toml(
     return "\n".join(lines) + "\n"
 
 
+def _write_file_atomic(path: str, data: bytes) -> None:
+    """Replace path with data so readers see either the old or the new content, never a partial file."""
+    # Unique per writer so concurrent UI requests never share a temp file.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "xb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def save_collector_config(rc_path: str, config: dict[str, Any]) -> None:
     comment_blocks_by_item, orphan_preamble_lines, trailing_lines = _extract_toml_comment_blocks_by_item(rc_path)
     text = _dumps_collector_config_toml(
@@ -1593,32 +1887,154 @@ def save_collector_config(rc_path: str, config: dict[str, Any]) -> None:
     )
     parent = os.path.dirname(os.path.abspath(rc_path))
     os.makedirs(parent, exist_ok=True)
-    tmp = rc_path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        f.write(text)
-    os.replace(tmp, rc_path)
+    _write_file_atomic(rc_path, text.encode("utf-8"))
+    with _toml_cache_lock:
+        _toml_cache.pop(os.path.abspath(rc_path), None)
+
+
+_STATIC_INLINE_MAX_BYTES = 256 * 1024
+_MAX_REQUEST_BODY_BYTES = 16 * 1024 * 1024
+_MAX_FETCH_BATCH_URLS = 64
+# The /health response never changes, so it is serialized once.
+_HEALTH_BODY = _json_dumps_bytes({"ok": True, "apiVersion": COLLECTOR_UI_API_VERSION})
+_CONFIG_ROUTES = frozenset(("/config", "/config/raw"))
+_FETCH_ROUTES = frozenset(("/http/fetch", "/http/fetch_batch"))
+_COMPRESSIBLE_MIME_TYPES = frozenset(("application/javascript", "application/json", "image/svg+xml"))
+# The UI only ships a handful of asset types; anything else is served as an opaque download.
+_EXT_TO_MIME = {
+    "html": "text/html; charset=utf-8",
+    "htm": "text/html; charset=utf-8",
+    "js": "application/javascript; charset=utf-8",
+    "mjs": "application/javascript; charset=utf-8",
+    "css": "text/css; charset=utf-8",
+    "json": "application/json",
+    "map": "application/json",
+    "txt": "text/plain; charset=utf-8",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "ico": "image/x-icon",
+    "woff": "font/woff",
+    "woff2": "font/woff2",
+}
+
+
+_log_timestamp_cache: tuple[int, str] = (0, "")
+
+
+def _log_timestamp() -> str:
+    global _log_timestamp_cache
+    now = int(time.time())
+    cached = _log_timestamp_cache
+    if cached[0] != now:
+        cached = (now, time.strftime("%d/%b/%Y %H:%M:%S", time.localtime(now)))
+        _log_timestamp_cache = cached
+    return cached[1]
+
+
+def _flat_values_list(flat: dict[str, Any]) -> list[dict[str, Any]]:
+    # Sorting the items (keys are unique, so values are never compared) avoids a second lookup per key.
+    return [{"path": k, "value": v} for k, v in sorted(flat.items())]
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    # Same token parsing as tsdb_server's _negotiate_content_encoding: "gzip;q=0" means not acceptable.
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        q = params.strip().lower()
+        return not (q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"))
+    return False
 
 
 class CollectorUiRequestHandler(BaseHTTPRequestHandler):
     server_version = "TSDBCollectorUI/1.0"
+    # Buffer the response so the status line, headers and small bodies leave in one send();
+    # handle_one_request() flushes after every request and larger bodies bypass the buffer.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    # Keep connections open between the UI's polls; every response carries Content-Length
+    # (or is a bodyless 204/304), and idle connections are dropped after the socket timeout.
+    protocol_version = "HTTP/1.1"
+    timeout = 30
 
     def _send_json(self, status: int, payload: dict[str, Any]) -> None:
-        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        body = _json_dumps_bytes(payload)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.send_header("Cache-Control", "no-store")
+        if self.close_connection:
+            self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(body)
 
-    def _send_bytes(self, status: int, body: bytes, content_type: str) -> None:
+    def _send_bytes(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        cache_control: str = "no-store",
+        etag: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> None:
         self.send_response(status)
         self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(body)))
-        self.send_header("Cache-Control", "no-store")
+        self.send_header("Cache-Control", cache_control)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if content_encoding is not None:
+            self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        if self.close_connection:
+            self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(body)
 
+    def _read_json_body(self) -> tuple[bool, Any]:
+        """Read and parse the JSON request body; on failure the error response is already sent."""
+        length_raw = self.headers.get("Content-Length", "").strip()
+        if not length_raw:
+            # Without a length the end of the body is unknown, so the connection cannot be reused.
+            self.close_connection = True
+            self._send_json(400, {"error": {"code": "bad_request", "message": "Missing Content-Length"}})
+            return False, None
+        try:
+            length = int(length_raw)
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid Content-Length"}})
+            return False, None
+        if length <= 0:
+            self._send_json(400, {"error": {"code": "bad_request", "message": "Empty request body"}})
+            return False, None
+        if length > _MAX_REQUEST_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": {"code": "payload_too_large", "message": "Request body too large"}})
+            return False, None
+        # Read straight into one buffer and parse it as bytes; no intermediate str copy.
+        body = bytearray(length)
+        view = memoryview(body)
+        received = 0
+        while received < length:
+            n = self.rfile.readinto(view[received:])
+            if not n:
+                break
+            received += n
+        view.release()
+        try:
+            return True, _json_loads(body if received == length else body[:received])
+        except Exception:
+            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid JSON body"}})
+            return False, None
+
     def _handle_static(self, path: str) -> bool:
         ui_dir = self.server.ui_dir  # type: ignore[attr-defined]
         if not ui_dir:
@@ -1631,20 +2047,56 @@ class CollectorUiRequestHandler(BaseHTTPRequestHandler):
         else:
             return False
         rel = unquote(rel).lstrip("/")
-        full_path = os.path.abspath(os.path.join(ui_dir, rel))
-        ui_dir_abs = os.path.abspath(ui_dir)
-        if not (full_path == ui_dir_abs or full_path.startswith(ui_dir_abs + os.sep)):
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid static path"}})
-            return True
-        if not os.path.isfile(full_path):
+        full_path = self.server.static_index.get(rel)  # type: ignore[attr-defined]
+        if full_path is None:
+            # Not in the startup index (e.g. added later): validate the path the slow way.
+            ui_dir_abs = self.server.ui_dir_abs  # type: ignore[attr-defined]
+            full_path = os.path.abspath(os.path.join(ui_dir_abs, rel))
+            if not (full_path == ui_dir_abs or full_path.startswith(ui_dir_abs + os.sep)):
+                self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid static path"}})
+                return True
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             self._send_json(404, {"error": {"code": "not_found", "message": f"Static file not found: {rel}"}})
             return True
-        with open(full_path, "rb") as f:
-            body = f.read()
-        mime, _ = mimetypes.guess_type(full_path)
-        self._send_bytes(200, body, mime or "application/octet-stream")
+        body, gzip_body, mime, etag = self.server.get_static_file(full_path, st)  # type: ignore[attr-defined]
+        content_encoding = None
+        if gzip_body is not None and _accepts_gzip(self.headers.get("Accept-Encoding")):
+            body = gzip_body
+            content_encoding = "gzip"
+            etag = etag[:-1] + '-gz"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=60")
+            self.end_headers()
+            return True
+        if body is None:
+            self._send_file(full_path, mime, etag)
+        else:
+            self._send_bytes(
+                200, body, mime, cache_control="public, max-age=60", etag=etag, content_encoding=content_encoding
+            )
         return True
 
+    def _send_file(self, full_path: str, content_type: str, etag: str) -> None:
+        with open(full_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(size))
+            self.send_header("Cache-Control", "public, max-age=60")
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.flush()
+            # socket.sendfile uses os.sendfile where available and falls back to send().
+            if self.connection.sendfile(f, 0, size) != size:
+                # The file shrank while sending; the promised Content-Length was not met.
+                self.close_connection = True
+
     def do_OPTIONS(self) -> None:
         self.send_response(HTTPStatus.NO_CONTENT)
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -1654,55 +2106,31 @@ class CollectorUiRequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self) -> None:
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = self.path.partition("?")[0]
         if self._handle_static(path):
             return
         if path == "/health":
-            self._send_json(200, {"ok": True, "apiVersion": COLLECTOR_UI_API_VERSION})
+            self._send_bytes(200, _HEALTH_BODY, "application/json; charset=utf-8")
             return
-        if path == "/config":
-            config_path = self.server.config_path  # type: ignore[attr-defined]
-            self._send_json(200, {"configPath": config_path, "config": load_collector_config(config_path)})
-            return
-        if path == "/config/raw":
-            config_path = self.server.config_path  # type: ignore[attr-defined]
+        if path in _CONFIG_ROUTES:
             try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                mtime_ns = int(os.stat(config_path).st_mtime_ns)
-            except FileNotFoundError:
-                content = ""
-                mtime_ns = 0
+                body = self.server.get_config_body(path)  # type: ignore[attr-defined]
             except Exception as exc:
                 self._send_json(500, {"error": {"code": "io_error", "message": str(exc)}})
                 return
-            self._send_json(200, {"configPath": config_path, "content": content, "mtimeNs": mtime_ns})
+            self._send_bytes(200, body, "application/json; charset=utf-8")
             return
         self._send_json(404, {"error": {"code": "not_found", "message": f"Unknown endpoint: {path}"}})
 
     def do_PUT(self) -> None:
-        parsed = urlparse(self.path)
-        path = parsed.path
-        if path not in {"/config", "/config/raw"}:
+        path = self.path.partition("?")[0]
+        if path not in _CONFIG_ROUTES:
+            # The request body is left unread, so it must not be parsed as the next request.
+            self.close_connection = True
             self._send_json(404, {"error": {"code": "not_found", "message": f"Unknown endpoint: {path}"}})
             return
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Missing Content-Length"}})
-            return
-        try:
-            length = int(length_raw)
-        except ValueError:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid Content-Length"}})
-            return
-        if length <= 0:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Empty request body"}})
-            return
-        try:
-            payload = json.loads(self.rfile.read(length).decode("utf-8"))
-        except Exception:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid JSON body"}})
+        ok, payload = self._read_json_body()
+        if not ok:
             return
         config_path = self.server.config_path  # type: ignore[attr-defined]
         if path == "/config/raw":
@@ -1715,11 +2143,12 @@ class CollectorUiRequestHandler(BaseHTTPRequestHandler):
                 return
             try:
                 os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
-                with open(config_path, "w", encoding="utf-8", newline="") as f:
-                    f.write(content)
+                _write_file_atomic(config_path, content.encode("utf-8"))
             except Exception as exc:
                 self._send_json(500, {"error": {"code": "io_error", "message": str(exc)}})
                 return
+            finally:
+                self.server.invalidate_config_cache()  # type: ignore[attr-defined]
             self._send_json(200, {"ok": True, "configPath": config_path})
             return
         config = payload.get("config", payload) if isinstance(payload, dict) else None
@@ -1731,34 +2160,25 @@ class CollectorUiRequestHandler(BaseHTTPRequestHandler):
         except Exception as exc:
             self._send_json(500, {"error": {"code": "io_error", "message": str(exc)}})
             return
+        finally:
+            self.server.invalidate_config_cache()  # type: ignore[attr-defined]
         self._send_json(200, {"ok": True, "configPath": config_path})
 
     def do_POST(self) -> None:
-        parsed = urlparse(self.path)
-        path = parsed.path
-        if path != "/http/fetch":
+        path = self.path.partition("?")[0]
+        if path not in _FETCH_ROUTES:
+            self.close_connection = True
             self._send_json(404, {"error": {"code": "not_found", "message": f"Unknown endpoint: {path}"}})
             return
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Missing Content-Length"}})
-            return
-        try:
-            length = int(length_raw)
-        except ValueError:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid Content-Length"}})
-            return
-        if length <= 0:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Empty request body"}})
-            return
-        try:
-            payload = json.loads(self.rfile.read(length).decode("utf-8"))
-        except Exception:
-            self._send_json(400, {"error": {"code": "bad_request", "message": "Invalid JSON body"}})
+        ok, payload = self._read_json_body()
+        if not ok:
             return
         if not isinstance(payload, dict):
             self._send_json(400, {"error": {"code": "bad_request", "message": "Request body must be object"}})
             return
+        if path == "/http/fetch_batch":
+            self._handle_http_fetch_batch(payload)
+            return
         url_raw = str(payload.get("url", "")).strip()
         base_url = str(payload.get("base_url", "")).strip()
         url = resolve_http_url(url_raw, base_url)
@@ -1772,14 +2192,39 @@ class CollectorUiRequestHandler(BaseHTTPRequestHandler):
         if flat is None:
             self._send_json(200, {"url": url, "values": [], "note": "JSON root is not an object"})
             return
-        values = [{"path": k, "value": flat[k]} for k in sorted(flat.keys())]
-        self._send_json(200, {"url": url, "values": values})
+        self._send_json(200, {"url": url, "values": _flat_values_list(flat)})
+
+    def _handle_http_fetch_batch(self, payload: dict[str, Any]) -> None:
+        urls_raw = payload.get("urls")
+        if not isinstance(urls_raw, list):
+            self._send_json(400, {"error": {"code": "bad_request", "message": "urls must be a list"}})
+            return
+        if len(urls_raw) > _MAX_FETCH_BATCH_URLS:
+            self._send_json(
+                400,
+                {"error": {"code": "bad_request", "message": f"At most {_MAX_FETCH_BATCH_URLS} urls per batch"}},
+            )
+            return
+        base_url = str(payload.get("base_url", "")).strip()
+        urls = [resolve_http_url(str(u).strip(), base_url) for u in urls_raw]
+        if not all(urls):
+            self._send_json(400, {"error": {"code": "bad_request", "message": "Missing url"}})
+            return
+        results = []
+        # The pool threads are long-lived, so their keep-alive connections are reused across batches.
+        fetch = functools.partial(fetch_http_json_flattened, keepalive=True)
+        for url, (flat, error) in zip(urls, self.server.fetch_pool.map(fetch, urls)):  # type: ignore[attr-defined]
+            if error:
+                results.append({"url": url, "error": {"code": "fetch_failed", "message": error}})
+            elif flat is None:
+                results.append({"url": url, "values": [], "note": "JSON root is not an object"})
+            else:
+                results.append({"url": url, "values": _flat_values_list(flat)})
+        self._send_json(200, {"results": results})
 
     def log_message(self, fmt: str, *args: Any) -> None:
-        timestamp = time.strftime("%d/%b/%Y %H:%M:%S")
-        message = f'{self.address_string()} - - [{timestamp}] {fmt % args}\n'
-        sys.stdout.write(message)
-        sys.stdout.flush()
+        # Written by the server's log thread so request threads never block on stdout.
+        self.server.log_queue.put(f'{self.address_string()} - - [{_log_timestamp()}] {fmt % args}\n')  # type: ignore[attr-defined]
 
 
 class CollectorUiHttpServer(ThreadingHTTPServer):
@@ -1787,6 +2232,115 @@ class CollectorUiHttpServer(ThreadingHTTPServer):
         super().__init__(server_address, CollectorUiRequestHandler)
         self.config_path = config_path
         self.ui_dir = ui_dir
+        self.ui_dir_abs = os.path.abspath(ui_dir) if ui_dir else ""
+        # "/"-separated path relative to ui_dir -> absolute path, for files present at startup.
+        self.static_index: dict[str, str] = {}
+        if self.ui_dir_abs:
+            for root, _dirs, files in os.walk(self.ui_dir_abs):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    rel = os.path.relpath(full_path, self.ui_dir_abs).replace(os.sep, "/")
+                    self.static_index[rel] = full_path
+        # full path -> (body or None if sent from disk, gzip body or None, mime, etag, (mtime_ns, size))
+        self._static_cache: dict[str, tuple[Optional[bytes], Optional[bytes], str, str, tuple[int, int]]] = {}
+        self._static_cache_lock = threading.Lock()
+        # GET path -> ((mtime_ns, size, inode) or None if missing, JSON response body)
+        self._config_body_cache: dict[str, tuple[Optional[tuple[int, int, int]], bytes]] = {}
+        self._config_body_lock = threading.Lock()
+        self.fetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="ui-fetch")
+        # Access log lines; None stops the writer thread.
+        self.log_queue: "queue_mod.SimpleQueue[Optional[str]]" = queue_mod.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._log_writer, name="ui-log", daemon=True)
+        self._log_thread.start()
+
+    def _log_writer(self) -> None:
+        get = self.log_queue.get
+        get_nowait = self.log_queue.get_nowait
+        running = True
+        while running:
+            lines = []
+            line = get()
+            # Drain whatever else is queued so a burst of requests costs one write and one flush.
+            while line is not None:
+                lines.append(line)
+                if len(lines) >= 64:
+                    break
+                try:
+                    line = get_nowait()
+                except queue_mod.Empty:
+                    break
+            if line is None:
+                running = False
+            if lines:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+
+    def get_config_body(self, path: str) -> bytes:
+        """Return the JSON body for GET /config or /config/raw, rebuilt only when the config file changes."""
+        config_path = self.config_path
+        try:
+            st = os.stat(config_path)
+            stamp: Optional[tuple[int, int, int]] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            stamp = None
+        with self._config_body_lock:
+            cached = self._config_body_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        if path == "/config":
+            payload = {"configPath": config_path, "config": load_collector_config(config_path)}
+        else:
+            try:
+                with open(config_path, "rb") as f:
+                    content = f.read().decode("utf-8")
+                # Match text-mode reads, which translate \r\n and \r to \n.
+                if "\r" in content:
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+                mtime_ns = stamp[0] if stamp is not None else int(os.stat(config_path).st_mtime_ns)
+            except FileNotFoundError:
+                content = ""
+                mtime_ns = 0
+            payload = {"configPath": config_path, "content": content, "mtimeNs": mtime_ns}
+        body = _json_dumps_bytes(payload)
+        with self._config_body_lock:
+            self._config_body_cache[path] = (stamp, body)
+        return body
+
+    def invalidate_config_cache(self) -> None:
+        with self._config_body_lock:
+            self._config_body_cache.clear()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.log_queue.put(None)
+        self._log_thread.join(timeout=1.0)
+
+    def get_static_file(
+        self, full_path: str, st: os.stat_result
+    ) -> tuple[Optional[bytes], Optional[bytes], str, str]:
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._static_cache_lock:
+            cached = self._static_cache.get(full_path)
+        if cached is not None and cached[4] == stamp:
+            return cached[:4]
+        mime = _EXT_TO_MIME.get(full_path.rpartition(".")[2].lower(), "application/octet-stream")
+        gzip_body = None
+        if st.st_size > _STATIC_INLINE_MAX_BYTES:
+            # Large assets are streamed with sendfile instead of being held in memory.
+            body = None
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        else:
+            with open(full_path, "rb") as f:
+                body = f.read()
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            if len(body) >= 1024 and (mime.startswith("text/") or mime.partition(";")[0] in _COMPRESSIBLE_MIME_TYPES):
+                compressed = gzip.compress(body, compresslevel=6, mtime=0)
+                if len(compressed) < len(body):
+                    gzip_body = compressed
+        with self._static_cache_lock:
+            self._static_cache[full_path] = (body, gzip_body, mime, etag, stamp)
+        return body, gzip_body, mime, etag
 
 
 def main() -> int:
@@ -1857,7 +2411,7 @@ def main() -> int:
         if not (1 <= args.ui_port <= 65535):
             print("--ui-port must be in range 1..65535")
             return 2
-        config_path = os.path.abspath(os.path.expanduser(rc_path))
+        config_path = os.path.abspath(rc_path)
         httpd = CollectorUiHttpServer((args.ui_host, args.ui_port), config_path=config_path, ui_dir=ui_dir)
         print(f"Serving TSDB Collector UI on http://{args.ui_host}:{args.ui_port} (config={config_path}, ui_dir={ui_dir})")
         try:
@@ -1941,17 +2495,17 @@ def main() -> int:
             print(f"Failed to compress DB file {source!r}: {exc}")
             return 2
 
-    default_data_dir = read_default_data_dir(rc_path)
-    selected_data_dir = args.data_dir if args.data_dir else default_data_dir
-    data_dir = os.path.abspath(os.path.expanduser(selected_data_dir))
-
     if args.mqtt_server:
         persist_server(rc_path, args.mqtt_server)
+    # Parse the config once and derive every default from it.
     loaded_config = load_collector_config(rc_path)
-    default_server = read_default_server(rc_path)
-    default_topics = read_default_topics(rc_path)
-    default_mqttlog_topics = read_default_mqttlog_topics(rc_path)
-    default_quantize_timestamps = read_default_quantize_timestamps(rc_path)
+    default_data_dir = read_default_data_dir(rc_path, loaded_config)
+    selected_data_dir = args.data_dir if args.data_dir else default_data_dir
+    data_dir = os.path.abspath(os.path.expanduser(selected_data_dir))
+    default_server = read_default_server(rc_path, loaded_config)
+    default_topics = read_default_topics(rc_path, loaded_config)
+    default_mqttlog_topics = read_default_mqttlog_topics(rc_path, loaded_config)
+    default_quantize_timestamps = read_default_quantize_timestamps(rc_path, loaded_config)
     default_http = loaded_config.get("http", {}) if isinstance(loaded_config.get("http"), dict) else {}
     default_http_urls = default_http.get("urls", []) if isinstance(default_http.get("urls"), list) else []
     server = args.mqtt_server or default_server
@@ -1984,6 +2538,9 @@ def main() -> int:
         os.makedirs(data_dir, exist_ok=True)
         topics = args.topics if args.topics else default_topics
         mqttlog_topics = args.mqttlog_topics if args.mqttlog_topics else default_mqttlog_topics
+        # SIGTERM stops collection cleanly so pending events are flushed before exit.
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
         return collect_to_tsdb(
             server,
             topics,
@@ -1992,6 +2549,7 @@ def main() -> int:
             quantize_timestamps_ms=quantize_timestamps_ms,
             data_dir=data_dir,
             http_config=default_http,
+            stop_event=stop_event,
         )
 
     print("No action specified. Use --ui, --list-topics, --open-dtu-summary, --collect, --dump, --dump-bytes, --stat-tsdb, --downsample, --generate-demo-db, or --compress.")
@@ -1,5 +1,5 @@
 (() => {
-  const API_VERSION = 1;
+  const API_VERSION = 2;
   const FRONIUS_BASE_URL_TEMPLATES = [
     "base_url/solar_api/v1/GetInverterRealtimeData.cgi?Scope=Device&DeviceId=1&DataCollection=3PInverterData",
     "base_url/solar_api/v1/GetInverterRealtimeData.cgi?Scope=Device&DeviceId=1&DataCollection=CommonInverterData",
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Simple TSDB REST server using built-in Python modules only.
+"""Simple TSDB REST server built on the Python standard library (orjson/zstd are used when installed).
 
 API:
 - GET /health
@@ -44,21 +44,41 @@ When downsampled, points are:
 
 import argparse
 import bisect
+import collections
 import datetime
+import functools
+import hashlib
 import json
+import math
 import mimetypes
+import operator
 import os
+import re
+import sys
 import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import parse_qs, unquote, urlparse
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional, stdlib json is used otherwise
+    orjson = None
+
+try:
+    from compression import zstd  # type: ignore  # stdlib since Python 3.14
+except ImportError:  # zstd responses are only offered when available
+    zstd = None
+
 API_VERSION = 23  # Increment when API endpoints or payload schemas change.
 SERVER_VERSION = f"tsdb_server.py api-v{API_VERSION}"
 DEFAULT_MIN_POINTS = 10
+MAX_PUT_BODY_BYTES = 8 * 1024 * 1024  # Upper bound for JSON request bodies (dashboards, settings, ...).
 
 from tsdb import (
     Event,
@@ -71,6 +91,9 @@ from tsdb import (
     is_string_format_id,
     list_series_in_file,
     read_tsdb_events_for_series,
+    series_values_all_numeric_in_file,
+    set_tsdb_cache_max_files,
+    tsdb_cache_stats,
     write_series_array_timeseries_db,
 )
 
@@ -132,6 +155,26 @@ _REQUEST_TRACE = threading.local()
 _SERIES_STATS_CACHE_LOCK = threading.Lock()
 _SERIES_STATS_CACHE: Dict[Tuple[str, str], SeriesStatSummaryCacheEntry] = {}
 _DATA_DIR_FALLBACK: Dict[str, str] = {}
+# Serialized GET /dashboards and /settings bodies and their ETags keyed by file path, with the
+# file signature they were built from.
+_RESPONSE_BODY_CACHE_LOCK = threading.Lock()
+_RESPONSE_BODY_CACHE: Dict[str, Tuple[Optional[Tuple[int, int, int]], bytes, str]] = {}
+# Parsed dashboards.json / settings.json / virtual_series.json documents keyed by path, with their file signature.
+_JSON_FILE_CACHE_LOCK = threading.Lock()
+_JSON_FILE_CACHE: Dict[str, Tuple[Optional[Tuple[int, int, int]], Any]] = {}
+# Serializes load-modify-save of dashboards.json so concurrent PUT/DELETE/rename requests cannot
+# overwrite each other's changes.
+_DASHBOARDS_UPDATE_LOCK = threading.Lock()
+# Sorted /series names keyed by (data_dir, prefix), with the signature of the catalog files and
+# virtual series config they were built from. The prefix comes from the client, so only the most
+# recently used _SERIES_NAMES_CACHE_MAX_ENTRIES lists are kept.
+_SERIES_NAMES_CACHE_LOCK = threading.Lock()
+_SERIES_NAMES_CACHE: "collections.OrderedDict[Tuple[str, str], Tuple[Tuple[Any, ...], List[str]]]" = collections.OrderedDict()
+_SERIES_NAMES_CACHE_MAX_ENTRIES = 16
+# File names per data directory keyed by path, with the directory mtime they were listed at.
+_DIR_LISTING_CACHE_LOCK = threading.Lock()
+_DIR_LISTING_CACHE: Dict[str, Tuple[int, frozenset[str]]] = {}
+_DIR_LISTING_SETTLE_NS = 2_000_000_000
 
 _VIRTUAL_LEFT_SCALING_FACTORS = (
     1000,
@@ -162,6 +205,12 @@ _ALL_DOWNSAMPLE_BUCKETS: List[Tuple[int, str, int]] = [
     (3_600_000, "1h", 3),
 ]
 _MQTTLOG_SYNTHETIC_FIELDS: Tuple[str, ...] = ("temperature_C", "humidity", "rssi")
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_EVENT_TIMESTAMP = operator.attrgetter("timestamp_ms")
+_PRETTY_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), indent=2)
+# json.dumps with keyword arguments builds a new JSONEncoder per call; reuse one instead.
+# allow_nan=False lets _json_compact map NaN/Infinity to null, as orjson does.
+_COMPACT_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
 
 _DOWNSAMPLE_LABEL_TO_MS: Dict[str, int] = {label: granularity_ms for granularity_ms, label, _elem_size in _ALL_DOWNSAMPLE_BUCKETS}
 
@@ -205,6 +254,21 @@ def parse_timestamp(value: str) -> int:
             return n * 1000
         return n
 
+    return _parse_iso_timestamp_ms(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_iso_timestamp_ms(value: str) -> int:
+    """Convert an ISO-8601 datetime to Unix milliseconds, naive values as UTC.
+
+    Polling clients resend the same start/end strings, so results are memoized.
+
+    Args:
+        value: Stripped ISO-8601 datetime string.
+
+    Returns:
+        int: Unix timestamp in milliseconds.
+    """
     iso = value
     if iso.endswith("Z"):
         iso = iso[:-1] + "+00:00"
@@ -224,12 +288,15 @@ def day_range_utc(start_ms: int, end_ms: int) -> Iterable[datetime.date]:
     Returns:
         Iterable[datetime.date]: Result produced by this function.
     """
-    start_day = datetime.datetime.fromtimestamp(start_ms / 1000.0, tz=datetime.timezone.utc).date()
-    end_day = datetime.datetime.fromtimestamp(end_ms / 1000.0, tz=datetime.timezone.utc).date()
-    day = start_day
-    while day <= end_day:
-        yield day
-        day += datetime.timedelta(days=1)
+    # UTC days are whole multiples of 86_400_000 ms from the epoch, so no datetime is needed.
+    first = _EPOCH_ORDINAL + start_ms // 86_400_000
+    last = _EPOCH_ORDINAL + end_ms // 86_400_000
+    if first <= last:
+        # Out-of-range ends raise ValueError here instead of after years of yielded days.
+        datetime.date.fromordinal(first)
+        datetime.date.fromordinal(last)
+    for ordinal in range(first, last + 1):
+        yield datetime.date.fromordinal(ordinal)
 
 
 def _candidate_data_dirs(data_dir: str) -> List[str]:
@@ -244,12 +311,41 @@ def _candidate_data_dirs(data_dir: str) -> List[str]:
     return dirs
 
 
+def _file_names_in_dir(base: str) -> frozenset[str]:
+    """Return the names of regular files in a directory, reusing the last scan while its mtime is unchanged.
+
+    Args:
+        base: Directory to list.
+
+    Returns:
+        frozenset[str]: File names (symlinks to files included); empty if the directory is unreadable.
+    """
+    try:
+        mtime_ns = os.stat(base).st_mtime_ns
+    except OSError:
+        return frozenset()
+    with _DIR_LISTING_CACHE_LOCK:
+        cached = _DIR_LISTING_CACHE.get(base)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with os.scandir(base) as entries:
+            names = frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+    # Directory mtimes have coarse granularity: a file created in the same tick as the last change
+    # would not bump it, so only listings of directories that have been quiet for a while are kept.
+    if time.time_ns() - mtime_ns > _DIR_LISTING_SETTLE_NS:
+        with _DIR_LISTING_CACHE_LOCK:
+            _DIR_LISTING_CACHE[base] = (mtime_ns, names)
+    return names
+
+
 def _first_existing_path(data_dir: str, relative_name: str) -> Optional[str]:
     """Resolve a relative file name in primary/fallback data dirs by priority."""
     for base in _candidate_data_dirs(data_dir):
-        candidate = os.path.join(base, relative_name)
-        if os.path.isfile(candidate):
-            return candidate
+        if relative_name in _file_names_in_dir(base):
+            return os.path.join(base, relative_name)
     return None
 
 
@@ -291,7 +387,7 @@ def _numeric_json_object_fields(value: Any) -> set[str]:
         if not text:
             return set()
         try:
-            parsed = json.loads(text)
+            parsed = _json_loads(text)
         except Exception:
             return set()
         if isinstance(parsed, dict):
@@ -316,7 +412,7 @@ def _numeric_json_field_value(value: Any, field: str) -> Optional[float]:
         if not text:
             return None
         try:
-            parsed = json.loads(text)
+            parsed = _json_loads(text)
         except Exception:
             return None
         if isinstance(parsed, dict):
@@ -349,10 +445,14 @@ def find_candidate_files(data_dir: str, start_ms: int, end_ms: int, file_prefix:
         List[str]: Result produced by this function.
     """
     files: List[str] = []
+    # One listing per data dir for the whole range instead of a stat per day.
+    listings = [(base, _file_names_in_dir(base)) for base in _candidate_data_dirs(data_dir)]
     for day in day_range_utc(start_ms, end_ms):
-        p = _first_existing_path(data_dir, f"{file_prefix}{day.isoformat()}.tsdb")
-        if p is not None:
-            files.append(p)
+        name = f"{file_prefix}{day.isoformat()}.tsdb"
+        for base, names in listings:
+            if name in names:
+                files.append(os.path.join(base, name))
+                break
 
     fallback_name = "data.tsdb" if file_prefix == "data_" else "mqttlog.tsdb"
     fallback = _first_existing_path(data_dir, fallback_name)
@@ -383,14 +483,8 @@ def _find_catalog_files_for_prefix(data_dir: str, start_ms: int, end_ms: int, fi
         return files
     pref_candidates: List[str] = []
     for base in _candidate_data_dirs(data_dir):
-        try:
-            names = os.listdir(base)
-        except OSError:
-            continue
-        for name in names:
+        for name in _file_names_in_dir(base):
             path = os.path.join(base, name)
-            if not os.path.isfile(path):
-                continue
             if file_prefix == "data_" and name.startswith("dsda_") and name.endswith(".1h.tsdb"):
                 pref_candidates.append(path)
             elif file_prefix == "mqttlog_" and name.startswith("dsmq_") and name.endswith(".1h.tsdb"):
@@ -1031,6 +1125,27 @@ def _get_or_build_downsampled_day_points(
     return [os.path.basename(original_path)], [{"timestamp": e.timestamp_ms, "value": e.value} for e in events]
 
 
+def _merge_file_events(event_lists: List[List[Event]]) -> List[Event]:
+    """Merge per-file event lists into one time-ordered list.
+
+    Each list comes from `read_tsdb_events_for_series` and is already time-sorted, so a single
+    non-empty list is returned as is. Several are concatenated in file order and stably sorted;
+    Timsort merges the presorted runs, which beats `heapq.merge` in pure Python.
+
+    Args:
+        event_lists: Time-sorted event lists, one per candidate file, in file order.
+
+    Returns:
+        List[Event]: Events ordered by timestamp; equal timestamps keep file order.
+    """
+    non_empty = [events for events in event_lists if events]
+    if len(non_empty) == 1:
+        return non_empty[0]
+    merged = [ev for events in non_empty for ev in events]
+    merged.sort(key=_EVENT_TIMESTAMP)
+    return merged
+
+
 def downsample_numeric_events(
     events: List[Event],
     max_events: int,
@@ -1066,20 +1181,49 @@ def downsample_numeric_events(
     span = max(1, end_ts - start_ts + 1)
     bucket_width = max(1, (span + max_events - 1) // max_events)
 
-    buckets: List[List[Event]] = [[] for _ in range(max_events)]
-    for e in events:
-        idx = (e.timestamp_ms - start_ts) // bucket_width
-        if idx < 0:
-            idx = 0
-        if idx >= max_events:
-            idx = max_events - 1
-        buckets[idx].append(e)
+    timestamps = [e.timestamp_ms for e in events]
+    all_values = [float(e.value) for e in events]
+    # Non-empty buckets as (bucket index, start, end) index ranges into all_values, in bucket
+    # order; nothing is allocated per empty bucket. Time-sorted input (the normal case) jumps
+    # from the first event of each bucket to its end with one bisect; anything else is grouped
+    # per event.
+    last_idx = max_events - 1
+    ranges: List[Tuple[int, int, int]] = []
+    n = len(timestamps)
+    if timestamps == sorted(timestamps):
+        lo = 0
+        while lo < n:
+            idx = (timestamps[lo] - start_ts) // bucket_width
+            if idx < 0:
+                idx = 0
+            if idx >= last_idx:
+                ranges.append((last_idx, lo, n))
+                break
+            hi = bisect.bisect_left(timestamps, start_ts + (idx + 1) * bucket_width, lo)
+            ranges.append((idx, lo, hi))
+            lo = hi
+    else:
+        groups: Dict[int, List[float]] = {}
+        for ts, value in zip(timestamps, all_values):
+            idx = (ts - start_ts) // bucket_width
+            if idx < 0:
+                idx = 0
+            if idx > last_idx:
+                idx = last_idx
+            group = groups.get(idx)
+            if group is None:
+                groups[idx] = [value]
+            else:
+                group.append(value)
+        all_values = []
+        for idx in sorted(groups):
+            lo = len(all_values)
+            all_values.extend(groups[idx])
+            ranges.append((idx, lo, len(all_values)))
 
     points: List[Dict[str, Any]] = []
-    for i, bucket in enumerate(buckets):
-        if not bucket:
-            continue
-        values = [float(ev.value) for ev in bucket]
+    for i, lo, hi in ranges:
+        values = all_values[lo:hi]
         b_start = start_ts + i * bucket_width
         b_end = min(end_ts, b_start + bucket_width - 1)
         points.append(
@@ -1087,7 +1231,7 @@ def downsample_numeric_events(
                 "timestamp": (b_start + b_end) // 2,
                 "start": b_start,
                 "end": b_end,
-                "count": len(bucket),
+                "count": hi - lo,
                 "min": round(min(values), decimal_places) if decimal_places is not None else min(values),
                 "avg": round(sum(values) / len(values), decimal_places) if decimal_places is not None else (sum(values) / len(values)),
                 "max": round(max(values), decimal_places) if decimal_places is not None else max(values),
@@ -1493,16 +1637,16 @@ def _real_series_points_for_virtual(
     source_sig_parts: List[Tuple[Any, ...]] = []
 
     if granularity_ms <= 0:
-        events: List[Event] = []
+        event_lists: List[List[Event]] = []
         for path in files:
             cache = get_cached_tsdb_file(path)
             source_sig_parts.append((os.path.basename(path), cache.parsed_offset, cache.mtime_ns, cache.size))
-            events.extend(read_tsdb_events_for_series(path, storage_series_name, start_ms, end_ms))
+            event_lists.append(read_tsdb_events_for_series(path, storage_series_name, start_ms, end_ms))
             fmt = cache.series_format_ids.get(storage_series_name)
             if is_numeric_format_id(fmt):
                 d = decimal_places_from_format_id(fmt)
                 max_decimal_places = d if max_decimal_places is None else max(max_decimal_places, d)
-        events.sort(key=lambda e: e.timestamp_ms)
+        events = _merge_file_events(event_lists)
         points = [{"timestamp": e.timestamp_ms, "value": e.value} for e in events]
         if points:
             return (
@@ -1604,6 +1748,132 @@ def _real_series_points_for_virtual(
     )
 
 
+_JSON_STREAM_POINTS_PER_PIECE = 1024
+_JSON_STREAM_FLUSH_CHARS = 64 * 1024
+_REQUEST_BODY_READ_CHUNK = 64 * 1024
+_COMPRESS_MIN_BYTES = 1024
+# (unix second, formatted text) for the Date header and the access log; replaced as a whole tuple.
+_HTTP_DATE_CACHE: Tuple[int, str] = (-1, "")
+_LOG_DATE_CACHE: Tuple[int, str] = (-1, "")
+
+
+def _json_compact(value: Any) -> str:
+    try:
+        return _COMPACT_JSON_ENCODER.encode(value)
+    except ValueError:
+        return _COMPACT_JSON_ENCODER.encode(_non_finite_to_null(value))
+
+
+def _non_finite_to_null(value: Any) -> Any:
+    # Only reached when a payload holds NaN/Infinity; responses always encode those as null.
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _non_finite_to_null(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_non_finite_to_null(item) for item in value]
+    return value
+
+
+# orjson turns integers outside the 64-bit range into floats; 19+ digit runs go to stdlib json instead.
+_LONG_DIGITS_RE = re.compile(r"[0-9]{19}")
+_LONG_DIGITS_BYTES_RE = re.compile(rb"[0-9]{19}")
+
+
+def _json_loads(raw: str | bytes) -> Any:
+    long_digits_re = _LONG_DIGITS_RE if isinstance(raw, str) else _LONG_DIGITS_BYTES_RE
+    if orjson is not None and long_digits_re.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # stdlib also accepts NaN/Infinity and reports the error text
+    return json.loads(raw)
+
+
+def _json_dumps_bytes(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return _json_compact(payload).encode("utf-8")
+
+
+def _negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the response Content-Encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding request header, if any.
+
+    Returns:
+        Optional[str]: "zstd" (when available) or "gzip" if the client accepts it, else None.
+    """
+    if not accept_encoding:
+        return None
+    accepted: set[str] = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        q = params.strip().lower()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    if zstd is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _new_compressor(encoding: str) -> Any:
+    """Return a streaming compressor with `compress(data)` / `flush()` for a negotiated encoding."""
+    if encoding == "zstd":
+        return zstd.ZstdCompressor(level=3)
+    # wbits=31 selects the gzip container.
+    return zlib.compressobj(4, zlib.DEFLATED, 31)
+
+
+def _iter_events_json(payload: Dict[str, Any]) -> Iterable[bytes]:
+    """Yield the compact UTF-8 JSON of an /events payload piece by piece.
+
+    The concatenation equals `_json_dumps_bytes(payload)`. `points` lists are encoded a slice at a
+    time and the `events` list of a multi-series payload is walked item by item, so the whole
+    response never exists as one string.
+
+    Args:
+        payload: Single-series `/events` response or multi-series envelope with `events`.
+
+    Returns:
+        Iterable[bytes]: JSON pieces in output order.
+    """
+    sep = b"{"
+    for key, value in payload.items():
+        yield sep + _json_dumps_bytes(str(key)) + b":"
+        sep = b","
+        if key == "points" and isinstance(value, list):
+            if not value:
+                yield b"[]"
+                continue
+            step = _JSON_STREAM_POINTS_PER_PIECE
+            for i in range(0, len(value), step):
+                text = _json_dumps_bytes(value[i:i + step])
+                yield (b"[" if i == 0 else b",") + text[1:-1]
+            yield b"]"
+        elif key == "events" and isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            item_sep = b"["
+            for item in value:
+                yield item_sep
+                item_sep = b","
+                yield from _iter_events_json(item)
+            yield b"[]" if not value else b"]"
+        else:
+            yield _json_dumps_bytes(value)
+    yield b"{}" if sep == b"{" else b"}"
+
+
+class PayloadTooLarge(ValueError):
+    """Raised when a request announces a body larger than MAX_PUT_BODY_BYTES."""
+
+
 def build_error(status: int, code: str, message: str) -> Tuple[int, Dict[str, Any]]:
     """Build error for API responses.
 
@@ -1618,6 +1888,124 @@ def build_error(status: int, code: str, message: str) -> Tuple[int, Dict[str, An
     return status, {"error": {"code": code, "message": message}}
 
 
+def _write_json_file_atomic(path: str, payload: Any) -> Tuple[int, int, int]:
+    """Write `payload` as indented JSON to `path` via fsync'ed temp file and atomic rename.
+
+    Args:
+        path: Destination file path.
+        payload: JSON-serializable document.
+
+    Returns:
+        Tuple[int, int, int]: `_file_signature` of the written file. It is taken from the temp
+            file, whose mtime, size and inode the rename keeps, so a concurrent writer cannot
+            slip its signature in between.
+    """
+    # Unique per writer, so concurrent requests never share a temp file.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(_PRETTY_JSON_ENCODER.iterencode(payload))
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return (mtime_ns, size, inode) of `path`, or None when it does not exist.
+
+    Args:
+        path: Filesystem path to inspect.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: Signature that changes whenever the file is rewritten.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cached_json_response_body(path: str, build_payload: Callable[[], Dict[str, Any]]) -> Tuple[bytes, str]:
+    """Return the serialized JSON response derived from `path`, rebuilt only when the file changes.
+
+    The signature is taken before `build_payload` reads the file, so a concurrent rewrite can
+    only make the cached entry look stale, never fresh.
+
+    Args:
+        path: File the response is derived from.
+        build_payload: Builds the response payload from the current file contents.
+
+    Returns:
+        Tuple[bytes, str]: UTF-8 encoded compact JSON body and its weak ETag.
+    """
+    sig = _file_signature(path)
+    with _RESPONSE_BODY_CACHE_LOCK:
+        hit = _RESPONSE_BODY_CACHE.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1], hit[2]
+    body = _json_dumps_bytes(build_payload())
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    with _RESPONSE_BODY_CACHE_LOCK:
+        _RESPONSE_BODY_CACHE[path] = (sig, body, etag)
+    return body, etag
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _invalidate_response_body_cache(path: str) -> None:
+    with _RESPONSE_BODY_CACHE_LOCK:
+        _RESPONSE_BODY_CACHE.pop(path, None)
+
+
+def _load_json_file_cached(path: str) -> Any:
+    """Return the parsed JSON document at `path`, reparsed only when the file changes.
+
+    The cached document is shared between callers and must not be mutated.
+
+    Args:
+        path: JSON file to load.
+
+    Returns:
+        Any: Parsed document, or None when `path` is not a regular file.
+    """
+    sig = _file_signature(path)
+    with _JSON_FILE_CACHE_LOCK:
+        hit = _JSON_FILE_CACHE.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    raw = None
+    if sig is not None and os.path.isfile(path):
+        with open(path, "rb") as f:
+            raw = _json_loads(f.read())
+    _store_json_file_cache(path, sig, raw)
+    return raw
+
+
+def _store_json_file_cache(path: str, sig: Optional[Tuple[int, int, int]], raw: Any) -> None:
+    with _JSON_FILE_CACHE_LOCK:
+        _JSON_FILE_CACHE[path] = (sig, raw)
+
+
 def _dashboards_file_path(data_dir: str) -> str:
     """Execute dashboards file path as part of TSDB server processing.
 
@@ -1639,11 +2027,7 @@ def load_dashboards(data_dir: str) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict[str, Dict[str, Any]]: Result produced by this function.
     """
-    path = _dashboards_file_path(data_dir)
-    if not os.path.isfile(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = _load_json_file_cached(_dashboards_file_path(data_dir))
     if not isinstance(raw, dict):
         return {}
     dashboards = raw.get("dashboards", raw)
@@ -1667,12 +2051,9 @@ def save_dashboards(data_dir: str, dashboards: Dict[str, Dict[str, Any]]) -> Non
         None. This function performs side effects only.
     """
     path = _dashboards_file_path(data_dir)
-    tmp = f"{path}.tmp"
-    payload = {"dashboards": dashboards}
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"), indent=2)
-        f.write("\n")
-    os.replace(tmp, path)
+    payload = {"dashboards": dict(dashboards)}
+    _store_json_file_cache(path, _write_json_file_atomic(path, payload), payload)
+    _invalidate_response_body_cache(path)
 
 
 def _settings_file_path(data_dir: str) -> str:
@@ -1696,17 +2077,14 @@ def load_settings(data_dir: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Result produced by this function.
     """
-    path = _settings_file_path(data_dir)
-    if not os.path.isfile(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = _load_json_file_cached(_settings_file_path(data_dir))
     if not isinstance(raw, dict):
         return {}
     settings = raw.get("settings", raw)
     if not isinstance(settings, dict):
         return {}
-    return settings
+    # Shallow copy: the parsed document stays cached.
+    return dict(settings)
 
 
 def save_settings(data_dir: str, settings: Dict[str, Any]) -> None:
@@ -1720,12 +2098,9 @@ def save_settings(data_dir: str, settings: Dict[str, Any]) -> None:
         None. This function performs side effects only.
     """
     path = _settings_file_path(data_dir)
-    tmp = f"{path}.tmp"
-    payload = {"settings": settings}
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"), indent=2)
-        f.write("\n")
-    os.replace(tmp, path)
+    payload = {"settings": dict(settings)}
+    _store_json_file_cache(path, _write_json_file_atomic(path, payload), payload)
+    _invalidate_response_body_cache(path)
 
 
 def _virtual_series_file_path(data_dir: str) -> str:
@@ -1804,11 +2179,9 @@ def load_virtual_series_config(data_dir: str) -> Tuple[List[VirtualSeriesDef], L
     Returns:
         Tuple[List[VirtualSeriesDef], List[Dict[str, Any]], int]: Result produced by this function.
     """
-    path = _virtual_series_file_path(data_dir)
-    if not os.path.isfile(path):
+    raw = _load_json_file_cached(_virtual_series_file_path(data_dir))
+    if raw is None:
         return [], [], 10000
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
     align_window_ms = 10000
     if isinstance(raw, list):
         items = raw
@@ -1900,7 +2273,6 @@ def save_virtual_series_config(data_dir: str, defs: List[VirtualSeriesDef], unit
         None. This function performs side effects only.
     """
     path = _virtual_series_file_path(data_dir)
-    tmp = f"{path}.tmp"
     if align_window_ms < 0:
         align_window_ms = 0
     payload = {
@@ -1921,10 +2293,7 @@ def save_virtual_series_config(data_dir: str, defs: List[VirtualSeriesDef], unit
             for d in unit_overrides
         ],
     }
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"), indent=2)
-        f.write("\n")
-    os.replace(tmp, path)
+    _store_json_file_cache(path, _write_json_file_atomic(path, payload), payload)
     with _VIRTUAL_SERIES_CACHE_LOCK:
         _VIRTUAL_SERIES_RESULT_CACHE.clear()
         _VIRTUAL_POINTS_CACHE.clear()
@@ -1958,15 +2327,11 @@ def _all_tsdb_files(data_dir: str, file_prefix: str = "data_") -> List[str]:
     files: List[str] = []
     seen: set[str] = set()
     for base in _candidate_data_dirs(data_dir):
-        try:
-            names = os.listdir(base)
-        except OSError:
-            continue
-        for name in names:
+        for name in _file_names_in_dir(base):
             single_name = "data.tsdb" if file_prefix == "data_" else "mqttlog.tsdb"
             if name == single_name or (name.startswith(file_prefix) and name.endswith(".tsdb")):
                 path = os.path.join(base, name)
-                if os.path.isfile(path) and path not in seen:
+                if path not in seen:
                     files.append(path)
                     seen.add(path)
     files.sort()
@@ -3164,6 +3529,13 @@ def get_virtual_series_points(
 
 class TsdbRequestHandler(BaseHTTPRequestHandler):
     server_version = "TSDBServer/1.0"
+    # Read request lines, headers and PUT bodies through a 64 KiB buffer instead of the 8 KiB default.
+    rbufsize = 64 * 1024
+    # Headers and body leave in separate writes; without TCP_NODELAY the body can wait for the
+    # client's delayed ACK of the header segment.
+    disable_nagle_algorithm = True
+    # Idle or preconnected sockets are dropped instead of holding a worker forever.
+    timeout = 30
 
     def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
         """Execute send json as part of TSDB server processing.
@@ -3176,19 +3548,158 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         Returns:
             None. This function performs side effects only.
         """
-        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        if orjson is not None or self._response_encoding() is not None:
+            self._send_json_body(status, _json_dumps_bytes(payload))
+            return
+        text = _json_compact(payload)
+        if not text.isascii():
+            self._send_json_body(status, text.encode("utf-8"))
+            return
+        # ASCII text is its own UTF-8 encoding, so its length is the body length and it can be
+        # encoded slice by slice instead of holding a full-size bytes copy next to the str.
+        try:
+            self._send_json_headers(status, len(text))
+            for pos in range(0, len(text), _JSON_STREAM_FLUSH_CHARS):
+                self.wfile.write(text[pos:pos + _JSON_STREAM_FLUSH_CHARS].encode("ascii"))
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send_json_body(self, status: int, body: bytes, etag: Optional[str] = None) -> None:
+        """Send an already serialized JSON body with the standard JSON/CORS headers.
+
+        Args:
+            self: Current HTTP request handler instance.
+            status: HTTP status code to send.
+            body: UTF-8 encoded JSON document.
+            etag: Optional ETag of `body`; see `_send_json_headers`.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        encoding = self._response_encoding() if len(body) >= _COMPRESS_MIN_BYTES else None
+        if encoding is not None:
+            compressor = _new_compressor(encoding)
+            body = compressor.compress(body) + compressor.flush()
+        try:
+            self._send_json_headers(status, len(body), etag, encoding)
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send_json_revalidatable(self, body: bytes, etag: str) -> None:
+        """Send a 200 JSON body with an ETag, or 304 Not Modified if the client already has it.
+
+        Args:
+            self: Current HTTP request handler instance.
+            body: UTF-8 encoded JSON document.
+            etag: ETag of `body`.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        if not _etag_matches(self.headers.get("If-None-Match"), etag):
+            self._send_json_body(200, body, etag)
+            return
+        try:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, PUT, POST, DELETE, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.end_headers()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send_json_headers(
+        self,
+        status: int,
+        content_length: int,
+        etag: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> None:
+        """Send the status line and the standard JSON/CORS headers for a body of known length.
+
+        Args:
+            self: Current HTTP request handler instance.
+            status: HTTP status code to send.
+            content_length: Body size in bytes, after any content encoding.
+            etag: ETag of the body; makes the response cacheable subject to revalidation.
+            content_encoding: Content-Encoding applied to the body, if any.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(content_length))
+        if content_encoding is not None:
+            self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        if etag is None:
+            self.send_header("Cache-Control", "no-store")
+        else:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, PUT, POST, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+    def _send_json_stream(self, status: int, payload: Dict[str, Any]) -> None:
+        """Send an /events payload without first serializing it into one body.
+
+        The server speaks HTTP/1.0, so the body is delimited by closing the connection instead
+        of a Content-Length header; JSON is written in pieces of about 64 KiB.
+
+        Args:
+            self: Current HTTP request handler instance.
+            status: HTTP status code to send.
+            payload: /events response payload; see `_iter_events_json`.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        self.close_connection = True
+        encoding = self._response_encoding()
+        compressor = _new_compressor(encoding) if encoding is not None else None
         try:
             self.send_response(status)
             self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
+            if encoding is not None:
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Vary", "Accept-Encoding")
             self.send_header("Cache-Control", "no-store")
             self.send_header("Access-Control-Allow-Origin", "*")
             self.send_header("Access-Control-Allow-Methods", "GET, PUT, POST, DELETE, OPTIONS")
             self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.send_header("Connection", "close")
             self.end_headers()
-            self.wfile.write(body)
+            pending: List[bytes] = []
+            pending_bytes = 0
+            for piece in _iter_events_json(payload):
+                pending.append(piece)
+                pending_bytes += len(piece)
+                if pending_bytes >= _JSON_STREAM_FLUSH_CHARS:
+                    data = b"".join(pending)
+                    self.wfile.write(compressor.compress(data) if compressor is not None else data)
+                    pending = []
+                    pending_bytes = 0
+            data = b"".join(pending)
+            if compressor is not None:
+                data = compressor.compress(data) + compressor.flush()
+            if data:
+                self.wfile.write(data)
         except (BrokenPipeError, ConnectionResetError):
             return
+        except Exception as exc:
+            # Headers are already out; a second response would corrupt the stream, so just log
+            # and let the closed connection truncate the body.
+            self.log_error("Failed to stream JSON response: %s", exc)
+
+    def _response_encoding(self) -> Optional[str]:
+        """Return the Content-Encoding to use for this request's JSON response, if any."""
+        return _negotiate_content_encoding(self.headers.get("Accept-Encoding"))
 
     def _query_param(self, params: Dict[str, List[str]], name: str, required: bool = False) -> Optional[str]:
         """Execute query param as part of TSDB server processing.
@@ -3209,27 +3720,77 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             return None
         return values[0]
 
-    def _send_bytes(self, status: int, body: bytes, content_type: str) -> None:
-        """Execute send bytes as part of TSDB server processing.
+    def _parse_content_length(self) -> int:
+        """Validate the Content-Length header of a JSON request before any body is read.
+
+        Args:
+            self: Current HTTP request handler instance.
+
+        Returns:
+            int: Announced body size in bytes, between 1 and MAX_PUT_BODY_BYTES.
+
+        Raises:
+            ValueError: If the header is missing, not a number or not positive.
+            PayloadTooLarge: If the announced body exceeds MAX_PUT_BODY_BYTES.
+        """
+        length_raw = self.headers.get("Content-Length", "").strip()
+        if not length_raw:
+            raise ValueError("Missing Content-Length")
+        if not (length_raw.isascii() and length_raw.isdigit()):
+            raise ValueError("Invalid Content-Length")
+        length = int(length_raw)
+        if length <= 0:
+            raise ValueError("Empty request body")
+        if length > MAX_PUT_BODY_BYTES:
+            raise PayloadTooLarge(f"Request body of {length} bytes exceeds the limit of {MAX_PUT_BODY_BYTES} bytes")
+        return length
+
+    def _read_body(self, length: int) -> bytearray:
+        """Read a request body of `length` bytes into one preallocated buffer.
+
+        Args:
+            self: Current HTTP request handler instance.
+            length: Body size announced by Content-Length.
+
+        Returns:
+            bytearray: Body bytes; shorter than `length` if the client closed the connection early.
+        """
+        buf = bytearray(length)
+        with memoryview(buf) as view:
+            offset = 0
+            while offset < length:
+                n = self.rfile.readinto(view[offset:offset + _REQUEST_BODY_READ_CHUNK])
+                if not n:
+                    break
+                offset += n
+        del buf[offset:]
+        return buf
+
+    def _send_file(self, status: int, full_path: str, content_type: str) -> None:
+        """Send a file as the response body, copied kernel-side with sendfile(2) where available.
 
         Args:
             self: Current HTTP request handler instance.
             status: HTTP status code to send.
-            body: Parameter `body` of type `bytes` used by this function.
-            content_type: Parameter `content_type` of type `str` used by this function.
+            full_path: File to send.
+            content_type: Value of the Content-Type header.
 
         Returns:
             None. This function performs side effects only.
         """
-        try:
-            self.send_response(status)
-            self.send_header("Content-Type", content_type)
-            self.send_header("Content-Length", str(len(body)))
-            self.send_header("Cache-Control", "no-store")
-            self.end_headers()
-            self.wfile.write(body)
-        except (BrokenPipeError, ConnectionResetError):
-            return
+        with open(full_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(size))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                # wfile is unbuffered, so the headers are already on the socket. socket.sendfile
+                # falls back to a read/send loop where os.sendfile is unavailable.
+                self.connection.sendfile(f, 0, size)
+            except (BrokenPipeError, ConnectionResetError):
+                return
 
     def _handle_static(self, path: str) -> bool:
         """Execute handle static as part of TSDB server processing.
@@ -3265,10 +3826,8 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             self._send_json(status, payload)
             return True
 
-        with open(full_path, "rb") as f:
-            body = f.read()
         mime, _ = mimetypes.guess_type(full_path)
-        self._send_bytes(200, body, mime or "application/octet-stream")
+        self._send_file(200, full_path, mime or "application/octet-stream")
         return True
 
     def do_OPTIONS(self) -> None:
@@ -3304,7 +3863,10 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             if self._handle_static(path):
                 return
             if path == "/health":
-                self._send_json(200, {"ok": True, "apiVersion": API_VERSION, "serverVersion": SERVER_VERSION})
+                self._send_json(
+                    200,
+                    {"ok": True, "apiVersion": API_VERSION, "serverVersion": SERVER_VERSION, "tsdbCache": tsdb_cache_stats()},
+                )
                 return
             if path == "/series":
                 self._handle_series(params)
@@ -3366,6 +3928,11 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
                 return
             status, payload = build_error(404, "not_found", f"Unknown endpoint: {path}")
             self._send_json(status, payload)
+        except PayloadTooLarge as exc:
+            # The body was not read, so the connection cannot be reused for another request.
+            self.close_connection = True
+            status, payload = build_error(413, "payload_too_large", str(exc))
+            self._send_json(status, payload)
         except ValueError as exc:
             status, payload = build_error(400, "bad_request", str(exc))
             self._send_json(status, payload)
@@ -3393,6 +3960,10 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
                 return
             status, payload = build_error(404, "not_found", f"Unknown endpoint: {path}")
             self._send_json(status, payload)
+        except PayloadTooLarge as exc:
+            self.close_connection = True
+            status, payload = build_error(413, "payload_too_large", str(exc))
+            self._send_json(status, payload)
         except ValueError as exc:
             status, payload = build_error(400, "bad_request", str(exc))
             self._send_json(status, payload)
@@ -3455,6 +4026,14 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             files = _find_catalog_files_for_prefix(data_dir, start_ms, end_ms, "mqttlog_")
         else:
             files = _find_catalog_files(data_dir, start_ms, end_ms)
+        sig = (tuple((path, _file_signature(path)) for path in files), _file_signature(_virtual_series_file_path(data_dir)))
+        with _SERIES_NAMES_CACHE_LOCK:
+            hit = _SERIES_NAMES_CACHE.get((data_dir, prefix))
+            if hit is not None:
+                _SERIES_NAMES_CACHE.move_to_end((data_dir, prefix))
+        if hit is not None and hit[0] == sig:
+            self._send_json(200, {"start": start_ms, "end": end_ms, "files": [os.path.basename(p) for p in files], "series": hit[1]})
+            return
         names = set()
         for path in files:
             cache = None
@@ -3481,6 +4060,12 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
                 if prefix and not d.name.startswith(prefix):
                     continue
                 names.add(d.name)
+        sorted_names = sorted(names)
+        with _SERIES_NAMES_CACHE_LOCK:
+            _SERIES_NAMES_CACHE[(data_dir, prefix)] = (sig, sorted_names)
+            _SERIES_NAMES_CACHE.move_to_end((data_dir, prefix))
+            while len(_SERIES_NAMES_CACHE) > _SERIES_NAMES_CACHE_MAX_ENTRIES:
+                _SERIES_NAMES_CACHE.popitem(last=False)
 
         self._send_json(
             200,
@@ -3488,7 +4073,7 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
                 "start": start_ms,
                 "end": end_ms,
                 "files": [os.path.basename(p) for p in files],
-                "series": sorted(names),
+                "series": sorted_names,
             },
         )
 
@@ -3522,10 +4107,10 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             raise ValueError("minPoints must be > 0")
 
         if len(series_values) == 1:
-            self._send_json(200, self._events_for_series(data_dir, series_values[0], start_ms, end_ms, min_points, granularity))
+            self._send_json_stream(200, self._events_for_series(data_dir, series_values[0], start_ms, end_ms, min_points, granularity))
             return
         items = [self._events_for_series(data_dir, s, start_ms, end_ms, min_points, granularity) for s in series_values]
-        self._send_json(
+        self._send_json_stream(
             200,
             {
                 "start": start_ms,
@@ -3626,15 +4211,20 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         files_used = [os.path.basename(path) for path in files]
         max_decimal_places: Optional[int] = None
 
-        events: List[Event] = []
+        event_lists: List[List[Event]] = []
+        all_numeric = True
         for path in files:
-            events.extend(read_tsdb_events_for_series(path, series_name, day_start_ms, day_end_ms))
+            event_lists.append(read_tsdb_events_for_series(path, series_name, day_start_ms, day_end_ms))
+            if all_numeric and not series_values_all_numeric_in_file(path, series_name):
+                all_numeric = False
             fmt = get_series_format_id_in_file(path, series_name)
             if is_numeric_format_id(fmt):
                 d = decimal_places_from_format_id(fmt)
                 max_decimal_places = d if max_decimal_places is None else max(max_decimal_places, d)
-        events.sort(key=lambda e: e.timestamp_ms)
-        all_numeric = all(isinstance(ev.value, (int, float)) and not isinstance(ev.value, bool) for ev in events)
+        events = _merge_file_events(event_lists)
+        # The per-file flags cover whole series; only a flagged series needs its in-range values checked.
+        if not all_numeric:
+            all_numeric = all(isinstance(ev.value, (int, float)) and not isinstance(ev.value, bool) for ev in events)
 
         if granularity_ms > 0 and all_numeric:
             points = _downsample_fixed_numeric_events(
@@ -3959,18 +4549,9 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             None. This function performs side effects only.
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            raise ValueError("Missing Content-Length")
+        body = self._read_body(self._parse_content_length())
         try:
-            length = int(length_raw)
-        except ValueError:
-            raise ValueError("Invalid Content-Length")
-        if length <= 0:
-            raise ValueError("Empty request body")
-        body = self.rfile.read(length)
-        try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = _json_loads(body)
         except Exception:
             raise ValueError("Invalid JSON body")
         if not isinstance(payload, dict):
@@ -4054,8 +4635,11 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             None. This function performs side effects only.
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
-        dashboards = load_dashboards(data_dir)
-        self._send_json(200, {"dashboards": sorted(dashboards.keys())})
+        body, etag = _cached_json_response_body(
+            _dashboards_file_path(data_dir),
+            lambda: {"dashboards": sorted(load_dashboards(data_dir).keys())},
+        )
+        self._send_json_revalidatable(body, etag)
 
     def _handle_dashboards_get(self, path: str) -> None:
         """Execute handle dashboards get as part of TSDB server processing.
@@ -4089,27 +4673,19 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
         name = self._dashboard_name_from_path(path)
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            raise ValueError("Missing Content-Length")
+        body = self._read_body(self._parse_content_length())
         try:
-            length = int(length_raw)
-        except ValueError:
-            raise ValueError("Invalid Content-Length")
-        if length <= 0:
-            raise ValueError("Empty request body")
-        body = self.rfile.read(length)
-        try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = _json_loads(body)
         except Exception:
             raise ValueError("Invalid JSON body")
         dashboard = payload.get("dashboard", payload) if isinstance(payload, dict) else None
         if not isinstance(dashboard, dict):
             raise ValueError("Dashboard payload must be an object")
 
-        dashboards = load_dashboards(data_dir)
-        dashboards[name] = dashboard
-        save_dashboards(data_dir, dashboards)
+        with _DASHBOARDS_UPDATE_LOCK:
+            dashboards = load_dashboards(data_dir)
+            dashboards[name] = dashboard
+            save_dashboards(data_dir, dashboards)
         self._send_json(200, {"ok": True, "name": name})
 
     def _handle_dashboards_delete(self, path: str) -> None:
@@ -4124,13 +4700,16 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
         name = self._dashboard_name_from_path(path)
-        dashboards = load_dashboards(data_dir)
-        if name not in dashboards:
+        with _DASHBOARDS_UPDATE_LOCK:
+            dashboards = load_dashboards(data_dir)
+            found = name in dashboards
+            if found:
+                del dashboards[name]
+                save_dashboards(data_dir, dashboards)
+        if not found:
             status, payload = build_error(404, "not_found", f"Dashboard not found: {name}")
             self._send_json(status, payload)
             return
-        del dashboards[name]
-        save_dashboards(data_dir, dashboards)
         self._send_json(200, {"ok": True, "name": name, "deleted": True})
 
     def _handle_dashboards_rename(self, path: str) -> None:
@@ -4146,18 +4725,9 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
         old_raw = path[len("/dashboards/"):-len("/rename")]
         old_name = self._validate_dashboard_name(unquote(old_raw).strip().rstrip("/"))
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            raise ValueError("Missing Content-Length")
+        body = self._read_body(self._parse_content_length())
         try:
-            length = int(length_raw)
-        except ValueError:
-            raise ValueError("Invalid Content-Length")
-        if length <= 0:
-            raise ValueError("Empty request body")
-        body = self.rfile.read(length)
-        try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = _json_loads(body)
         except Exception:
             raise ValueError("Invalid JSON body")
         if not isinstance(payload, dict):
@@ -4166,17 +4736,20 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         if not isinstance(new_name_raw, str):
             raise ValueError("Rename payload must include string newName")
         new_name = self._validate_dashboard_name(new_name_raw.strip())
-        dashboards = load_dashboards(data_dir)
-        if old_name not in dashboards:
-            status, payload = build_error(404, "not_found", f"Dashboard not found: {old_name}")
-            self._send_json(status, payload)
-            return
-        if new_name in dashboards and new_name != old_name:
-            status, payload = build_error(409, "conflict", f"Dashboard already exists: {new_name}")
+        error: Optional[Tuple[int, Dict[str, Any]]] = None
+        with _DASHBOARDS_UPDATE_LOCK:
+            dashboards = load_dashboards(data_dir)
+            if old_name not in dashboards:
+                error = build_error(404, "not_found", f"Dashboard not found: {old_name}")
+            elif new_name in dashboards and new_name != old_name:
+                error = build_error(409, "conflict", f"Dashboard already exists: {new_name}")
+            else:
+                dashboards[new_name] = dashboards.pop(old_name)
+                save_dashboards(data_dir, dashboards)
+        if error is not None:
+            status, payload = error
             self._send_json(status, payload)
             return
-        dashboards[new_name] = dashboards.pop(old_name)
-        save_dashboards(data_dir, dashboards)
         self._send_json(200, {"ok": True, "oldName": old_name, "newName": new_name})
 
     def _handle_settings_get(self) -> None:
@@ -4189,8 +4762,8 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             None. This function performs side effects only.
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
-        settings = load_settings(data_dir)
-        self._send_json(200, {"settings": settings})
+        body, etag = _cached_json_response_body(_settings_file_path(data_dir), lambda: {"settings": load_settings(data_dir)})
+        self._send_json_revalidatable(body, etag)
 
     def _handle_settings_put(self) -> None:
         """Execute handle settings put as part of TSDB server processing.
@@ -4202,18 +4775,9 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
             None. This function performs side effects only.
         """
         data_dir = self.server.data_dir  # type: ignore[attr-defined]
-        length_raw = self.headers.get("Content-Length", "").strip()
-        if not length_raw:
-            raise ValueError("Missing Content-Length")
+        body = self._read_body(self._parse_content_length())
         try:
-            length = int(length_raw)
-        except ValueError:
-            raise ValueError("Invalid Content-Length")
-        if length <= 0:
-            raise ValueError("Empty request body")
-        body = self.rfile.read(length)
-        try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = _json_loads(body)
         except Exception:
             raise ValueError("Invalid JSON body")
         settings = payload.get("settings", payload) if isinstance(payload, dict) else None
@@ -4236,9 +4800,57 @@ class TsdbRequestHandler(BaseHTTPRequestHandler):
         """
         super().log_message(fmt, *args)
 
+    def date_time_string(self, timestamp: Optional[float] = None) -> str:
+        """Return the HTTP Date header value, formatted at most once per second.
+
+        Args:
+            self: Current HTTP request handler instance.
+            timestamp: Explicit time to format; formatted directly without the cache.
+
+        Returns:
+            str: RFC 7231 date string.
+        """
+        global _HTTP_DATE_CACHE
+        if timestamp is not None:
+            return super().date_time_string(timestamp)
+        now = int(time.time())
+        cached = _HTTP_DATE_CACHE
+        if cached[0] != now:
+            cached = _HTTP_DATE_CACHE = (now, super().date_time_string(now))
+        return cached[1]
+
+    def log_date_time_string(self) -> str:
+        """Return the access-log timestamp, formatted at most once per second.
+
+        Args:
+            self: Current HTTP request handler instance.
+
+        Returns:
+            str: Local time in BaseHTTPRequestHandler's log format.
+        """
+        global _LOG_DATE_CACHE
+        now = int(time.time())
+        cached = _LOG_DATE_CACHE
+        if cached[0] != now:
+            year, month, day, hh, mm, ss, _x, _y, _z = time.localtime(now)
+            text = "%02d/%3s/%04d %02d:%02d:%02d" % (day, self.monthname[month], year, hh, mm, ss)
+            cached = _LOG_DATE_CACHE = (now, text)
+        return cached[1]
+
 
 class TsdbHttpServer(ThreadingHTTPServer):
-    def __init__(self, server_address: Tuple[str, int], data_dir: str, ui_dir: Optional[str], data_dir2: Optional[str] = None):
+    request_queue_size = 128
+    # Accepted connections allowed to wait for a pool worker before new ones are refused.
+    pool_queue_size = 128
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        data_dir: str,
+        ui_dir: Optional[str],
+        data_dir2: Optional[str] = None,
+        http_threads: Optional[int] = None,
+    ):
         """Execute init as part of TSDB server processing.
 
         Args:
@@ -4247,14 +4859,68 @@ class TsdbHttpServer(ThreadingHTTPServer):
             data_dir: Directory containing TSDB files and server metadata files.
             ui_dir: Parameter `ui_dir` of type `Optional[str]` used by this function.
             data_dir2: Optional fallback directory for missing day files.
+            http_threads: Size of the worker pool serving connections; None starts one thread per
+                connection.
 
         Returns:
             Result produced by this function.
         """
+        # Set before binding: a failed bind calls server_close() from the base constructor.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_slots: Optional[threading.BoundedSemaphore] = None
         super().__init__(server_address, TsdbRequestHandler)
         self.data_dir = data_dir
         self.data_dir2 = data_dir2
         self.ui_dir = ui_dir
+        if http_threads is not None:
+            self._executor = ThreadPoolExecutor(max_workers=http_threads, thread_name_prefix="tsdb-http")
+            self._worker_slots = threading.BoundedSemaphore(http_threads + self.pool_queue_size)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Hand a connection to the worker pool, refusing it when the pool queue is full.
+
+        Args:
+            self: Current HTTP server instance.
+            request: Accepted client socket.
+            client_address: Address of the connected client.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        if self._executor is None or self._worker_slots is None:
+            super().process_request(request, client_address)
+            return
+        # Never block the accept loop: busy workers must not stall every other client.
+        if not self._worker_slots.acquire(blocking=False):
+            self.shutdown_request(request)
+            return
+        try:
+            self._executor.submit(self._process_pooled_request, request, client_address)
+        except BaseException:
+            self._worker_slots.release()
+            self.shutdown_request(request)
+            raise
+
+    def _process_pooled_request(self, request: Any, client_address: Any) -> None:
+        """Serve one connection on a pool worker and free its slot afterwards."""
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            if self._worker_slots is not None:
+                self._worker_slots.release()
+
+    def server_close(self) -> None:
+        """Close the listening socket and wait for pooled requests to finish.
+
+        Args:
+            self: Current HTTP server instance.
+
+        Returns:
+            None. This function performs side effects only.
+        """
+        super().server_close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
 
 
 def parse_args() -> argparse.Namespace:
@@ -4281,6 +4947,18 @@ def parse_args() -> argparse.Namespace:
         default=os.path.join(os.path.dirname(__file__), "dashboard_ui"),
         help="Directory containing frontend assets (default: ./dashboard_ui next to tsdb_server.py)",
     )
+    parser.add_argument(
+        "--cache-max-files",
+        type=int,
+        default=256,
+        help="Maximum number of parsed TSDB files kept in memory, least recently used evicted first (default: 256)",
+    )
+    parser.add_argument(
+        "--threads-http",
+        type=int,
+        default=0,
+        help="Serve HTTP connections from a pool of this many worker threads (default: 0, one thread per connection)",
+    )
     return parser.parse_args()
 
 
@@ -4304,12 +4982,21 @@ def main() -> int:
         raise SystemExit(f"UI directory not found: {ui_dir}")
     if not (1 <= args.port <= 65535):
         raise SystemExit("--port must be in range 1..65535")
+    if args.cache_max_files < 1:
+        raise SystemExit("--cache-max-files must be at least 1")
+    set_tsdb_cache_max_files(args.cache_max_files)
+    if args.threads_http < 0:
+        raise SystemExit("--threads-http must not be negative")
 
-    httpd = TsdbHttpServer((args.host, args.port), data_dir, ui_dir, data_dir2)
+    httpd = TsdbHttpServer((args.host, args.port), data_dir, ui_dir, data_dir2, http_threads=args.threads_http or None)
     print(
         f"Serving TSDB REST API on http://{args.host}:{args.port} "
         f"(data_dir={data_dir}, data_dir2={data_dir2}, ui_dir={ui_dir})"
     )
+    # sys._is_gil_enabled exists since Python 3.13; free-threaded builds let the request threads
+    # encode JSON and parse TSDB files on several cores at once.
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        print("Free-threaded Python: HTTP request threads run in parallel")
     try:
         httpd.serve_forever()
     except KeyboardInterrupt: